@@ -0,0 +1,35 @@
+"""Add category tree to user category
+
+Revision ID: 3d0b526ea2da
+Revises: e2387554accc
+Create Date: 2026-10-19 17:46:19.957551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d0b526ea2da'
+down_revision: Union[str, Sequence[str], None] = 'e2387554accc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_category', sa.Column('parent_category_id', sa.BigInteger(), nullable=True, comment="Parent category in the user's tree, null at the top level"))
+    # Existing links become top-level categories.
+    op.add_column('user_category', sa.Column('path', sa.Text(), server_default='/', nullable=False, comment='Ids of the ancestor categories from the top, as /1/5/'))
+    op.create_index('ix_user_category_user_id_path', 'user_category', ['user_id', 'path'], unique=False, postgresql_ops={'path': 'text_pattern_ops'})
+    op.create_foreign_key('user_category_user_id_parent_category_id_fkey', 'user_category', 'user_category', ['user_id', 'parent_category_id'], ['user_id', 'category_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('user_category_user_id_parent_category_id_fkey', 'user_category', type_='foreignkey')
+    op.drop_index('ix_user_category_user_id_path', table_name='user_category', postgresql_ops={'path': 'text_pattern_ops'})
+    op.drop_column('user_category', 'path')
+    op.drop_column('user_category', 'parent_category_id')
@@ -0,0 +1,47 @@
+"""Scope categories to users
+
+Revision ID: 7052a5cac19e
+Revises: 3d0b526ea2da
+Create Date: 2026-10-19 17:52:26.519528
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7052a5cac19e'
+down_revision: Union[str, Sequence[str], None] = '3d0b526ea2da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('category', sa.Column('user_id', sa.BigInteger(), nullable=True, comment='Owner of the category; NULL for categories still shared from before names were per user'))
+    op.alter_column('category', 'name',
+               existing_type=sa.VARCHAR(),
+               comment='Category name, unique per user',
+               existing_comment='Category name',
+               existing_nullable=False)
+    op.drop_constraint(op.f('category_name_key'), 'category', type_='unique')
+    op.create_unique_constraint('uq_category_user_name', 'category', ['user_id', 'name'])
+    op.create_foreign_key('category_user_id_fkey', 'category', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+    # Existing rows stay shared (user_id NULL) until `python cli.py
+    # migrate-categories` gives each of their users a copy of their own.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails once users own categories of the same name.
+    op.drop_constraint('category_user_id_fkey', 'category', type_='foreignkey')
+    op.drop_constraint('uq_category_user_name', 'category', type_='unique')
+    op.create_unique_constraint(op.f('category_name_key'), 'category', ['name'])
+    op.alter_column('category', 'name',
+               existing_type=sa.VARCHAR(),
+               comment='Category name',
+               existing_comment='Category name, unique per user',
+               existing_nullable=False)
+    op.drop_column('category', 'user_id')
@@ -0,0 +1,37 @@
+"""Add foreign key indexes for orphan sweep
+
+Revision ID: ae85de198659
+Revises: 94b3984d3c27
+Create Date: 2026-10-19 16:38:33.589488
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae85de198659'
+down_revision: Union[str, Sequence[str], None] = '94b3984d3c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so existing tables stay writable during the upgrade.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_budget_category_id', 'budget', ['category_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_recurring_rule_transaction_id', 'recurring_rule', ['transaction_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_user_category_category_id', 'user_category', ['category_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_user_transaction_transaction_id', 'user_transaction', ['transaction_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_transaction_transaction_id', table_name='user_transaction', postgresql_concurrently=True)
+        op.drop_index('ix_user_category_category_id', table_name='user_category', postgresql_concurrently=True)
+        op.drop_index('ix_recurring_rule_transaction_id', table_name='recurring_rule', postgresql_concurrently=True)
+        op.drop_index('ix_budget_category_id', table_name='budget', postgresql_concurrently=True)
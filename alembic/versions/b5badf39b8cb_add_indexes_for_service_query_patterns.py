@@ -0,0 +1,76 @@
+"""Add indexes for service query patterns
+
+Revision ID: b5badf39b8cb
+Revises: b91f941f0579
+Create Date: 2026-10-19 16:46:27.912662
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5badf39b8cb'
+down_revision: Union[str, Sequence[str], None] = 'b91f941f0579'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = sa.text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE pg_inherits.inhparent = 'user_transaction'::regclass"
+)
+
+
+def _create_user_transaction_index(name: str, child_suffix: str, definition: str) -> None:
+    # CREATE INDEX CONCURRENTLY does not work on a partitioned table, so the
+    # parent index is created invalid and each partition's index is built
+    # concurrently and attached; the parent becomes valid with the last one.
+    op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON ONLY user_transaction {definition}')
+    for partition in op.get_bind().scalars(PARTITIONS).all():
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_{child_suffix} ON {partition} {definition}')
+        op.execute(f'ALTER INDEX {name} ATTACH PARTITION {partition}_{child_suffix}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transaction_category_id', 'transaction', ['category_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_spend_counter_category_id', 'spend_counter', ['category_id'], unique=False, postgresql_concurrently=True)
+
+        op.create_index('ix_job_active_run_after', 'job', ['run_after', 'id'], unique=False, postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"), postgresql_concurrently=True)
+        op.create_index('ix_job_finished_at', 'job', ['finished_at'], unique=False, postgresql_where=sa.text("status IN ('SUCCEEDED', 'FAILED')"), postgresql_concurrently=True)
+        op.create_index('ix_job_user_id_id', 'job', ['user_id', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_job_status_run_after', table_name='job', postgresql_concurrently=True)
+        op.drop_index('ix_job_user_id', table_name='job', postgresql_concurrently=True)
+
+        op.create_index('ix_attachment_user_id_covering', 'attachment', ['user_id'], unique=False, postgresql_include=['size'], postgresql_concurrently=True)
+        op.drop_index('ix_attachment_user_id', table_name='attachment', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ix_attachment_user_id_covering RENAME TO ix_attachment_user_id')
+
+        _create_user_transaction_index('ix_user_transaction_user_id_created_at_covering', 'user_id_created_at_covering_idx', '(user_id, created_at) INCLUDE (transaction_id, amount, currency)')
+    op.drop_index('ix_user_transaction_user_id_created_at', table_name='user_transaction')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        _create_user_transaction_index('ix_user_transaction_user_id_created_at', 'user_id_created_at_idx', '(user_id, created_at)')
+    op.drop_index('ix_user_transaction_user_id_created_at_covering', table_name='user_transaction')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_attachment_user_id_plain', 'attachment', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_attachment_user_id', table_name='attachment', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ix_attachment_user_id_plain RENAME TO ix_attachment_user_id')
+
+        op.create_index('ix_job_user_id', 'job', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_job_status_run_after', 'job', ['status', 'run_after'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_job_user_id_id', table_name='job', postgresql_concurrently=True)
+        op.drop_index('ix_job_finished_at', table_name='job', postgresql_concurrently=True)
+        op.drop_index('ix_job_active_run_after', table_name='job', postgresql_concurrently=True)
+
+        op.drop_index('ix_spend_counter_category_id', table_name='spend_counter', postgresql_concurrently=True)
+        op.drop_index('ix_transaction_category_id', table_name='transaction', postgresql_concurrently=True)
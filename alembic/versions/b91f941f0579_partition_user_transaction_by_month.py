@@ -0,0 +1,120 @@
+"""Partition user transaction by month
+
+Revision ID: b91f941f0579
+Revises: ae85de198659
+Create Date: 2026-10-19 16:42:44.171532
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91f941f0579'
+down_revision: Union[str, Sequence[str], None] = 'ae85de198659'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+COLUMNS = (
+    'id, user_id, transaction_id, amount, currency, details, attachments, '
+    'created_at, recurring_rule_id, updated_at'
+)
+
+
+def _columns() -> list:
+    return [
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('user_transaction_id_seq'::regclass)"), nullable=False, comment='Unique identifier for user transaction'),
+        sa.Column('user_id', sa.BigInteger(), nullable=False, comment='Reference to user'),
+        sa.Column('transaction_id', sa.BigInteger(), nullable=False, comment='Reference to transaction'),
+        sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Transaction amount'),
+        sa.Column('currency', sa.String(length=3), server_default='USD', nullable=False, comment='ISO 4217 currency code of the amount'),
+        sa.Column('details', sa.String(), nullable=True, comment='Additional transaction details'),
+        sa.Column('attachments', postgresql.ARRAY(sa.String()), nullable=True, comment='File attachments stored as array'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False, comment='Transaction timestamp, also the monthly partition key'),
+        sa.Column('recurring_rule_id', sa.BigInteger(), nullable=True, comment='Reference to the recurring rule that materialized this row'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False, comment='Update timestamp'),
+        sa.ForeignKeyConstraint(['recurring_rule_id'], ['recurring_rule.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['transaction_id'], ['transaction.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, month_index + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index('uq_user_transaction_recurring_occurrence', 'user_transaction', ['recurring_rule_id', 'created_at'], unique=True, postgresql_where=sa.text('recurring_rule_id IS NOT NULL'))
+    op.create_index('ix_user_transaction_transaction_id', 'user_transaction', ['transaction_id'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are copied inside the migration transaction, so run it while the
+    # application is stopped. Attachments lose their foreign key because a
+    # partitioned table can only be referenced by (id, created_at).
+    op.drop_constraint('attachment_user_transaction_id_fkey', 'attachment', type_='foreignkey')
+
+    op.rename_table('user_transaction', 'user_transaction_unpartitioned')
+    op.execute('ALTER TABLE user_transaction_unpartitioned RENAME CONSTRAINT user_transaction_pkey TO user_transaction_unpartitioned_pkey')
+    op.drop_index('uq_user_transaction_recurring_occurrence', table_name='user_transaction_unpartitioned')
+    op.drop_index('ix_user_transaction_transaction_id', table_name='user_transaction_unpartitioned')
+    op.execute('ALTER SEQUENCE user_transaction_id_seq OWNED BY NONE')
+
+    op.create_table('user_transaction',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='user_transaction_pkey'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute('ALTER SEQUENCE user_transaction_id_seq OWNED BY user_transaction.id')
+
+    oldest = op.get_bind().scalar(sa.text("SELECT min(timezone('UTC', created_at)) FROM user_transaction_unpartitioned"))
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current
+
+    while month <= _add_months(current, MONTHS_AHEAD):
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE user_transaction_p{month:%Y%m} PARTITION OF user_transaction "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{following} 00:00:00+00')"
+        )
+        month = following
+
+    op.execute('CREATE TABLE user_transaction_default PARTITION OF user_transaction DEFAULT')
+
+    op.execute(f'INSERT INTO user_transaction ({COLUMNS}) SELECT {COLUMNS} FROM user_transaction_unpartitioned')
+    op.drop_table('user_transaction_unpartitioned')
+
+    _create_indexes()
+    op.create_index('ix_user_transaction_user_id_created_at', 'user_transaction', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('user_transaction', 'user_transaction_partitioned')
+    op.execute('ALTER TABLE user_transaction_partitioned RENAME CONSTRAINT user_transaction_pkey TO user_transaction_partitioned_pkey')
+    op.drop_index('ix_user_transaction_user_id_created_at', table_name='user_transaction_partitioned')
+    op.drop_index('uq_user_transaction_recurring_occurrence', table_name='user_transaction_partitioned')
+    op.drop_index('ix_user_transaction_transaction_id', table_name='user_transaction_partitioned')
+    op.execute('ALTER SEQUENCE user_transaction_id_seq OWNED BY NONE')
+
+    op.create_table('user_transaction',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', name='user_transaction_pkey')
+    )
+    op.execute('ALTER SEQUENCE user_transaction_id_seq OWNED BY user_transaction.id')
+
+    op.execute(f'INSERT INTO user_transaction ({COLUMNS}) SELECT {COLUMNS} FROM user_transaction_partitioned')
+    op.drop_table('user_transaction_partitioned')
+
+    _create_indexes()
+
+    op.execute('DELETE FROM attachment WHERE NOT EXISTS (SELECT 1 FROM user_transaction WHERE user_transaction.id = attachment.user_transaction_id)')
+    op.create_foreign_key('attachment_user_transaction_id_fkey', 'attachment', 'user_transaction', ['user_transaction_id'], ['id'], ondelete='CASCADE')
@@ -0,0 +1,69 @@
+"""Add sync columns and user transaction tombstones
+
+Revision ID: e2387554accc
+Revises: 44410477132e
+Create Date: 2026-10-19 17:13:35.334346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2387554accc'
+down_revision: Union[str, Sequence[str], None] = '44410477132e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = sa.text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE pg_inherits.inhparent = 'user_transaction'::regclass"
+)
+
+
+def _create_user_transaction_index(name: str, child_suffix: str, definition: str) -> None:
+    op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON ONLY user_transaction {definition}')
+    for partition in op.get_bind().scalars(PARTITIONS).all():
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_{child_suffix} ON {partition} {definition}')
+        op.execute(f'ALTER INDEX {name} ATTACH PARTITION {partition}_{child_suffix}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('user_transaction_sync_seq')))
+    op.create_table('user_transaction_tombstone',
+    sa.Column('user_transaction_id', sa.BigInteger(), nullable=False, comment='Id of the deleted user transaction'),
+    sa.Column('user_id', sa.BigInteger(), nullable=False, comment='Reference to user'),
+    sa.Column('client_id', sa.UUID(), nullable=True, comment='Client identifier of the deleted user transaction'),
+    sa.Column('sync_seq', sa.BigInteger(), server_default=sa.text("nextval('user_transaction_sync_seq')"), nullable=False, comment='Position of the deletion in the sync change feed'),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False, comment='Deletion timestamp'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_transaction_id')
+    )
+    op.create_index('ix_user_transaction_tombstone_user_id_client_id', 'user_transaction_tombstone', ['user_id', 'client_id'], unique=False)
+    op.create_index('ix_user_transaction_tombstone_user_id_sync_seq', 'user_transaction_tombstone', ['user_id', 'sync_seq'], unique=False)
+    # Existing rows each take a sequence value; clients see them on a full sync.
+    op.add_column('user_transaction', sa.Column('client_id', sa.UUID(), nullable=True, comment='Identifier generated by the client that created the row offline'))
+    op.add_column('user_transaction', sa.Column('version', sa.Integer(), server_default='1', nullable=False, comment='Incremented on every update'))
+    op.add_column('user_transaction', sa.Column('sync_seq', sa.BigInteger(), server_default=sa.text("nextval('user_transaction_sync_seq')"), nullable=False, comment='Position of the last write in the sync change feed'))
+
+    with op.get_context().autocommit_block():
+        _create_user_transaction_index('ix_user_transaction_user_id_sync_seq', 'user_id_sync_seq_idx', '(user_id, sync_seq)')
+        _create_user_transaction_index('ix_user_transaction_user_id_client_id', 'user_id_client_id_idx', '(user_id, client_id) WHERE client_id IS NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_transaction_user_id_sync_seq', table_name='user_transaction')
+    op.drop_index('ix_user_transaction_user_id_client_id', table_name='user_transaction', postgresql_where=sa.text('client_id IS NOT NULL'))
+    op.drop_column('user_transaction', 'sync_seq')
+    op.drop_column('user_transaction', 'version')
+    op.drop_column('user_transaction', 'client_id')
+    op.drop_index('ix_user_transaction_tombstone_user_id_sync_seq', table_name='user_transaction_tombstone')
+    op.drop_index('ix_user_transaction_tombstone_user_id_client_id', table_name='user_transaction_tombstone')
+    op.drop_table('user_transaction_tombstone')
+    op.execute(sa.schema.DropSequence(sa.Sequence('user_transaction_sync_seq')))
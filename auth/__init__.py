@@ -1,9 +1,10 @@
-from .dependencies import get_current_user_id, oauth2_scheme
+from .dependencies import get_current_user_id, get_token_user_id, oauth2_scheme
 from .hashing import verify_password, get_password_hash
 from .jwt import create_access_token
 
 __all__ = [
     "get_current_user_id",
+    "get_token_user_id",
     "oauth2_scheme",
     "verify_password",
     "get_password_hash",
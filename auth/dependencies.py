@@ -2,6 +2,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from jose.exceptions import ExpiredSignatureError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from db import get_db_session
 from models import User
@@ -11,9 +12,9 @@ from core import settings
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user_id(
-    db: Session = Depends(get_db_session), token: str = Depends(oauth2_scheme)
-) -> int:
+def get_token_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """User id a valid token was issued to, whether or not the user still
+    exists; for reads that outlive the account, like its deletion status."""
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,9 +38,21 @@ def get_current_user_id(
     except JWTError:
         raise credentials_exception
 
-    user: User | None = db.get(User, user_id)
+    return user_id
 
-    if not user:
-        raise credentials_exception
 
-    return user.id
+def get_current_user_id(
+    db: Session = Depends(get_db_session), user_id: int = Depends(get_token_user_id)
+) -> int:
+
+    # Only the id: loading the User would pull in its eager relationships.
+    found_id: int | None = db.scalar(select(User.id).where(User.id == user_id))
+
+    if found_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return found_id
@@ -0,0 +1,99 @@
+"""Check that budget status follows a user's base currency change.
+
+Spend counters are kept in the base currency, so changing it must convert the
+counters already stored, not only the amounts spent afterwards. Creates a
+user and rates for the ISO test currency XTS, and removes both when done.
+
+Usage:
+    python -m benchmarks.base_currency
+"""
+
+import tempfile
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+import main
+from db import get_db
+from models import FxRate
+from services.budget import current_month
+from services.fx_rate import load_fx_rates_csv
+from .seed import EMAIL, PASSWORD, clean
+
+CURRENCY = "XTS"
+# One XTS is worth two US dollars, the reference currency.
+RATE = Decimal(2)
+
+
+def _spent(client: TestClient, headers: dict) -> Decimal:
+
+    budgets = client.get("/users/budget", headers=headers).json()["budgets"]
+
+    return Decimal(budgets[0]["spent"])
+
+
+def check_base_currency_change(client: TestClient) -> None:
+
+    email = EMAIL.format("currency")
+    client.post(
+        "/auth/signup", json={"name": "Currency", "email": email, "password": PASSWORD}
+    )
+    token = client.post(
+        "/auth/login", data={"username": email, "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.put(
+        "/users/budget", headers=headers, json={"category": "Food", "amount": 100}
+    )
+    client.post(
+        "/users/transaction",
+        headers=headers,
+        json={"type": "EXPENSE", "title": "Lunch", "category": "Food", "amount": "60"},
+    )
+    assert _spent(client, headers) == Decimal("60.00")
+
+    client.patch(
+        "/users/preferences", headers=headers, json={"base_currency": CURRENCY}
+    )
+    client.post(
+        "/users/transaction",
+        headers=headers,
+        json={
+            "type": "EXPENSE",
+            "title": "Lunch",
+            "category": "Food",
+            "amount": "10",
+            "currency": CURRENCY,
+        },
+    )
+    spent = _spent(client, headers)
+    assert spent == Decimal("40.00"), f"spent {spent} XTS, expected 40.00"
+
+    client.put(
+        "/users",
+        headers=headers,
+        json={"preferences": {"base_currency": "USD"}},
+    )
+    spent = _spent(client, headers)
+    assert spent == Decimal("80.00"), f"spent {spent} USD, expected 80.00"
+
+
+if __name__ == "__main__":
+    with tempfile.NamedTemporaryFile("w", suffix=".csv") as rates:
+        rates.write(f"date,currency,rate\n{current_month()},{CURRENCY},{RATE}\n")
+        rates.flush()
+
+        with get_db() as db:
+            load_fx_rates_csv(db, rates.name)
+
+    try:
+        check_base_currency_change(TestClient(main.app))
+    finally:
+        with get_db() as db:
+            clean(db)
+            db.execute(delete(FxRate).where(FxRate.currency == CURRENCY))
+            db.commit()
+
+    print("ok   budget status follows the base currency")
@@ -0,0 +1,125 @@
+"""Latency and accuracy benchmark for the per-user category predictor.
+
+Usage:
+    python -m benchmarks.categorizer --rows 5000 --seed 7
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from statistics import quantiles
+
+from enums import TransactionType
+from services.categorizer import NaiveBayesCategorizer, extract_features
+
+PROFILES: dict[str, tuple[TransactionType, list[str], tuple[int, int]]] = {
+    "Food": (
+        TransactionType.EXPENSE,
+        ["grocery", "restaurant", "pizza", "coffee", "bakery", "lunch", "dinner"],
+        (5, 80),
+    ),
+    "Transport": (
+        TransactionType.EXPENSE,
+        ["uber", "taxi", "fuel", "bus", "metro", "parking", "train"],
+        (2, 60),
+    ),
+    "Rent": (
+        TransactionType.EXPENSE,
+        ["rent", "landlord", "apartment", "lease", "housing"],
+        (600, 2500),
+    ),
+    "Utilities": (
+        TransactionType.EXPENSE,
+        ["electricity", "water", "internet", "gas", "phone", "bill"],
+        (20, 200),
+    ),
+    "Entertainment": (
+        TransactionType.EXPENSE,
+        ["cinema", "netflix", "concert", "games", "spotify", "movie"],
+        (5, 120),
+    ),
+    "Salary": (
+        TransactionType.INCOME,
+        ["salary", "payroll", "wage", "bonus", "employer"],
+        (1500, 8000),
+    ),
+}
+
+NOISE = ["monthly", "payment", "card", "online", "shop", "store", "weekly", "misc"]
+
+
+def synthesize(rng: random.Random, rows: int) -> list[tuple[list[str], str]]:
+
+    samples = []
+    categories = list(PROFILES)
+
+    for _ in range(rows):
+        category = rng.choice(categories)
+        type, words, (low, high) = PROFILES[category]
+
+        if rng.random() < 0.1:
+            category = rng.choice(categories)
+
+        title = " ".join(rng.sample(words, 1) + rng.sample(NOISE, rng.randint(0, 2)))
+        details = rng.choice([None, " ".join(rng.sample(words + NOISE, 2))])
+        amount = Decimal(rng.uniform(low, high)).quantize(Decimal("0.01"))
+
+        samples.append((extract_features(title, details, amount, type), category))
+
+    return samples
+
+
+def check_stale_forget() -> None:
+    """Forgetting a row the model never learned, as a per-process model does
+    for rows another process wrote, must leave it able to predict."""
+
+    categorizer = NaiveBayesCategorizer()
+    categorizer.learn(extract_features("coffee shop"), "Food")
+    categorizer.learn(extract_features("pizza"), "Food")
+    categorizer.learn(extract_features("rent"), "Rent")
+    categorizer.forget(extract_features("uber ride"), "Food")
+
+    predicted, confidence = categorizer.predict(extract_features("uber pizza"))
+    assert predicted == "Food" and 0 < confidence <= 1, (predicted, confidence)
+
+
+def run(rows: int, seed: int, train_ratio: float) -> None:
+
+    rng = random.Random(seed)
+    samples = synthesize(rng, rows)
+    split = int(len(samples) * train_ratio)
+    train, test = samples[:split], samples[split:]
+
+    categorizer = NaiveBayesCategorizer()
+
+    started = time.perf_counter()
+    for features, category in train:
+        categorizer.learn(features, category)
+    train_seconds = time.perf_counter() - started
+
+    latencies = []
+    correct = 0
+    for features, category in test:
+        started = time.perf_counter()
+        predicted, _ = categorizer.predict(features)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+        correct += predicted == category
+
+    p50, p95, p99 = (quantiles(latencies, n=100)[i] for i in (49, 94, 98))
+
+    print(f"train rows     : {len(train)} ({train_seconds * 1000:.1f} ms)")
+    print(f"test rows      : {len(test)}")
+    print(f"accuracy       : {correct / len(test):.3f}")
+    print(f"predict p50/p95/p99 : {p50:.1f} / {p95:.1f} / {p99:.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--train-ratio", type=float, default=0.8)
+    args = parser.parse_args()
+
+    check_stale_forget()
+    run(rows=args.rows, seed=args.seed, train_ratio=args.train_ratio)
@@ -0,0 +1,250 @@
+"""Report sequential scans over large tables in the statements the services issue.
+
+Seeds synthetic users and transactions, installs a QueryPlanAdvisor on the
+application engine, then drives the API and the maintenance services and
+prints every statement whose plan sequentially scans a relation with at least
+--min-rows rows. Needs DATABASE_URL; the seeded users are removed afterwards
+unless --keep is given.
+
+Usage:
+    python -m benchmarks.index_advisor --users 50 --rows-per-user 2000
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import main
+from db import get_db, QueryPlanAdvisor
+from db.db_setup import engine
+from services.budget import reconcile_spend_counters
+from services.job import claim_job, prune_finished_jobs
+from services.orphan import collect_orphans
+from services.partition import ensure_user_transaction_partitions
+from services.recurring_rule import materialize_due_occurrences
+
+EMAIL = "advisor-{}@example.com"
+PASSWORD = "advisor-password"
+CATEGORIES = 20
+TEMPLATES = 500
+
+
+def seed(client: TestClient, users: int, rows_per_user: int) -> None:
+
+    for index in range(users):
+        client.post(
+            "/auth/signup",
+            json={
+                "name": f"Advisor {index}",
+                "email": EMAIL.format(index),
+                "password": PASSWORD,
+            },
+        )
+
+    with get_db() as db:
+        db.execute(
+            text(
+                "INSERT INTO category (user_id, name) "
+                "SELECT \"user\".id, 'Advisor ' || i "
+                'FROM "user" CROSS JOIN generate_series(1, :categories) AS i '
+                "WHERE \"user\".email LIKE 'advisor-%' "
+                "ON CONFLICT (user_id, name) DO NOTHING"
+            ),
+            {"categories": CATEGORIES},
+        )
+        db.execute(
+            text(
+                "INSERT INTO transaction (type, title, category_id) "
+                "SELECT 'EXPENSE', 'advisor item ' || i, category.id "
+                "FROM generate_series(1, :templates) AS i "
+                "JOIN category "
+                "ON category.name = 'Advisor ' || (1 + i % :categories) "
+                "WHERE category.user_id IS NOT NULL "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"templates": TEMPLATES, "categories": CATEGORIES},
+        )
+        db.execute(
+            text(
+                "INSERT INTO user_category (user_id, category_id) "
+                "SELECT category.user_id, category.id FROM category "
+                "WHERE category.name LIKE 'Advisor %' "
+                "AND category.user_id IS NOT NULL "
+                "ON CONFLICT DO NOTHING"
+            )
+        )
+        db.execute(
+            text(
+                "INSERT INTO user_transaction "
+                "(user_id, transaction_id, amount, details, created_at) "
+                'SELECT "user".id, '
+                "templates.ids[1 + i % array_length(templates.ids, 1)], "
+                "round((random() * 200)::numeric, 2), 'seeded', "
+                "now() - random() * interval '700 days' "
+                'FROM "user" CROSS JOIN generate_series(1, :rows) AS i '
+                "CROSS JOIN LATERAL (SELECT array_agg(transaction.id) AS ids "
+                "FROM transaction JOIN category "
+                "ON category.id = transaction.category_id "
+                'WHERE category.user_id = "user".id '
+                "AND transaction.title LIKE 'advisor item %') AS templates "
+                "WHERE \"user\".email LIKE 'advisor-%'"
+            ),
+            {"rows": rows_per_user},
+        )
+        db.commit()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def exercise_api(client: TestClient, sample: int) -> None:
+
+    for index in range(sample):
+        token = client.post(
+            "/auth/login",
+            data={"username": EMAIL.format(index), "password": PASSWORD},
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        client.get("/users", headers=headers)
+        client.get("/users/category", headers=headers)
+        client.get("/users/transaction", headers=headers)
+        client.get(
+            "/users/transaction",
+            headers=headers,
+            params={"start": "2026-01-01", "end": "2026-01-31"},
+        )
+        client.get("/users/transaction/summary", headers=headers)
+        client.get(
+            "/users/transaction/suggest", headers=headers, params={"prefix": "adv"}
+        )
+        client.post(
+            "/users/transaction/predict-category",
+            headers=headers,
+            json={"title": "advisor item 7", "amount": "12.00", "type": "EXPENSE"},
+        )
+
+        created = client.post(
+            "/users/transaction",
+            headers=headers,
+            json={
+                "type": "EXPENSE",
+                "title": "advisor item 3",
+                "category": "Advisor 4",
+                "amount": "9.99",
+            },
+        ).json()
+        client.put(
+            f"/users/transaction/{created['id']}",
+            headers=headers,
+            json={"amount": "19.99"},
+        )
+        client.post(
+            f"/users/transaction/{created['id']}/attachments",
+            headers=headers,
+            files={"file": ("receipt.txt", f"receipt {index}".encode(), "text/plain")},
+        )
+        client.get(f"/users/transaction/{created['id']}/attachments", headers=headers)
+        client.get("/users/attachments/usage", headers=headers)
+        client.delete(f"/users/transaction/{created['id']}", headers=headers)
+
+        client.put(
+            "/users/budget",
+            headers=headers,
+            json={"category": "Advisor 4", "amount": "500"},
+        )
+        client.get("/users/budget", headers=headers)
+        client.post(
+            "/users/recurring",
+            headers=headers,
+            json={
+                "type": "EXPENSE",
+                "title": "advisor rent",
+                "category": "Advisor 1",
+                "amount": "900",
+                "frequency": "MONTHLY",
+                "start_date": "2026-01-01",
+            },
+        )
+        client.get("/users/recurring", headers=headers)
+        client.post(
+            "/users/transaction/export-jobs", headers=headers, json={"format": "csv"}
+        )
+        client.get("/users/jobs", headers=headers)
+
+
+def exercise_maintenance() -> None:
+
+    with get_db() as db:
+        materialize_due_occurrences(db=db)
+        reconcile_spend_counters(db=db)
+        claim_job(db=db, worker_id="index-advisor")
+        prune_finished_jobs(db=db, older_than=timedelta(days=7))
+        ensure_user_transaction_partitions(db=db)
+        collect_orphans(db=db, max_batches=1)
+
+
+def cleanup() -> None:
+
+    with get_db() as db:
+        db.execute(text("DELETE FROM \"user\" WHERE email LIKE 'advisor-%'"))
+        db.commit()
+        collect_orphans(db=db)
+
+
+def run(users: int, rows_per_user: int, sample: int, min_rows: int, keep: bool) -> int:
+
+    client = TestClient(main.app)
+    seed(client, users=users, rows_per_user=rows_per_user)
+
+    advisor = QueryPlanAdvisor(engine, min_rows=min_rows)
+    advisor.install()
+
+    try:
+        exercise_api(client, sample=min(sample, users))
+        exercise_maintenance()
+    finally:
+        advisor.uninstall()
+
+        if not keep:
+            cleanup()
+
+    findings = advisor.findings()
+
+    for finding in findings:
+        statement = " ".join(finding.statement.split())
+        print(f"{finding.relation} (~{finding.rows} rows)")
+        print(f"    {statement[:300]}")
+
+    print(f"{len(findings)} sequential scan(s) over {min_rows} rows")
+
+    return len(findings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rows-per-user", type=int, default=2000)
+    parser.add_argument("--sample", type=int, default=5)
+    parser.add_argument("--min-rows", type=int, default=10_000)
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument(
+        "--fail-on-findings",
+        action="store_true",
+        help="Exit with status 1 when any sequential scan is reported",
+    )
+    args = parser.parse_args()
+
+    found = run(
+        users=args.users,
+        rows_per_user=args.rows_per_user,
+        sample=args.sample,
+        min_rows=args.min_rows,
+        keep=args.keep,
+    )
+
+    if args.fail_on_findings and found:
+        sys.exit(1)
@@ -0,0 +1,283 @@
+"""Concurrent load test of the user and transaction endpoints.
+
+Each virtual user signs up, logs in, then repeatedly adds, lists, updates,
+summarizes and deletes transactions, queueing an export every few rounds.
+Requests go in-process to the ASGI app through httpx, or to a running server
+with --base-url. --seed-users fills the database with background data through
+benchmarks.seed first. Results can be saved with --output and compared with a
+previous run with --compare.
+
+Usage:
+    python -m benchmarks.load --seed-users 100 --seed-transactions 1000
+    python -m benchmarks.load --users 20 --iterations 25 --output before.json
+    python -m benchmarks.load --users 20 --iterations 25 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from statistics import quantiles
+
+import httpx
+
+PASSWORD = "load-password"
+EXPORT_EVERY = 5
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, operation: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[operation].append((time.perf_counter() - started) * 1000)
+
+        if response.is_error:
+            self.errors[operation] += 1
+
+        return response
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    run_id: str,
+    index: int,
+    iterations: int,
+) -> None:
+
+    email = f"load-{run_id}-{index}@example.com"
+
+    await recorder.request(
+        client,
+        "signup",
+        "POST",
+        "/auth/signup",
+        json={"name": f"Load {index}", "email": email, "password": PASSWORD},
+    )
+    token = (
+        await recorder.request(
+            client,
+            "login",
+            "POST",
+            "/auth/login",
+            data={"username": email, "password": PASSWORD},
+        )
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    month_start = date.today().replace(day=1).isoformat()
+
+    for iteration in range(iterations):
+        created = await recorder.request(
+            client,
+            "add",
+            "POST",
+            "/users/transaction",
+            headers=headers,
+            json={
+                "type": "EXPENSE",
+                "title": f"Coffee {iteration % 7}",
+                "category": "Food",
+                "amount": "4.50",
+            },
+        )
+        transaction_id = created.json()["id"]
+
+        await recorder.request(
+            client,
+            "list",
+            "GET",
+            "/users/transaction",
+            headers=headers,
+            params={"start": month_start},
+        )
+        await recorder.request(
+            client,
+            "update",
+            "PUT",
+            f"/users/transaction/{transaction_id}",
+            headers=headers,
+            json={"amount": "5.25"},
+        )
+        await recorder.request(
+            client, "summary", "GET", "/users/transaction/summary", headers=headers
+        )
+
+        if iteration % EXPORT_EVERY == 0:
+            await recorder.request(
+                client,
+                "export",
+                "POST",
+                "/users/transaction/export-jobs",
+                headers=headers,
+                json={"format": "csv", "start": month_start},
+            )
+
+        if iteration % 2:
+            await recorder.request(
+                client,
+                "delete",
+                "DELETE",
+                f"/users/transaction/{transaction_id}",
+                headers=headers,
+            )
+
+    await client.delete("/users", headers=headers)
+
+
+def _percentiles(latencies: list[float]) -> tuple[float, float, float]:
+
+    if len(latencies) < 2:
+        return (latencies[0],) * 3 if latencies else (0.0, 0.0, 0.0)
+
+    cuts = quantiles(latencies, n=100)
+
+    return cuts[49], cuts[94], cuts[98]
+
+
+def _commit() -> str | None:
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(recorder: Recorder, elapsed: float, config: dict) -> dict:
+
+    operations = {}
+
+    for operation, latencies in sorted(recorder.latencies.items()):
+        p50, p95, p99 = _percentiles(latencies)
+        operations[operation] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[operation],
+            "throughput": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+        }
+
+    total = sum(len(latencies) for latencies in recorder.latencies.values())
+
+    return {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": config,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput": round(total / elapsed, 2),
+        "operations": operations,
+    }
+
+
+def print_report(result: dict, baseline: dict | None = None) -> None:
+
+    def delta(current: float, previous: float | None) -> str:
+        if not previous:
+            return ""
+        return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+    print(f"commit         : {result['commit']}")
+    print(f"elapsed        : {result['elapsed_seconds']} s")
+    print(
+        f"throughput     : {result['throughput']} req/s"
+        + delta(result["throughput"], baseline and baseline["throughput"])
+    )
+
+    for operation, stats in result["operations"].items():
+        previous = (baseline or {}).get("operations", {}).get(operation, {})
+        print(
+            f"{operation:<8} {stats['requests']:>6} req {stats['errors']:>4} err  "
+            + "  ".join(
+                f"{key[:3]} {stats[key]:8.2f} ms{delta(stats[key], previous.get(key))}"
+                for key in ("p50_ms", "p95_ms", "p99_ms")
+            )
+        )
+
+
+async def run(users: int, iterations: int, base_url: str | None) -> dict:
+
+    if base_url:
+        transport = None
+    else:
+        import main
+
+        transport = httpx.ASGITransport(app=main.app)
+
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url or "http://bench", timeout=60
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                virtual_user(client, recorder, run_id, index, iterations)
+                for index in range(users)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    return report(
+        recorder,
+        elapsed,
+        {"users": users, "iterations": iterations, "base_url": base_url},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=25)
+    parser.add_argument(
+        "--base-url", default=None, help="Target a running server instead"
+    )
+    parser.add_argument("--seed-users", type=int, default=0)
+    parser.add_argument("--seed-transactions", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    parser.add_argument("--compare", default=None, help="Baseline JSON report")
+    args = parser.parse_args()
+
+    if args.seed_users:
+        from db import get_db
+        from .seed import seed
+
+        with get_db() as db:
+            seed(
+                db,
+                users=args.seed_users,
+                transactions=args.seed_transactions,
+                rng=random.Random(7),
+            )
+
+    result = asyncio.run(
+        run(users=args.users, iterations=args.iterations, base_url=args.base_url)
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
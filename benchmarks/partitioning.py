@@ -0,0 +1,220 @@
+"""Range-query, vacuum and retention benchmark for user_transaction partitions.
+
+Loads the same synthetic rows into a plain table and a table partitioned by
+month in a scratch schema, then compares them. Needs DATABASE_URL; the scratch
+schema is dropped afterwards unless --keep is given.
+
+Usage:
+    python -m benchmarks.partitioning --rows 5000000 --months 36
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timezone
+from statistics import median
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from core import settings
+from services.partition import add_months
+
+SCHEMA = "bench_partitioning"
+
+COLUMNS = """
+    id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    transaction_id bigint NOT NULL,
+    amount numeric(15, 2) NOT NULL,
+    details varchar,
+    created_at timestamptz NOT NULL,
+    updated_at timestamptz NOT NULL DEFAULT now()
+"""
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(month, datetime.min.time(), timezone.utc),
+        datetime.combine(add_months(month, 1), datetime.min.time(), timezone.utc),
+    )
+
+
+def _timed(conn: Connection, sql: str, params: dict | None = None) -> float:
+
+    started = time.perf_counter()
+    conn.execute(text(sql), params or {})
+
+    return (time.perf_counter() - started) * 1000
+
+
+def _scanned_relations(conn: Connection, sql: str, params: dict) -> int:
+
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+    relations: set[str] = set()
+
+    def walk(node: dict) -> None:
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+
+    return len(relations)
+
+
+def load(conn: Connection, rows: int, months: int, users: int) -> list[date]:
+
+    first = add_months(datetime.now(timezone.utc).date().replace(day=1), -months + 1)
+    month_list = [add_months(first, offset) for offset in range(months)]
+    start, _ = _month_bounds(first)
+    _, end = _month_bounds(month_list[-1])
+
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.plain ({COLUMNS}, PRIMARY KEY (id))"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, "
+            "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        )
+    )
+
+    for month in month_list:
+        lower, upper = _month_bounds(month)
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.partitioned_p{month:%Y%m} "
+                f"PARTITION OF {SCHEMA}.partitioned "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+
+    started = time.perf_counter()
+    conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.plain "
+            "(id, user_id, transaction_id, amount, details, created_at) "
+            "SELECT i, 1 + (i * 7919) % :users, 1 + i % 5000, "
+            "round((random() * 500)::numeric, 2), 'synthetic row ' || i, "
+            ":start + random() * (:end - :start) "
+            "FROM generate_series(1::bigint, :rows) AS i"
+        ),
+        {"users": users, "rows": rows, "start": start, "end": end},
+    )
+    conn.execute(text(f"INSERT INTO {SCHEMA}.partitioned SELECT * FROM {SCHEMA}.plain"))
+
+    for table in ("plain", "partitioned"):
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (user_id, created_at)"))
+        conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table}"))
+
+    print(
+        f"loaded rows    : {rows} over {months} months in "
+        f"{time.perf_counter() - started:.1f} s"
+    )
+
+    return month_list
+
+
+def bench_range_queries(
+    conn: Connection, month_list: list[date], users: int, repeat: int
+) -> None:
+
+    lower, upper = _month_bounds(month_list[-2])
+    queries = {
+        "month total": (
+            "SELECT count(*), sum(amount) FROM {table} "
+            "WHERE created_at >= :lower AND created_at < :upper",
+            {"lower": lower, "upper": upper},
+        ),
+        "user month": (
+            "SELECT * FROM {table} WHERE user_id = :user_id "
+            "AND created_at >= :lower AND created_at < :upper ORDER BY created_at",
+            {"lower": lower, "upper": upper, "user_id": users // 2},
+        ),
+    }
+
+    for name, (sql, params) in queries.items():
+        for table in ("plain", "partitioned"):
+            statement = sql.format(table=f"{SCHEMA}.{table}")
+            timings = [_timed(conn, statement, params) for _ in range(repeat)]
+            scanned = _scanned_relations(conn, statement, params)
+            print(
+                f"{name:<14} {table:<12}: {median(timings):8.2f} ms "
+                f"(median of {repeat}, {scanned} relation(s) scanned)"
+            )
+
+
+def bench_vacuum(conn: Connection, month_list: list[date]) -> None:
+
+    lower, upper = _month_bounds(month_list[-1])
+    latest = f"{SCHEMA}.partitioned_p{month_list[-1]:%Y%m}"
+
+    # Recent rows are the ones that get edited; the dead tuples stay in one month.
+    for table in ("plain", "partitioned"):
+        conn.execute(
+            text(
+                f"UPDATE {SCHEMA}.{table} SET amount = amount + 1, updated_at = now() "
+                "WHERE created_at >= :lower AND created_at < :upper"
+            ),
+            {"lower": lower, "upper": upper},
+        )
+
+    plain = _timed(conn, f"VACUUM {SCHEMA}.plain")
+    partition = _timed(conn, f"VACUUM {latest}")
+
+    print(f"vacuum         plain       : {plain:8.2f} ms (whole table)")
+    print(f"vacuum         partitioned : {partition:8.2f} ms (edited month only)")
+
+
+def bench_retention(conn: Connection, month_list: list[date]) -> None:
+
+    lower, upper = _month_bounds(month_list[0])
+    oldest = f"{SCHEMA}.partitioned_p{month_list[0]:%Y%m}"
+
+    plain = _timed(
+        conn,
+        f"DELETE FROM {SCHEMA}.plain WHERE created_at >= :lower AND created_at < :upper",
+        {"lower": lower, "upper": upper},
+    )
+    partitioned = _timed(
+        conn, f"ALTER TABLE {SCHEMA}.partitioned DETACH PARTITION {oldest}"
+    ) + _timed(conn, f"DROP TABLE {oldest}")
+
+    print(f"drop month     plain       : {plain:8.2f} ms (DELETE)")
+    print(f"drop month     partitioned : {partitioned:8.2f} ms (DETACH + DROP)")
+
+
+def run(rows: int, months: int, users: int, repeat: int, keep: bool) -> None:
+
+    engine = create_engine(settings.DATABASE_URL, isolation_level="AUTOCOMMIT")
+
+    try:
+        with engine.connect() as conn:
+            month_list = load(conn, rows=rows, months=months, users=users)
+            bench_range_queries(conn, month_list, users=users, repeat=repeat)
+            bench_vacuum(conn, month_list)
+            bench_retention(conn, month_list)
+
+            if not keep:
+                conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    run(
+        rows=args.rows,
+        months=args.months,
+        users=args.users,
+        repeat=args.repeat,
+        keep=args.keep,
+    )
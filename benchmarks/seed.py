@@ -0,0 +1,214 @@
+"""Seed synthetic users and transactions through the application models.
+
+Titles, categories and amounts follow the profiles of the categorizer
+benchmark; popular titles are drawn far more often than rare ones. Seeded
+users share the password ``PASSWORD`` and can be removed with --clean.
+
+Usage:
+    python -m benchmarks.seed --users 100 --transactions 1000 --seed 7
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from auth.hashing import get_password_hash
+from db import get_db
+from enums import TransactionType
+from models import Category, Transaction, User, UserCategory, UserTransaction
+from services.budget import reconcile_spend_counters
+from services.orphan import collect_orphans
+from .categorizer import PROFILES, NOISE
+
+EMAIL = "bench-{}@example.com"
+PASSWORD = "bench-password"
+INSERT_CHUNK_SIZE = 5000
+
+CATEGORY_WEIGHTS = {
+    "Food": 35,
+    "Transport": 20,
+    "Entertainment": 15,
+    "Utilities": 10,
+    "Rent": 3,
+    "Salary": 3,
+}
+
+
+def _templates(rng: random.Random) -> list[tuple[TransactionType, str, str]]:
+    """One (type, title, category) per profile word, plus a few noisy variants."""
+
+    templates = []
+
+    for category, (type, words, _) in PROFILES.items():
+        for word in words:
+            templates.append((type, word.title(), category))
+            templates.append((type, f"{word} {rng.choice(NOISE)}".title(), category))
+
+    return templates
+
+
+def _template_ids(
+    db: Session,
+    user_ids: list[int],
+    templates: list[tuple[TransactionType, str, str]],
+) -> dict[int, list[tuple[int, int]]]:
+    """Create each user's categories and templates; returns their
+    (transaction id, category id) pairs by user, in the order of ``templates``."""
+
+    category_ids = {
+        (user_id, name): id
+        for id, user_id, name in db.execute(
+            insert(Category)
+            .values(
+                [{"user_id": u, "name": name} for u in user_ids for name in PROFILES]
+            )
+            .returning(Category.id, Category.user_id, Category.name)
+        )
+    }
+
+    # Noisy variants can repeat a title; each template is created once.
+    keys = [(u, *template) for u in user_ids for template in dict.fromkeys(templates)]
+    transaction_ids = db.scalars(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        [
+            {"type": type, "title": title, "category_id": category_ids[(u, category)]}
+            for u, type, title, category in keys
+        ],
+    ).all()
+    ids = dict(zip(keys, transaction_ids))
+
+    return {
+        u: [
+            (ids[(u, type, title, category)], category_ids[(u, category)])
+            for type, title, category in templates
+        ]
+        for u in user_ids
+    }
+
+
+def seed(
+    db: Session, users: int, transactions: int, rng: random.Random, months: int = 12
+) -> list[int]:
+    """Create ``users`` users with ``transactions`` transactions each; returns ids."""
+
+    templates = _templates(rng)
+
+    # Zipf-like popularity: the n-th title of a category is 1/n as likely.
+    weights = []
+    rank: dict[str, int] = {}
+    for _, _, category in templates:
+        rank[category] = rank.get(category, 0) + 1
+        weights.append(CATEGORY_WEIGHTS[category] / rank[category])
+
+    hashed_password = get_password_hash(PASSWORD)
+    first = db.scalar(select(User.id).order_by(User.id.desc()).limit(1)) or 0
+
+    user_ids = list(
+        db.scalars(
+            insert(User)
+            .values(
+                [
+                    {
+                        "name": f"Bench {first + index}",
+                        "email": EMAIL.format(first + index),
+                        "hashed_password": hashed_password,
+                    }
+                    for index in range(users)
+                ]
+            )
+            .returning(User.id)
+        )
+    )
+
+    template_ids = _template_ids(db, user_ids, templates)
+
+    # Dates are drawn back from midnight, so a given seed spreads transactions
+    # over the same days whatever the time it runs at.
+    now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    span = timedelta(days=30 * months).total_seconds()
+    rows: list[dict] = []
+    links: set[tuple[int, int]] = set()
+
+    def flush() -> None:
+        if rows:
+            db.execute(insert(UserTransaction), rows)
+            rows.clear()
+
+    for user_id in user_ids:
+        for index in rng.choices(range(len(templates)), weights, k=transactions):
+            _, _, category = templates[index]
+            low, high = PROFILES[category][2]
+
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "transaction_id": template_ids[user_id][index][0],
+                    "amount": Decimal(rng.uniform(low, high)).quantize(Decimal("0.01")),
+                    "details": rng.choice([None, None, rng.choice(NOISE)]),
+                    "created_at": now - timedelta(seconds=rng.uniform(0, span)),
+                }
+            )
+            links.add((user_id, template_ids[user_id][index][1]))
+
+            if len(rows) >= INSERT_CHUNK_SIZE:
+                flush()
+
+    flush()
+
+    db.execute(
+        insert(UserCategory)
+        .values([{"user_id": u, "category_id": c} for u, c in sorted(links)])
+        .on_conflict_do_nothing()
+    )
+    db.commit()
+
+    reconcile_spend_counters(db=db)
+
+    return user_ids
+
+
+def clean(db: Session) -> int:
+    """Delete every seeded user; their rows go with them."""
+
+    removed = db.execute(
+        delete(User).where(User.email.like(EMAIL.format("%")))
+    ).rowcount
+    db.commit()
+
+    collect_orphans(db=db)
+
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--clean", action="store_true", help="Remove previously seeded users"
+    )
+    args = parser.parse_args()
+
+    with get_db() as db:
+        if args.clean:
+            print(f"removed users  : {clean(db)}")
+        else:
+            started = time.perf_counter()
+            user_ids = seed(
+                db,
+                users=args.users,
+                transactions=args.transactions,
+                rng=random.Random(args.seed),
+                months=args.months,
+            )
+            print(f"seeded users   : {len(user_ids)}")
+            print(f"transactions   : {len(user_ids) * args.transactions}")
+            print(f"elapsed        : {time.perf_counter() - started:.1f} s")
@@ -0,0 +1,519 @@
+"""Check the SQL statements, returned rows and commits of every API route.
+
+Seeds synthetic users through benchmarks.seed, then calls each route in
+routers/ once as one of the seeded users with a StatementRecorder installed on
+the application engine, and compares the counts against the budgets in
+statement_budgets.json. A route over budget is printed with a diff of its
+statements against the ones recorded with the budget, so N+1 queries and
+eager loads show up as added lines. Routes without a budget fail too.
+
+Run against a freshly migrated database: the budgets include rows from global
+tables such as the transaction templates. --record rewrites the budgets from
+the current run.
+
+Usage:
+    python -m benchmarks.statement_budget
+    python -m benchmarks.statement_budget --route "POST /users/transaction"
+    python -m benchmarks.statement_budget --record
+"""
+
+import argparse
+import difflib
+import io
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import select
+
+import main
+from db import get_db, StatementRecorder
+from db.db_setup import engine
+from models import User
+from workers import run_next_job
+from .seed import EMAIL, PASSWORD, clean, seed
+
+BUDGETS_PATH = Path(__file__).with_name("statement_budgets.json")
+# Expanded IN lists differ in length from run to run.
+PARAMETER_LIST = re.compile(r"%\(\w+\)s(?:, %\(\w+\)s)*")
+
+
+class Measurement(NamedTuple):
+    statements: list[str]
+    rows: int
+    commits: int
+    status_code: int
+
+
+def normalize(statement: str) -> str:
+    return PARAMETER_LIST.sub("?", statement)
+
+
+class BudgetCheck:
+    def __init__(self, client: TestClient, recorder: StatementRecorder):
+        self.client = client
+        self.recorder = recorder
+        self.measurements: dict[str, Measurement] = {}
+
+    def measure(
+        self, method: str, path: str, path_params: dict | None = None, **kwargs
+    ):
+        """Call ``path`` with the recorder reset and keep its counts."""
+
+        self.recorder.reset()
+        response = self.client.request(
+            method, path.format(**(path_params or {})), **kwargs
+        )
+
+        self.measurements[f"{method} {path}"] = Measurement(
+            statements=[
+                normalize(statement.statement)
+                for statement in self.recorder.statements()
+            ],
+            rows=self.recorder.rows(),
+            commits=self.recorder.commits(),
+            status_code=response.status_code,
+        )
+
+        return response
+
+
+def _png() -> bytes:
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "steelblue").save(buffer, format="PNG")
+
+    return buffer.getvalue()
+
+
+def _wait_for_thumbnail(
+    client: TestClient, url: str, headers: dict, timeout: float = 30
+) -> None:
+
+    deadline = time.monotonic() + timeout
+
+    while client.get(url, headers=headers).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Thumbnail {url} was not generated")
+        time.sleep(0.2)
+
+
+def exercise(check: BudgetCheck, email: str) -> None:
+    """One call per route, as the seeded user ``email``."""
+
+    client, measure = check.client, check.measure
+    signup_email = EMAIL.format("signup")
+
+    measure(
+        "POST",
+        "/auth/signup",
+        json={"name": "Budget", "email": signup_email, "password": PASSWORD},
+    )
+    token = measure(
+        "POST", "/auth/login", data={"username": email, "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    measure("GET", "/auth/verify-token", headers=headers)
+    measure("GET", "/users", headers=headers)
+    measure("GET", "/users/me", headers=headers)
+    measure("PUT", "/users", headers=headers, json={"name": "Budget Check"})
+    measure(
+        "PATCH",
+        "/users/preferences",
+        headers=headers,
+        json={"theme": "dark", "notifications": None},
+    )
+    measure("GET", "/users/preferences", headers=headers)
+
+    measure("GET", "/transaction")
+    measure("GET", "/category", headers=headers)
+    # The stats variant is the heavier of the two reads this route serves.
+    measure("GET", "/users/category", headers=headers, params={"with_stats": True})
+    measure(
+        "POST", "/users/category", headers=headers, json={"category_name": "Budget"}
+    )
+    measure(
+        "PATCH",
+        "/users/category/{category_name}",
+        {"category_name": "Budget"},
+        headers=headers,
+        json={"parent": "Food"},
+    )
+    measure(
+        "DELETE",
+        "/users/category/{category_name}",
+        {"category_name": "Budget"},
+        headers=headers,
+    )
+
+    transactions = measure("GET", "/users/transaction", headers=headers).json()
+    measure(
+        "GET", "/users/transaction/suggest", headers=headers, params={"prefix": "co"}
+    )
+    measure("GET", "/users/transaction/summary", headers=headers)
+    measure(
+        "POST",
+        "/users/transaction/predict-category",
+        headers=headers,
+        json={"title": "Coffee", "amount": "4.50", "type": "EXPENSE"},
+    )
+    measure(
+        "POST",
+        "/users/transaction/predict-category/batch",
+        headers=headers,
+        json={
+            "items": [
+                {"title": title, "amount": "20.00", "type": "EXPENSE"}
+                for title in ("Coffee", "Taxi", "Cinema", "Electricity")
+            ]
+        },
+    )
+
+    created = measure(
+        "POST",
+        "/users/transaction",
+        headers=headers,
+        json={
+            "type": "EXPENSE",
+            "title": "Coffee",
+            "category": "Food",
+            "amount": "4.50",
+        },
+    ).json()
+    transaction = {"user_transaction_id": created["id"]}
+    measure(
+        "PUT",
+        "/users/transaction/{user_transaction_id}",
+        transaction,
+        headers=headers,
+        json={"amount": "5.25"},
+    )
+
+    attachment = measure(
+        "POST",
+        "/users/transaction/{user_transaction_id}/attachments",
+        transaction,
+        headers=headers,
+        files={"file": ("receipt.png", _png(), "image/png")},
+    ).json()
+    measure(
+        "GET",
+        "/users/transaction/{user_transaction_id}/attachments",
+        transaction,
+        headers=headers,
+    )
+    measure("GET", "/users/attachments/usage", headers=headers)
+    measure(
+        "GET",
+        "/users/attachments/{attachment_id}",
+        {"attachment_id": attachment["id"]},
+        headers=headers,
+    )
+
+    thumbnail = {"attachment_id": attachment["id"], "size": 128}
+    _wait_for_thumbnail(
+        client,
+        "/users/attachments/{attachment_id}/thumbnails/{size}".format(**thumbnail),
+        headers,
+    )
+    measure(
+        "GET",
+        "/users/attachments/{attachment_id}/thumbnails/{size}",
+        thumbnail,
+        headers=headers,
+    )
+    measure(
+        "DELETE",
+        "/users/attachments/{attachment_id}",
+        {"attachment_id": attachment["id"]},
+        headers=headers,
+    )
+    measure(
+        "DELETE",
+        "/users/transaction/{user_transaction_id}",
+        transaction,
+        headers=headers,
+    )
+
+    client_ids = [str(uuid.UUID(int=index)) for index in range(1, 4)]
+    measure(
+        "POST",
+        "/users/sync",
+        headers=headers,
+        json={
+            "cursor": max(row["sync_seq"] for row in transactions["transactions"]),
+            "operations": [
+                *(
+                    {
+                        "op": "CREATE",
+                        "client_id": client_id,
+                        "transaction": {
+                            "type": "EXPENSE",
+                            "title": "Coffee",
+                            "category": "Food",
+                            "amount": "3.20",
+                        },
+                    }
+                    for client_id in client_ids
+                ),
+                {
+                    "op": "UPDATE",
+                    "client_id": client_ids[0],
+                    "version": 1,
+                    "changes": {"amount": "3.40"},
+                },
+                {"op": "DELETE", "client_id": client_ids[1]},
+            ],
+        },
+    )
+
+    measure(
+        "PATCH",
+        "/users/transaction",
+        headers=headers,
+        json={"title": "Coffee", "changes": {"category": "Drinks"}},
+    )
+    measure(
+        "POST",
+        "/users/transaction/delete",
+        headers=headers,
+        json={"ids": [row["id"] for row in transactions["transactions"][-5:]]},
+    )
+
+    export = {"transactions": transactions["transactions"][:50]}
+    measure("POST", "/users/transaction/export-csv", json=export)
+    measure("POST", "/users/transaction/export-pdf", json=export)
+
+    job = measure(
+        "POST",
+        "/users/transaction/export-jobs",
+        headers=headers,
+        json={"format": "csv"},
+    ).json()
+    while run_next_job(worker_id="statement-budget"):
+        pass
+    measure("GET", "/users/jobs", headers=headers)
+    measure("GET", "/users/jobs/{job_id}", {"job_id": job["id"]}, headers=headers)
+    measure(
+        "GET", "/users/jobs/{job_id}/download", {"job_id": job["id"]}, headers=headers
+    )
+    measure("GET", "/users/export", headers=headers)
+
+    measure(
+        "PUT",
+        "/users/budget",
+        headers=headers,
+        json={"category": "Food", "amount": 300},
+    )
+    measure("GET", "/users/budget", headers=headers)
+    measure(
+        "DELETE",
+        "/users/budget/{category_name}",
+        {"category_name": "Food"},
+        headers=headers,
+    )
+
+    rule = measure(
+        "POST",
+        "/users/recurring",
+        headers=headers,
+        json={
+            "type": "EXPENSE",
+            "title": "Rent",
+            "category": "Rent",
+            "amount": "900",
+            "frequency": "MONTHLY",
+            "start_date": "2026-01-01",
+        },
+    ).json()
+    measure("GET", "/users/recurring", headers=headers)
+    measure(
+        "DELETE",
+        "/users/recurring/{recurring_rule_id}",
+        {"recurring_rule_id": rule["id"]},
+        headers=headers,
+    )
+
+    measure(
+        "POST",
+        "/users",
+        json={"name": "Budget", "email": EMAIL.format("users"), "password": PASSWORD},
+    )
+
+    signup_token = client.post(
+        "/auth/login", data={"username": signup_email, "password": PASSWORD}
+    ).json()["access_token"]
+    measure("DELETE", "/users", headers={"Authorization": f"Bearer {signup_token}"})
+
+    users_token = client.post(
+        "/auth/login", data={"username": EMAIL.format("users"), "password": PASSWORD}
+    ).json()["access_token"]
+    deletion = measure(
+        "POST",
+        "/users/deletion",
+        headers={"Authorization": f"Bearer {users_token}"},
+    ).json()
+    while run_next_job(worker_id="statement-budget"):
+        pass
+    measure(
+        "GET",
+        "/users/deletion/{job_id}",
+        {"job_id": deletion["id"]},
+        headers={"Authorization": f"Bearer {users_token}"},
+    )
+
+
+def routes() -> list[str]:
+    """``METHOD path`` of every route the routers declare."""
+
+    return sorted(
+        f"{method} {route.path}"
+        for route in main.app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    )
+
+
+def compare(
+    route: str, measurement: Measurement | None, budget: dict | None
+) -> list[str]:
+    """Problems with ``route``; empty when it is within budget."""
+
+    if measurement is None:
+        return ["not exercised"]
+
+    problems = []
+
+    if measurement.status_code >= 400:
+        problems.append(f"returned {measurement.status_code}")
+
+    if budget is None:
+        return problems + ["no budget"]
+
+    actual = {
+        "statements": len(measurement.statements),
+        "rows": measurement.rows,
+        "commits": measurement.commits,
+    }
+
+    for key, value in actual.items():
+        if value > budget[key]:
+            problems.append(f"{key} {value} > {budget[key]}")
+
+    return problems
+
+
+def print_failure(
+    route: str,
+    problems: list[str],
+    measurement: Measurement | None,
+    budget: dict | None,
+) -> None:
+
+    print(f"FAIL {route}: {', '.join(problems)}")
+
+    if measurement is None:
+        return
+
+    diff = list(
+        difflib.unified_diff(
+            (budget or {}).get("queries", []),
+            measurement.statements,
+            fromfile="budget",
+            tofile="actual",
+            lineterm="",
+            n=1,
+        )
+    )
+
+    for line in diff[2:]:
+        print(f"    {line[:240]}")
+
+
+def run(users: int, transactions: int, only: str | None, record: bool) -> int:
+
+    with get_db() as db:
+        clean(db)
+        user_ids = seed(
+            db, users=users, transactions=transactions, rng=random.Random(7)
+        )
+        email = db.scalar(select(User.email).where(User.id == user_ids[0]))
+
+    # Without the lifespan, so the background workers stay off.
+    client = TestClient(main.app)
+    check = BudgetCheck(client, StatementRecorder(engine))
+    check.recorder.install()
+
+    try:
+        exercise(check, email)
+    finally:
+        check.recorder.uninstall()
+
+        with get_db() as db:
+            clean(db)
+
+    if record:
+        budgets = {
+            route: {
+                "statements": len(measurement.statements),
+                "rows": measurement.rows,
+                "commits": measurement.commits,
+                "queries": measurement.statements,
+            }
+            for route, measurement in sorted(check.measurements.items())
+        }
+        BUDGETS_PATH.write_text(json.dumps(budgets, indent=2) + "\n", encoding="utf-8")
+        print(f"recorded {len(budgets)} budgets in {BUDGETS_PATH.name}")
+        return 0
+
+    budgets = json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+    failures = 0
+
+    for route in routes():
+        if only and route != only:
+            continue
+
+        measurement = check.measurements.get(route)
+        budget = budgets.get(route)
+        problems = compare(route, measurement, budget)
+
+        if problems:
+            failures += 1
+            print_failure(route, problems, measurement, budget)
+        else:
+            print(
+                f"ok   {route}: {len(measurement.statements)} statements, "
+                f"{measurement.rows} rows, {measurement.commits} commits"
+            )
+
+    print(f"{failures} route(s) over budget")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=200)
+    parser.add_argument("--route", default=None, help='e.g. "GET /users"')
+    parser.add_argument(
+        "--record", action="store_true", help="Rewrite the budgets from this run"
+    )
+    args = parser.parse_args()
+
+    if run(
+        users=args.users,
+        transactions=args.transactions,
+        only=args.route,
+        record=args.record,
+    ):
+        sys.exit(1)
@@ -0,0 +1,138 @@
+import argparse
+from datetime import date
+
+from db import get_db
+from services.budget import reconcile_spend_counters
+from services.category_migration import migrate_shared_categories
+from services.fx_rate import load_fx_rates_csv
+from services.orphan import collect_orphans
+from services.partition import ensure_user_transaction_partitions
+from services.recurring_rule import materialize_due_occurrences
+
+
+def materialize_recurring(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        result = materialize_due_occurrences(
+            db=db, today=args.date, batch_size=args.batch_size
+        )
+    print(result.model_dump_json())
+
+
+def reconcile_budgets(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        result = reconcile_spend_counters(db=db, user_id=args.user_id)
+    print(result.model_dump_json())
+
+
+def load_fx_rates(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        loaded = load_fx_rates_csv(db=db, path=args.path)
+    print(f"Loaded {loaded} exchange rates")
+
+
+def collect_orphan_rows(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        result = collect_orphans(
+            db=db, batch_size=args.batch_size, max_batches=args.max_batches
+        )
+    print(result.model_dump_json())
+
+
+def migrate_categories(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        result = migrate_shared_categories(
+            db=db, batch_size=args.batch_size, max_batches=args.max_batches
+        )
+    print(result.model_dump_json())
+
+
+def create_partitions(args: argparse.Namespace) -> None:
+    with get_db() as db:
+        result = ensure_user_transaction_partitions(
+            db=db, months_ahead=args.months_ahead
+        )
+    print(result.model_dump_json())
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(description="Expensilo maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recurring = commands.add_parser(
+        "materialize-recurring",
+        help="Create user transactions for all due recurring rules",
+    )
+    recurring.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Materialize occurrences up to this date (default: today, UTC)",
+    )
+    recurring.add_argument("--batch-size", type=int, default=None)
+    recurring.set_defaults(handler=materialize_recurring)
+
+    budgets = commands.add_parser(
+        "reconcile-budgets",
+        help="Repair monthly spend counters from user transactions",
+    )
+    budgets.add_argument("--user-id", type=int, default=None)
+    budgets.set_defaults(handler=reconcile_budgets)
+
+    fx_rates = commands.add_parser(
+        "load-fx-rates",
+        help="Load exchange rates from a date,currency,rate CSV file",
+    )
+    fx_rates.add_argument("path")
+    fx_rates.set_defaults(handler=load_fx_rates)
+
+    orphans = commands.add_parser(
+        "collect-orphans",
+        help="Delete unreferenced transaction templates, categories and files",
+    )
+    orphans.add_argument("--batch-size", type=int, default=None)
+    orphans.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="Stop each sweep after this many delete batches",
+    )
+    orphans.set_defaults(handler=collect_orphan_rows)
+
+    categories = commands.add_parser(
+        "migrate-categories",
+        help="Give every user of a shared category a category of their own",
+    )
+    categories.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Users moved per transaction (default: settings)",
+    )
+    categories.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="Stop after this many batches; a later run resumes",
+    )
+    categories.set_defaults(handler=migrate_categories)
+
+    partitions = commands.add_parser(
+        "create-partitions",
+        help="Create monthly user transaction partitions ahead of time and for "
+        "months parked in the default partition",
+    )
+    partitions.add_argument(
+        "--months-ahead",
+        type=int,
+        default=None,
+        help="Months after the current one to create (default: settings)",
+    )
+    partitions.set_defaults(handler=create_partitions)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.handler(args)
@@ -1,3 +1,4 @@
 from .config import settings
+from .cache import LRUCache, TTLCache
 
-__all__ = ["settings"]
+__all__ = ["settings", "LRUCache", "TTLCache"]
@@ -1,4 +1,6 @@
 # settings.py
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,5 +14,83 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     DATABASE_URL: str
 
+    SUGGESTION_CACHE_SIZE: int = 1024
+
+    CATEGORIZER_CACHE_SIZE: int = 1024
+    CATEGORY_PREDICTION_MIN_CONFIDENCE: float = 0.6
+
+    PREFERENCES_CACHE_SIZE: int = 4096
+    PREFERENCES_CACHE_TTL_SECONDS: int = 300
+
+    RECURRING_WORKER_ENABLED: bool = False
+    RECURRING_INTERVAL_SECONDS: int = 3600
+    RECURRING_BATCH_SIZE: int = 500
+
+    BUDGET_RECONCILE_ENABLED: bool = False
+    BUDGET_RECONCILE_INTERVAL_SECONDS: int = 86400
+
+    DEFAULT_CURRENCY: str = "USD"
+    FX_REFERENCE_CURRENCY: str = "USD"
+    FX_CACHE_TTL_SECONDS: int = 3600
+
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
+    STORAGE_LOCAL_ROOT: str = "storage_data"
+    STORAGE_CHUNK_SIZE: int = 64 * 1024
+    S3_BUCKET: str = "expensilo-attachments"
+    S3_PREFIX: str = "attachments/"
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+
+    ATTACHMENT_MAX_BYTES: int = 10 * 1024 * 1024
+    ATTACHMENT_QUOTA_BYTES: int = 100 * 1024 * 1024
+
+    TAKEOUT_FETCH_SIZE: int = 1000
+    TAKEOUT_QUEUE_CHUNKS: int = 16
+    TAKEOUT_CLIENT_TIMEOUT_SECONDS: float = 60.0
+    # How often a build moves its job lease forward; well under JOB_LEASE_SECONDS.
+    TAKEOUT_LEASE_RENEW_SECONDS: float = 60.0
+
+    THUMBNAIL_ENABLED: bool = True
+    THUMBNAIL_SIZES: list[int] = [128, 512]
+    THUMBNAIL_QUALITY: int = 80
+    THUMBNAIL_WORKERS: int = 2
+
+    JOB_WORKER_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE_SECONDS: float = 5.0
+    JOB_BACKOFF_MAX_SECONDS: float = 600.0
+    JOB_LEASE_SECONDS: int = 900
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+    JOB_RETENTION_DAYS: int = 7
+    JOB_PRUNE_INTERVAL_SECONDS: int = 3600
+
+    ORPHAN_GC_ENABLED: bool = True
+    ORPHAN_GC_INTERVAL_SECONDS: int = 3600
+    ORPHAN_GC_BATCH_SIZE: int = 1000
+    ORPHAN_BLOB_GRACE_SECONDS: int = 3600
+
+    CATEGORY_MIGRATION_BATCH_SIZE: int = 200
+
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PENDING_TIMEOUT_SECONDS: int = 60
+    IDEMPOTENCY_PURGE_ENABLED: bool = True
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 3600
+
+    SYNC_MAX_OPERATIONS: int = 500
+    SYNC_CHANGES_LIMIT: int = 1000
+
+    TRANSACTION_BATCH_MAX_IDS: int = 1000
+
+    QUERY_ADVISOR_ENABLED: bool = False
+    QUERY_ADVISOR_MIN_ROWS: int = 10000
+
 
 settings = Settings()
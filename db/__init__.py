@@ -1,3 +1,15 @@
 from .db_setup import init_db, drop_db, get_db, get_db_session, add_commit_refresh
+from .query_advisor import QueryPlanAdvisor, SeqScanFinding
+from .statement_recorder import StatementRecorder, RecordedStatement
 
-__all__ = ["init_db", "drop_db", "get_db", "get_db_session", "add_commit_refresh"]
+__all__ = [
+    "init_db",
+    "drop_db",
+    "get_db",
+    "get_db_session",
+    "add_commit_refresh",
+    "QueryPlanAdvisor",
+    "SeqScanFinding",
+    "StatementRecorder",
+    "RecordedStatement",
+]
@@ -6,6 +6,7 @@ from sqlalchemy.orm import sessionmaker, Session
 
 from core import settings
 from models import Base
+from .query_advisor import QueryPlanAdvisor
 
 
 engine = create_engine(
@@ -16,6 +17,12 @@ engine = create_engine(
     max_overflow=10,
 )
 
+query_advisor: QueryPlanAdvisor | None = None
+
+if settings.QUERY_ADVISOR_ENABLED:
+    query_advisor = QueryPlanAdvisor(engine, settings.QUERY_ADVISOR_MIN_ROWS)
+    query_advisor.install()
+
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,132 @@
+import logging
+from threading import Lock
+from typing import Iterator, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+SEQ_SCANS = ("Seq Scan", "Parallel Seq Scan")
+
+
+class SeqScanFinding(NamedTuple):
+    relation: str
+    rows: int
+    statement: str
+
+
+class QueryPlanAdvisor:
+    """Explains every statement run on ``engine`` and records sequential scans
+    of relations with at least ``min_rows`` rows (per ``pg_class.reltuples``).
+
+    Meant for test and benchmark runs: each statement is planned twice.
+    """
+
+    def __init__(self, engine: Engine, min_rows: int):
+        self.engine = engine
+        self.min_rows = min_rows
+        self._findings: dict[tuple[str, str], SeqScanFinding] = {}
+        self._relation_rows: dict[str, int] = {}
+        self._lock = Lock()
+
+    def install(self) -> None:
+        event.listen(self.engine, "before_cursor_execute", self._before_execute)
+
+    def uninstall(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_execute)
+
+    def findings(self) -> list[SeqScanFinding]:
+        with self._lock:
+            return sorted(self._findings.values(), key=lambda finding: -finding.rows)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._findings.clear()
+            self._relation_rows.clear()
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+
+        if executemany or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+
+        dbapi_connection = cursor.connection
+
+        try:
+            plan = self._explain(dbapi_connection, statement, parameters)
+        except Exception:
+            logger.debug("Could not explain statement: %s", statement, exc_info=True)
+            return
+
+        for relation in set(_seq_scanned_relations(plan)):
+            rows = self._rows(dbapi_connection, relation)
+
+            if rows < self.min_rows:
+                continue
+
+            key = (relation, statement)
+
+            with self._lock:
+                if key in self._findings:
+                    continue
+                self._findings[key] = SeqScanFinding(relation, rows, statement)
+
+            logger.warning(
+                "Sequential scan on %s (~%d rows): %s",
+                relation,
+                rows,
+                " ".join(statement.split()),
+            )
+
+    def _explain(self, dbapi_connection, statement: str, parameters) -> dict:
+
+        # A failed EXPLAIN must not abort the caller's transaction.
+        savepoint = not dbapi_connection.autocommit
+
+        with dbapi_connection.cursor() as cursor:
+            if savepoint:
+                cursor.execute("SAVEPOINT query_advisor")
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0][0]["Plan"]
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_advisor")
+                raise
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_advisor")
+
+        return plan
+
+    def _rows(self, dbapi_connection, relation: str) -> int:
+
+        with self._lock:
+            if relation in self._relation_rows:
+                return self._relation_rows[relation]
+
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT greatest(reltuples, 0)::bigint FROM pg_class "
+                "WHERE relname = %(relation)s",
+                {"relation": relation},
+            )
+            row = cursor.fetchone()
+
+        rows = row[0] if row else 0
+
+        with self._lock:
+            self._relation_rows[relation] = rows
+
+        return rows
+
+
+def _seq_scanned_relations(node: dict) -> Iterator[str]:
+
+    if node.get("Node Type") in SEQ_SCANS:
+        yield node["Relation Name"]
+
+    for child in node.get("Plans", []):
+        yield from _seq_scanned_relations(child)
@@ -0,0 +1,77 @@
+from collections import Counter
+from threading import Lock
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RecordedStatement(NamedTuple):
+    statement: str
+    rows: int
+
+
+class StatementRecorder:
+    """Records every statement run on ``engine``, the rows it returned and
+    the commits issued, until reset.
+
+    Meant for test and benchmark runs that check how many queries a code path
+    makes; statements from concurrent sessions are recorded together.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._statements: list[RecordedStatement] = []
+        self._commits = 0
+        self._lock = Lock()
+
+    def install(self) -> None:
+        event.listen(self.engine, "after_cursor_execute", self._after_execute)
+        event.listen(self.engine, "commit", self._commit)
+
+    def uninstall(self) -> None:
+        event.remove(self.engine, "after_cursor_execute", self._after_execute)
+        event.remove(self.engine, "commit", self._commit)
+
+    def statements(self) -> list[RecordedStatement]:
+        with self._lock:
+            return list(self._statements)
+
+    def rows(self) -> int:
+        with self._lock:
+            return sum(statement.rows for statement in self._statements)
+
+    def commits(self) -> int:
+        with self._lock:
+            return self._commits
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Statements run more than once, most frequent first."""
+
+        with self._lock:
+            counts = Counter(statement.statement for statement in self._statements)
+
+        return [
+            (statement, count) for statement, count in counts.most_common() if count > 1
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._commits = 0
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+
+        # rowcount is the number of rows returned for statements with a result.
+        rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+
+        with self._lock:
+            self._statements.append(
+                RecordedStatement(" ".join(statement.split()), rows)
+            )
+
+    def _commit(self, conn) -> None:
+        with self._lock:
+            self._commits += 1
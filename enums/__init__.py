@@ -1,3 +1,12 @@
 from .transaction_type import TransactionType
+from .recurrence_frequency import RecurrenceFrequency
+from .job_status import JobStatus
+from .sync_status import SyncOperationType, SyncStatus
 
-__all__ = ["TransactionType"]
+__all__ = [
+    "TransactionType",
+    "RecurrenceFrequency",
+    "JobStatus",
+    "SyncOperationType",
+    "SyncStatus",
+]
@@ -0,0 +1,8 @@
+import enum
+
+
+class RecurrenceFrequency(enum.Enum):
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
@@ -0,0 +1,14 @@
+import enum
+
+
+class SyncOperationType(enum.Enum):
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+
+class SyncStatus(enum.Enum):
+    APPLIED = "APPLIED"
+    CONFLICT = "CONFLICT"
+    NOT_FOUND = "NOT_FOUND"
+    REJECTED = "REJECTED"
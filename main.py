@@ -1,12 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from sqlalchemy.exc import IntegrityError
 
-from routers import user, category, user_category, transaction, user_transaction, auth
+from routers import (
+    user,
+    category,
+    user_category,
+    transaction,
+    user_transaction,
+    recurring_rule,
+    budget,
+    attachment,
+    job,
+    sync,
+    auth,
+)
+from workers import start_workers, stop_workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    workers = start_workers()
+    yield
+    stop_workers(workers)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 @app.exception_handler(IntegrityError)
@@ -32,3 +55,8 @@ app.include_router(category.router)
 app.include_router(user_category.router)
 app.include_router(transaction.router)
 app.include_router(user_transaction.router)
+app.include_router(recurring_rule.router)
+app.include_router(budget.router)
+app.include_router(attachment.router)
+app.include_router(job.router)
+app.include_router(sync.router)
@@ -4,6 +4,15 @@ from .category import Category
 from .user_category import UserCategory
 from .transaction import Transaction
 from .user_transaction import UserTransaction
+from .user_transaction_tombstone import UserTransactionTombstone
+from .recurring_rule import RecurringRule
+from .budget import Budget
+from .spend_counter import SpendCounter
+from .fx_rate import FxRate
+from .blob import Blob
+from .attachment import Attachment
+from .job import Job
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
     "Base",
@@ -12,4 +21,13 @@ __all__ = [
     "UserCategory",
     "Transaction",
     "UserTransaction",
+    "UserTransactionTombstone",
+    "RecurringRule",
+    "Budget",
+    "SpendCounter",
+    "FxRate",
+    "Blob",
+    "Attachment",
+    "Job",
+    "IdempotencyKey",
 ]
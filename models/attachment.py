@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, String, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+
+class Attachment(Base):
+    __tablename__ = "attachment"
+
+    __table_args__ = (
+        Index("ix_attachment_user_transaction_id", "user_transaction_id"),
+        Index("ix_attachment_user_id", "user_id", postgresql_include=["size"]),
+        Index("ix_attachment_sha256", "sha256"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier for attachment",
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to owning user",
+    )
+
+    # No foreign key: user_transaction is partitioned by created_at, so its
+    # id alone is not a referenceable key. Orphans are removed by the sweep.
+    user_transaction_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Reference to user transaction",
+    )
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("blob.sha256"),
+        nullable=False,
+        comment="Content address of the stored file",
+    )
+
+    filename: Mapped[str] = mapped_column(
+        String(255), nullable=False, comment="Original file name"
+    )
+
+    content_type: Mapped[str] = mapped_column(
+        String(255), nullable=False, comment="MIME type supplied on upload"
+    )
+
+    size: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, comment="File size in bytes"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Upload timestamp",
+    )
+
+    blob = relationship("Blob", lazy="joined")
+
+    def __repr__(self) -> str:
+        return (
+            f"<Attachment(id={self.id}, user_transaction_id={self.user_transaction_id}, "
+            f"filename={self.filename})>"
+        )
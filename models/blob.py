@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Integer, String, DateTime, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class Blob(Base):
+    __tablename__ = "blob"
+
+    sha256: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="SHA-256 hex digest of the content"
+    )
+
+    size: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, comment="Content size in bytes"
+    )
+
+    thumbnail_sizes: Mapped[Optional[list[int]]] = mapped_column(
+        ARRAY(Integer),
+        nullable=True,
+        comment="Generated thumbnail sizes, null while pending",
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Blob creation timestamp",
+    )
+
+    def __repr__(self) -> str:
+        return f"<Blob(sha256={self.sha256}, size={self.size})>"
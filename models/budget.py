@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    Numeric,
+    DateTime,
+    UniqueConstraint,
+    CheckConstraint,
+    Index,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+
+class Budget(Base):
+    __tablename__ = "budget"
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", name="uq_budget_user_category"),
+        CheckConstraint("amount > 0", name="ck_budget_amount_positive"),
+        Index("ix_budget_category_id", "category_id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier for budget",
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to user",
+    )
+
+    category_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("category.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to category",
+    )
+
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(precision=15, scale=2),
+        nullable=False,
+        comment="Monthly spending limit",
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Budget creation timestamp",
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+        comment="Update timestamp",
+    )
+
+    category = relationship("Category", lazy="joined")
+
+    def __repr__(self) -> str:
+        return (
+            f"<Budget(user_id={self.user_id}, category_id={self.category_id}, "
+            f"amount={self.amount})>"
+        )
@@ -1,5 +1,7 @@
-from sqlalchemy import String, BigInteger
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Optional
+
+from sqlalchemy import String, BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
@@ -7,6 +9,10 @@ from .base import Base
 class Category(Base):
     __tablename__ = "category"
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_category_user_name"),
+    )
+
     id: Mapped[int] = mapped_column(
         BigInteger,
         primary_key=True,
@@ -14,23 +20,19 @@ class Category(Base):
         comment="Unique identifier for category",
     )
 
+    user_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=True,
+        comment="Owner of the category; NULL for categories still shared from "
+        "before names were per user",
+    )
+
     name: Mapped[str] = mapped_column(
         String,
-        unique=True,
         nullable=False,
-        comment="Category name",
-    )
-
-    users = relationship(
-        "UserCategory",
-        back_populates="category",
-        cascade="all, delete-orphan",
-        lazy="selectin",
-    )
-
-    transactions = relationship(
-        "Transaction", back_populates="category", lazy="selectin"
+        comment="Category name, unique per user",
     )
 
     def __repr__(self) -> str:
-        return f"<Category(id={self.id}, name='{self.name}')>"
+        return f"<Category(id={self.id}, user_id={self.user_id}, name='{self.name}')>"
@@ -0,0 +1,33 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import String, Numeric, Date, CheckConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rate"
+
+    __table_args__ = (CheckConstraint("rate > 0", name="ck_fx_rate_positive"),)
+
+    currency: Mapped[str] = mapped_column(
+        String(3), primary_key=True, comment="ISO 4217 currency code"
+    )
+
+    rate_date: Mapped[date] = mapped_column(
+        Date, primary_key=True, comment="Date the rate is effective from"
+    )
+
+    rate: Mapped[Decimal] = mapped_column(
+        Numeric(precision=20, scale=10),
+        nullable=False,
+        comment="Value of one unit of the currency in the reference currency",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<FxRate(currency='{self.currency}', rate_date={self.rate_date}, "
+            f"rate={self.rate})>"
+        )
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, ForeignKey, String, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_key"
+
+    __table_args__ = (Index("ix_idempotency_key_expires_at", "expires_at"),)
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="User that sent the request",
+    )
+
+    key: Mapped[str] = mapped_column(
+        String(255), primary_key=True, comment="Idempotency-Key header value"
+    )
+
+    request_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="SHA-256 of the endpoint and request body"
+    )
+
+    response: Mapped[Optional[dict]] = mapped_column(
+        JSONB, nullable=True, comment="Stored response, null while in progress"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Time the key was first used",
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Time after which the key can be reused",
+    )
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(user_id={self.user_id}, key={self.key})>"
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    String,
+    Text,
+    Integer,
+    DateTime,
+    Enum,
+    Index,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from enums import JobStatus
+from .base import Base
+
+
+class Job(Base):
+    __tablename__ = "job"
+
+    __table_args__ = (
+        # Partial indexes stay small as finished jobs pile up until pruned.
+        Index(
+            "ix_job_active_run_after",
+            "run_after",
+            "id",
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+        Index(
+            "ix_job_finished_at",
+            "finished_at",
+            postgresql_where=text("status IN ('SUCCEEDED', 'FAILED')"),
+        ),
+        Index("ix_job_user_id_id", "user_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier for job",
+    )
+
+    user_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=True,
+        comment="User the job runs for, null for maintenance jobs",
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="Name of the registered job handler"
+    )
+
+    payload: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, server_default="{}", comment="Handler arguments"
+    )
+
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status_enum"),
+        nullable=False,
+        server_default=JobStatus.QUEUED.value,
+        comment="Job status: QUEUED, RUNNING, SUCCEEDED or FAILED",
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0", comment="Number of runs started"
+    )
+
+    max_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Runs allowed before the job fails"
+    )
+
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Earliest time the job may be claimed",
+    )
+
+    locked_by: Mapped[Optional[str]] = mapped_column(
+        String(128), nullable=True, comment="Worker running the job"
+    )
+
+    locked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Time the job was claimed"
+    )
+
+    result: Mapped[Optional[dict]] = mapped_column(
+        JSONB, nullable=True, comment="Handler result"
+    )
+
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, comment="Error of the last failed run"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Job creation timestamp",
+    )
+
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Completion timestamp"
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -0,0 +1,125 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    String,
+    Numeric,
+    Integer,
+    Date,
+    DateTime,
+    Enum,
+    CheckConstraint,
+    Index,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from enums import RecurrenceFrequency
+from .base import Base
+
+
+class RecurringRule(Base):
+    __tablename__ = "recurring_rule"
+
+    __table_args__ = (
+        CheckConstraint('"interval" >= 1', name="ck_recurring_rule_interval"),
+        CheckConstraint(
+            "day_of_month BETWEEN 1 AND 31", name="ck_recurring_rule_day_of_month"
+        ),
+        Index("ix_recurring_rule_next_run_on", "next_run_on"),
+        Index("ix_recurring_rule_user_id", "user_id"),
+        Index("ix_recurring_rule_transaction_id", "transaction_id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier for recurring rule",
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to user",
+    )
+
+    transaction_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("transaction.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to transaction template",
+    )
+
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(precision=15, scale=2),
+        nullable=False,
+        comment="Amount of each occurrence",
+    )
+
+    currency: Mapped[str] = mapped_column(
+        String(3),
+        nullable=False,
+        server_default="USD",
+        comment="ISO 4217 currency code of the amount",
+    )
+
+    details: Mapped[Optional[str]] = mapped_column(
+        String, nullable=True, comment="Details copied to each occurrence"
+    )
+
+    frequency: Mapped[RecurrenceFrequency] = mapped_column(
+        Enum(RecurrenceFrequency, name="recurrence_frequency_enum"),
+        nullable=False,
+        comment="Recurrence frequency: DAILY, WEEKLY, MONTHLY or YEARLY",
+    )
+
+    interval: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        comment="Number of frequency units between occurrences",
+    )
+
+    day_of_month: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Day of month for MONTHLY and YEARLY rules, clamped to month end",
+    )
+
+    start_date: Mapped[date] = mapped_column(
+        Date, nullable=False, comment="Date of the first occurrence"
+    )
+
+    end_date: Mapped[Optional[date]] = mapped_column(
+        Date, nullable=True, comment="Last date an occurrence may fall on"
+    )
+
+    next_run_on: Mapped[Optional[date]] = mapped_column(
+        Date,
+        nullable=True,
+        comment="Date of the next occurrence to materialize (NULL when finished)",
+    )
+
+    last_run_on: Mapped[Optional[date]] = mapped_column(
+        Date, nullable=True, comment="Date of the last materialized occurrence"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Rule creation timestamp",
+    )
+
+    transaction = relationship("Transaction", lazy="joined")
+
+    def __repr__(self) -> str:
+        return (
+            f"<RecurringRule(id={self.id}, user_id={self.user_id}, "
+            f"frequency={self.frequency}, next_run_on={self.next_run_on})>"
+        )
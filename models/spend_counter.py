@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, ForeignKey, Numeric, Date, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SpendCounter(Base):
+    __tablename__ = "spend_counter"
+
+    __table_args__ = (Index("ix_spend_counter_category_id", "category_id"),)
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Reference to user",
+    )
+
+    category_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("category.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Reference to category",
+    )
+
+    month: Mapped[date] = mapped_column(
+        Date, primary_key=True, comment="First day of the month (UTC)"
+    )
+
+    spent: Mapped[Decimal] = mapped_column(
+        Numeric(precision=15, scale=2),
+        nullable=False,
+        default=Decimal("0"),
+        comment="Sum of EXPENSE amounts in the month",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SpendCounter(user_id={self.user_id}, category_id={self.category_id}, "
+            f"month={self.month}, spent={self.spent})>"
+        )
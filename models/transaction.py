@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import String, BigInteger, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import String, BigInteger, ForeignKey, Enum, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from enums import TransactionType
@@ -12,6 +12,7 @@ class Transaction(Base):
 
     __table_args__ = (
         UniqueConstraint("type", "title", "category_id", name="uq_type_title_category"),
+        Index("ix_transaction_category_id", "category_id"),
     )
 
     id: Mapped[int] = mapped_column(
@@ -39,7 +40,7 @@ class Transaction(Base):
         String, nullable=False, comment="Transaction title"
     )
 
-    category = relationship("Category", back_populates="transactions", lazy="joined")
+    category = relationship("Category", lazy="joined")
 
     users = relationship(
         "UserTransaction",
@@ -44,6 +44,7 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan",
         lazy="selectin",
+        passive_deletes=True,
     )
 
     transactions = relationship(
@@ -51,6 +52,7 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan",
         lazy="selectin",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
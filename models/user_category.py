@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, ForeignKey
+from typing import Optional
+
+from sqlalchemy import BigInteger, ForeignKey, ForeignKeyConstraint, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -7,6 +9,22 @@ from .base import Base
 class UserCategory(Base):
     __tablename__ = "user_category"
 
+    __table_args__ = (
+        Index("ix_user_category_category_id", "category_id"),
+        # Subtrees are found by a left-anchored LIKE on the path.
+        Index(
+            "ix_user_category_user_id_path",
+            "user_id",
+            "path",
+            postgresql_ops={"path": "text_pattern_ops"},
+        ),
+        ForeignKeyConstraint(
+            ["user_id", "parent_category_id"],
+            ["user_category.user_id", "user_category.category_id"],
+            name="user_category_user_id_parent_category_id_fkey",
+        ),
+    )
+
     user_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("user.id", ondelete="CASCADE"),
@@ -23,9 +41,22 @@ class UserCategory(Base):
         comment="Reference to category",
     )
 
+    parent_category_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="Parent category in the user's tree, null at the top level",
+    )
+
+    path: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        server_default="/",
+        comment="Ids of the ancestor categories from the top, as /1/5/",
+    )
+
     user = relationship("User", back_populates="categories", lazy="joined")
 
-    category = relationship("Category", back_populates="users", lazy="joined")
+    category = relationship("Category", lazy="joined")
 
     def __repr__(self) -> str:
         return f"<UserCategory(user_id={self.user_id}, category_id={self.category_id})>"
@@ -1,17 +1,60 @@
+import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import BigInteger, ForeignKey, String, Numeric, DateTime, func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    Integer,
+    String,
+    Numeric,
+    DateTime,
+    Index,
+    Sequence,
+    func,
+    text,
+    event,
+    DDL,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 
+# Orders writes and deletions of user transactions for services.sync.
+SYNC_SEQUENCE = Sequence("user_transaction_sync_seq")
+
 
 class UserTransaction(Base):
     __tablename__ = "user_transaction"
 
+    __table_args__ = (
+        Index(
+            "uq_user_transaction_recurring_occurrence",
+            "recurring_rule_id",
+            "created_at",
+            unique=True,
+            postgresql_where=text("recurring_rule_id IS NOT NULL"),
+        ),
+        Index("ix_user_transaction_transaction_id", "transaction_id"),
+        # Covers the per-user summary, suggestion and budget reads.
+        Index(
+            "ix_user_transaction_user_id_created_at_covering",
+            "user_id",
+            "created_at",
+            postgresql_include=["transaction_id", "amount", "currency"],
+        ),
+        Index("ix_user_transaction_user_id_sync_seq", "user_id", "sync_seq"),
+        Index(
+            "ix_user_transaction_user_id_client_id",
+            "user_id",
+            "client_id",
+            postgresql_where=text("client_id IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     id: Mapped[int] = mapped_column(
         BigInteger,
         primary_key=True,
@@ -39,6 +82,13 @@ class UserTransaction(Base):
         comment="Transaction amount",
     )
 
+    currency: Mapped[str] = mapped_column(
+        String(3),
+        nullable=False,
+        server_default="USD",
+        comment="ISO 4217 currency code of the amount",
+    )
+
     details: Mapped[Optional[str]] = mapped_column(
         String, nullable=True, comment="Additional transaction details"
     )
@@ -49,9 +99,18 @@ class UserTransaction(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.current_timestamp(),
-        comment="Transaction timestamp",
+        comment="Transaction timestamp, also the monthly partition key",
+    )
+
+    recurring_rule_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("recurring_rule.id", ondelete="SET NULL"),
+        nullable=True,
+        default=None,
+        comment="Reference to the recurring rule that materialized this row",
     )
 
     updated_at: Mapped[datetime] = mapped_column(
@@ -62,13 +121,51 @@ class UserTransaction(Base):
         comment="Update timestamp",
     )
 
+    client_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="Identifier generated by the client that created the row offline",
+    )
+
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="1",
+        comment="Incremented on every update",
+    )
+
+    sync_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        SYNC_SEQUENCE,
+        nullable=False,
+        server_default=SYNC_SEQUENCE.next_value(),
+        onupdate=SYNC_SEQUENCE.next_value(),
+        comment="Position of the last write in the sync change feed",
+    )
+
     user = relationship("User", back_populates="transactions", lazy="joined")
 
     transaction = relationship("Transaction", back_populates="users", lazy="joined")
 
+    # UPDATE and DELETE match the loaded version and bump it; a row changed
+    # since it was read raises StaleDataError.
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:
         return (
             f"<UserTransaction(user_id={self.user_id}, "
             f"transaction_id={self.transaction_id}, "
             f"amount={self.amount})>"
         )
+
+
+# Monthly partitions are created by services.partition; the default partition
+# catches rows outside them so inserts never fail for a missing month.
+event.listen(
+    UserTransaction.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS user_transaction_default "
+        "PARTITION OF user_transaction DEFAULT"
+    ),
+)
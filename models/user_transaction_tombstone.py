@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, ForeignKey, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .user_transaction import SYNC_SEQUENCE
+
+
+class UserTransactionTombstone(Base):
+    __tablename__ = "user_transaction_tombstone"
+
+    __table_args__ = (
+        Index("ix_user_transaction_tombstone_user_id_sync_seq", "user_id", "sync_seq"),
+        Index(
+            "ix_user_transaction_tombstone_user_id_client_id", "user_id", "client_id"
+        ),
+    )
+
+    user_transaction_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, comment="Id of the deleted user transaction"
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Reference to user",
+    )
+
+    client_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="Client identifier of the deleted user transaction",
+    )
+
+    sync_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        SYNC_SEQUENCE,
+        nullable=False,
+        server_default=SYNC_SEQUENCE.next_value(),
+        comment="Position of the deletion in the sync change feed",
+    )
+
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment="Deletion timestamp",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserTransactionTombstone(user_id={self.user_id}, "
+            f"user_transaction_id={self.user_transaction_id})>"
+        )
@@ -0,0 +1,192 @@
+from typing import Annotated, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, status, Path, Header, Depends, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from db import get_db_session
+from schemas.attachment import AttachmentResponse, AttachmentsResponse, AttachmentUsage
+from services.attachment import (
+    add_attachment,
+    read_attachments,
+    read_attachment_usage,
+    get_user_attachment,
+    get_user_thumbnail_key,
+    delete_attachment,
+    parse_range,
+)
+from storage import get_storage
+from auth import get_current_user_id
+
+router = APIRouter(prefix="/users", tags=["Users Attachment"])
+
+
+@router.get(
+    "/transaction/{user_transaction_id}/attachments",
+    response_model=AttachmentsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="List attachments of a user transaction",
+)
+def get_attachments_endpoint(
+    user_transaction_id: Annotated[
+        int,
+        Path(
+            ..., title="Transaction ID", description="Unique ID of the user transaction"
+        ),
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> AttachmentsResponse:
+
+    attachments: AttachmentsResponse = read_attachments(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
+
+    return attachments
+
+
+@router.post(
+    "/transaction/{user_transaction_id}/attachments",
+    response_model=AttachmentResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload an attachment to a user transaction",
+    responses={413: {"description": "File too large or storage quota exceeded"}},
+)
+def add_attachment_endpoint(
+    user_transaction_id: Annotated[
+        int,
+        Path(
+            ..., title="Transaction ID", description="Unique ID of the user transaction"
+        ),
+    ],
+    file: Annotated[UploadFile, File(..., description="File to attach")],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> AttachmentResponse:
+
+    attachment: AttachmentResponse = add_attachment(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id, upload=file
+    )
+
+    return attachment
+
+
+@router.get(
+    "/attachments/usage",
+    response_model=AttachmentUsage,
+    status_code=status.HTTP_200_OK,
+    summary="Get attachment storage usage",
+)
+def get_attachment_usage_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> AttachmentUsage:
+
+    usage: AttachmentUsage = read_attachment_usage(db=db, user_id=user_id)
+
+    return usage
+
+
+@router.get(
+    "/attachments/{attachment_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"content": {"application/octet-stream": {}}},
+        206: {"description": "Partial content for Range requests"},
+        416: {"description": "Requested range not satisfiable"},
+    },
+    summary="Download an attachment",
+)
+def download_attachment_endpoint(
+    attachment_id: Annotated[
+        int,
+        Path(..., title="Attachment ID", description="Unique ID of the attachment"),
+    ],
+    range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> StreamingResponse:
+
+    attachment = get_user_attachment(
+        db=db, user_id=user_id, attachment_id=attachment_id
+    )
+
+    size = attachment.size
+    byte_range = parse_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(attachment.filename)}",
+        "ETag": f'"{attachment.sha256}"',
+    }
+
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    body = get_storage().iter_range(attachment.sha256, start, end) if size else iter(())
+
+    return StreamingResponse(
+        body,
+        status_code=(
+            status.HTTP_206_PARTIAL_CONTENT
+            if byte_range is not None
+            else status.HTTP_200_OK
+        ),
+        media_type=attachment.content_type,
+        headers=headers,
+    )
+
+
+@router.get(
+    "/attachments/{attachment_id}/thumbnails/{size}",
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {"image/jpeg": {}}}},
+    summary="Download an attachment thumbnail",
+)
+def download_thumbnail_endpoint(
+    attachment_id: Annotated[
+        int,
+        Path(..., title="Attachment ID", description="Unique ID of the attachment"),
+    ],
+    size: Annotated[
+        int,
+        Path(..., title="Size", description="Thumbnail bounding box in pixels"),
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> StreamingResponse:
+
+    key = get_user_thumbnail_key(
+        db=db, user_id=user_id, attachment_id=attachment_id, size=size
+    )
+
+    return StreamingResponse(
+        get_storage().iter_range(key, 0, 2**63 - 1),
+        media_type="image/jpeg",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
+@router.delete(
+    "/attachments/{attachment_id}",
+    response_model=AttachmentResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Delete an attachment",
+)
+def delete_attachment_endpoint(
+    attachment_id: Annotated[
+        int,
+        Path(..., title="Attachment ID", description="Unique ID of the attachment"),
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> AttachmentResponse:
+
+    deleted_attachment: AttachmentResponse = delete_attachment(
+        db=db, user_id=user_id, attachment_id=attachment_id
+    )
+
+    return deleted_attachment
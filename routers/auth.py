@@ -46,7 +46,9 @@ async def login_for_access_token(
             detail=user,
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
+    access_token = create_access_token(
+        data={"sub": form_data.username, "user_id": user.id}
+    )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -0,0 +1,64 @@
+from typing import Annotated
+
+from fastapi import APIRouter, status, Path, Depends
+from sqlalchemy.orm import Session
+
+from db import get_db_session
+from schemas.budget import BudgetRequest, BudgetStatus, BudgetsResponse
+from services.budget import read_budgets, set_budget, delete_budget
+from auth import get_current_user_id
+
+router = APIRouter(prefix="/users/budget", tags=["Users Budget"])
+
+
+@router.get(
+    "",
+    response_model=BudgetsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get user budgets",
+    response_description="Budgets of a user with their current month status",
+)
+def get_budgets_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> BudgetsResponse:
+
+    budgets: BudgetsResponse = read_budgets(db=db, user_id=user_id)
+
+    return budgets
+
+
+@router.put(
+    "",
+    response_model=BudgetStatus,
+    status_code=status.HTTP_200_OK,
+    summary="Create or update a category budget",
+    response_description="The budget with its current month status",
+)
+def set_budget_endpoint(
+    budget_request: BudgetRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> BudgetStatus:
+
+    budget: BudgetStatus = set_budget(
+        db=db, user_id=user_id, budget_request=budget_request
+    )
+
+    return budget
+
+
+@router.delete(
+    "/{category_name}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a category budget",
+)
+def delete_budget_endpoint(
+    category_name: Annotated[
+        str, Path(..., title="Category Name", description="Name of the Category")
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> None:
+
+    delete_budget(db=db, user_id=user_id, category_name=category_name)
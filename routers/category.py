@@ -1,11 +1,9 @@
-from typing import Annotated
-
-from fastapi import APIRouter, status, Depends, Path
+from fastapi import APIRouter, status, Depends
 
+from auth import get_current_user_id
 from db import get_db_session
 from schemas.category import CategoriesResponse
-from services.category import read_categories, read_category_users
-
+from services.user_category import read_user_categories
 
 router = APIRouter(prefix="/category", tags=["Category"])
 
@@ -15,25 +13,10 @@ router = APIRouter(prefix="/category", tags=["Category"])
     response_model=CategoriesResponse,
     status_code=status.HTTP_200_OK,
     summary="Get all categories",
-    response_description="The list of all categories",
+    response_description="The list of the current user's categories",
 )
-def get_categories_endpoint(db=Depends(get_db_session)) -> CategoriesResponse:
-    categories: CategoriesResponse = read_categories(db=db)
+def get_categories_endpoint(
+    user_id: int = Depends(get_current_user_id), db=Depends(get_db_session)
+) -> CategoriesResponse:
+    categories: CategoriesResponse = read_user_categories(db=db, user_id=user_id)
     return categories
-
-
-@router.get(
-    "/{category_name}/users",
-    response_model=list[int],
-    status_code=status.HTTP_200_OK,
-    summary="Get all users of a category",
-    response_description="The list of IDs of all users having this category",
-)
-def get_category_users_endpoint(
-    category_name: Annotated[
-        str, Path(..., title="Category Name", description="Name of the Category")
-    ],
-    db=Depends(get_db_session),
-):
-    category_users: list[int] = read_category_users(db=db, category_name=category_name)
-    return category_users
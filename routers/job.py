@@ -0,0 +1,84 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, status, Path, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from db import get_db_session
+from enums import JobStatus
+from schemas.job import JobResponse, JobsResponse
+from services.job import read_job, read_jobs, get_user_job
+from storage import get_storage
+from auth import get_current_user_id
+
+router = APIRouter(prefix="/users/jobs", tags=["Users Jobs"])
+
+
+@router.get(
+    "",
+    response_model=JobsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get user jobs",
+    response_description="Most recent background jobs of a user",
+)
+def get_jobs_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> JobsResponse:
+
+    jobs: JobsResponse = read_jobs(db=db, user_id=user_id)
+
+    return jobs
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get job status",
+)
+def get_job_endpoint(
+    job_id: Annotated[
+        int, Path(..., title="Job ID", description="Unique ID of the job")
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> JobResponse:
+
+    job: JobResponse = read_job(db=db, user_id=user_id, job_id=job_id)
+
+    return job
+
+
+@router.get(
+    "/{job_id}/download",
+    status_code=status.HTTP_200_OK,
+    responses={409: {"description": "Job has not produced a file"}},
+    summary="Download the file produced by a job",
+)
+def download_job_result_endpoint(
+    job_id: Annotated[
+        int, Path(..., title="Job ID", description="Unique ID of the job")
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> StreamingResponse:
+
+    job = get_user_job(db=db, user_id=user_id, job_id=job_id)
+
+    if job.status != JobStatus.SUCCEEDED or not (job.result or {}).get("storage_key"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} has no downloadable result",
+        )
+
+    result = job.result
+
+    return StreamingResponse(
+        get_storage().iter_range(result["storage_key"], 0, result["size"] - 1),
+        media_type=result["media_type"],
+        headers={
+            "Content-Length": str(result["size"]),
+            "Content-Disposition": f'attachment; filename="{result["filename"]}"',
+        },
+    )
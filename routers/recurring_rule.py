@@ -0,0 +1,84 @@
+from typing import Annotated
+
+from fastapi import APIRouter, status, Path, Depends
+from sqlalchemy.orm import Session
+
+from db import get_db_session
+from schemas.recurring_rule import (
+    RecurringRuleRequest,
+    RecurringRuleResponse,
+    RecurringRulesResponse,
+)
+from services.recurring_rule import (
+    read_recurring_rules,
+    add_recurring_rule,
+    delete_recurring_rule,
+)
+from auth import get_current_user_id
+
+router = APIRouter(prefix="/users/recurring", tags=["Users Recurring"])
+
+
+@router.get(
+    "",
+    response_model=RecurringRulesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get user recurring rules",
+    response_description="List of recurring rules of a user",
+)
+def get_recurring_rules_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> RecurringRulesResponse:
+
+    recurring_rules: RecurringRulesResponse = read_recurring_rules(
+        db=db, user_id=user_id
+    )
+
+    return recurring_rules
+
+
+@router.post(
+    "",
+    response_model=RecurringRuleResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create user recurring rule",
+    response_description="Details of the recurring rule",
+)
+def add_recurring_rule_endpoint(
+    recurring_rule_request: RecurringRuleRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> RecurringRuleResponse:
+
+    recurring_rule: RecurringRuleResponse = add_recurring_rule(
+        db=db, user_id=user_id, recurring_rule_request=recurring_rule_request
+    )
+
+    return recurring_rule
+
+
+@router.delete(
+    "/{recurring_rule_id}",
+    response_model=RecurringRuleResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Delete user recurring rule",
+)
+def delete_recurring_rule_endpoint(
+    recurring_rule_id: Annotated[
+        int,
+        Path(
+            ...,
+            title="Recurring Rule ID",
+            description="Unique ID of the recurring rule",
+        ),
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> RecurringRuleResponse:
+
+    deleted_recurring_rule: RecurringRuleResponse = delete_recurring_rule(
+        db=db, user_id=user_id, recurring_rule_id=recurring_rule_id
+    )
+
+    return deleted_recurring_rule
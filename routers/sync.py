@@ -0,0 +1,29 @@
+from fastapi import APIRouter, status, Depends
+from sqlalchemy.orm import Session
+
+from db import get_db_session
+from schemas.sync import SyncRequest, SyncResponse
+from services.user_transaction import sync_user_transactions
+from auth import get_current_user_id
+
+router = APIRouter(prefix="/users/sync", tags=["Users Sync"])
+
+
+@router.post(
+    "",
+    response_model=SyncResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Apply offline changes and fetch the server changes",
+    response_description="Result of each operation and the changes since the cursor",
+)
+def sync_endpoint(
+    sync_request: SyncRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> SyncResponse:
+
+    sync_response: SyncResponse = sync_user_transactions(
+        db=db, user_id=user_id, sync_request=sync_request
+    )
+
+    return sync_response
@@ -1,12 +1,33 @@
-from typing import Annotated
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends, status, Path
+from fastapi import APIRouter, Body, Depends, status, Path, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from db.db_setup import get_db_session
 from schemas.user import UserCreateRequest, UserResponse, UserUpdateRequest
-from services.user import create_user, read_user, update_user, delete_user
-from auth import get_current_user_id
+from schemas.job import JobResponse
+from schemas.preferences import Preferences
+from services.user import (
+    create_user,
+    read_user,
+    profile_etag,
+    update_user,
+    delete_user,
+    request_user_deletion,
+    read_user_deletion,
+)
+from services.attachment import parse_range
+from services.preferences import read_user_preferences, patch_user_preferences
+from services.takeout import (
+    TAKEOUT_FILENAME,
+    TAKEOUT_MEDIA_TYPE,
+    find_takeout,
+    stream_takeout,
+    takeout_etag,
+)
+from storage import get_storage
+from auth import get_current_user_id, get_token_user_id
 
 router = APIRouter(
     prefix="/users",
@@ -15,6 +36,35 @@ router = APIRouter(
 )
 
 
+IfNoneMatchHeader = Annotated[
+    Optional[str],
+    Header(
+        alias="If-None-Match",
+        description="ETag of a profile the client has; unchanged profiles get 304",
+    ),
+]
+
+
+def _revalidated(
+    user: UserResponse, response: Response, if_none_match: Optional[str]
+) -> UserResponse | Response:
+    """``user`` with its ETag, or an empty 304 when the client already has it."""
+
+    etag = profile_etag(user)
+
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+        if etag in tags or "*" in tags:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+    response.headers["ETag"] = etag
+
+    return user
+
+
 @router.get(
     "",
     response_model=UserResponse,
@@ -23,12 +73,33 @@ router = APIRouter(
     response_description="The details of user",
 )
 def get_user_endpoint(
+    response: Response,
+    if_none_match: IfNoneMatchHeader = None,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ) -> UserResponse:
 
     user: UserResponse = read_user(db=db, user_id=user_id)
-    return user
+    return _revalidated(user, response, if_none_match)
+
+
+@router.get(
+    "/me",
+    response_model=UserResponse,
+    status_code=status.HTTP_200_OK,
+    responses={304: {"description": "Profile unchanged since the If-None-Match ETag"}},
+    summary="Get details of the signed-in user",
+    response_description="The details of user, with an ETag to revalidate",
+)
+def get_me_endpoint(
+    response: Response,
+    if_none_match: IfNoneMatchHeader = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> UserResponse:
+
+    user: UserResponse = read_user(db=db, user_id=user_id)
+    return _revalidated(user, response, if_none_match)
 
 
 @router.post(
@@ -62,6 +133,143 @@ def delete_user_endpoint(
     return user
 
 
+@router.post(
+    "/deletion",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Delete existing user in the background",
+    response_description="The queued deletion; poll /users/deletion/{job_id}",
+)
+def request_user_deletion_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> JobResponse:
+
+    job: JobResponse = request_user_deletion(db=db, user_id=user_id)
+
+    return job
+
+
+@router.get(
+    "/deletion/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get status of a background user deletion",
+    response_description="The deletion job; the token works after the user is gone",
+)
+def get_user_deletion_endpoint(
+    job_id: Annotated[
+        int, Path(..., title="Job ID", description="Unique ID of the deletion job")
+    ],
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_db_session),
+) -> JobResponse:
+
+    job: JobResponse = read_user_deletion(db=db, job_id=job_id, user_id=user_id)
+
+    return job
+
+
+@router.get(
+    "/preferences",
+    response_model=Preferences,
+    status_code=status.HTTP_200_OK,
+    summary="Get preferences of the user",
+    response_description="The preferences, migrated to the current schema version",
+)
+def get_user_preferences_endpoint(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> Preferences:
+
+    preferences: Preferences = read_user_preferences(db=db, user_id=user_id)
+
+    return preferences
+
+
+@router.patch(
+    "/preferences",
+    response_model=Preferences,
+    status_code=status.HTTP_200_OK,
+    summary="Change some preferences of the user",
+    response_description="The preferences after the change",
+)
+def patch_user_preferences_endpoint(
+    patch: Annotated[
+        dict[str, Any],
+        Body(
+            ...,
+            description="JSON merge patch (RFC 7396): null removes a key and "
+            "objects are merged",
+            example={"theme": "dark", "notifications": None},
+        ),
+    ],
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> Preferences:
+
+    preferences: Preferences = patch_user_preferences(
+        db=db, user_id=user_id, patch=patch
+    )
+
+    return preferences
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"content": {TAKEOUT_MEDIA_TYPE: {}}},
+        206: {"description": "Partial content of the stored copy, for Range requests"},
+        409: {"description": "An export is already being prepared"},
+        416: {"description": "Requested range not satisfiable"},
+    },
+    summary="Download all data of the user as a zip archive",
+    response_description="NDJSON of each table and the attachment files",
+)
+def export_user_data_endpoint(
+    range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+    if_range: Annotated[Optional[str], Header(alias="If-Range")] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> StreamingResponse:
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{TAKEOUT_FILENAME}"',
+    }
+
+    # A resumed download continues from the copy stored by an earlier export.
+    stored = (
+        find_takeout(db=db, user_id=user_id, if_range=if_range)
+        if range_header
+        else None
+    )
+    byte_range = None
+
+    if stored is not None:
+        size = stored.result["size"]
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is not None:
+        start, end = byte_range
+        headers["ETag"] = takeout_etag(stored.id)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+
+        return StreamingResponse(
+            get_storage().iter_range(stored.result["storage_key"], start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=TAKEOUT_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    job_id, body = stream_takeout(db=db, user_id=user_id)
+    headers["ETag"] = takeout_etag(job_id)
+
+    return StreamingResponse(body, media_type=TAKEOUT_MEDIA_TYPE, headers=headers)
+
+
 @router.put(
     "",
     response_model=UserResponse,
@@ -1,15 +1,21 @@
 from typing import Annotated
 
-from fastapi import APIRouter, status, Path, Depends
+from fastapi import APIRouter, status, Path, Query, Depends
 from sqlalchemy.orm import Session
 
 from db import get_db_session
-from schemas.category import CategoriesResponse
-from schemas.user_category import UserCategoryRequest, UserCategoryResponse
+from schemas.category import CategoriesResponse, CategoryStatsResponse
+from schemas.user_category import (
+    UserCategoryRequest,
+    UserCategoryResponse,
+    UserCategoryUpdateRequest,
+)
 from services.user_category import (
     add_user_category,
     read_user_categories,
+    read_user_category_stats,
     delete_user_category,
+    move_user_category,
 )
 from auth import get_current_user_id
 
@@ -18,15 +24,26 @@ router = APIRouter(prefix="/users/category", tags=["Users Category"])
 
 @router.get(
     "",
-    response_model=CategoriesResponse,
+    response_model=CategoriesResponse | CategoryStatsResponse,
     status_code=status.HTTP_200_OK,
     summary="Get user categories",
     response_description="List of categories names",
 )
 def get_user_categories_endpoint(
+    with_stats: Annotated[
+        bool,
+        Query(
+            title="With Stats",
+            description="Add usage totals and sort by how often each is used",
+        ),
+    ] = False,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
-) -> CategoriesResponse:
+) -> CategoriesResponse | CategoryStatsResponse:
+
+    if with_stats:
+        stats: CategoryStatsResponse = read_user_category_stats(db=db, user_id=user_id)
+        return stats
 
     categories: CategoriesResponse = read_user_categories(db=db, user_id=user_id)
 
@@ -47,7 +64,37 @@ def add_user_category_endpoint(
 ) -> UserCategoryResponse:
 
     user_category_response: UserCategoryResponse = add_user_category(
-        db=db, user_id=user_id, category_name=user_category_request.category_name
+        db=db,
+        user_id=user_id,
+        category_name=user_category_request.category_name,
+        parent=user_category_request.parent,
+    )
+
+    return user_category_response
+
+
+@router.patch(
+    "/{category_name}",
+    response_model=UserCategoryResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Move user category in the category tree",
+    response_description="IDs of user, category and its new parent",
+    responses={409: {"description": "The parent is inside the moved category"}},
+)
+def move_user_category_endpoint(
+    category_name: Annotated[
+        str, Path(..., title="Category Name", description="Name of the Category")
+    ],
+    user_category_update_request: UserCategoryUpdateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> UserCategoryResponse:
+
+    user_category_response: UserCategoryResponse = move_user_category(
+        db=db,
+        user_id=user_id,
+        category_name=category_name,
+        parent=user_category_update_request.parent,
     )
 
     return user_category_response
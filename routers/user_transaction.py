@@ -1,6 +1,16 @@
-from typing import Annotated
+from datetime import date
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, status, Path, Depends
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    status,
+    Path,
+    Query,
+    Header,
+    Depends,
+    Response,
+)
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
@@ -10,20 +20,74 @@ from schemas.user_transaction import (
     UserTransactionResponse,
     UserTransactionsResponse,
     UserTransactionUpdateRequest,
+    UserTransactionSelection,
+    UserTransactionBatchUpdateRequest,
+    UserTransactionBatchResponse,
     ExportRequest,
+    SuggestionsResponse,
+    CategoryPredictionRequest,
+    CategoryPredictionBatchRequest,
+    CategoryPredictionResponse,
+    CategoryPredictionsResponse,
+    TransactionSummaryResponse,
 )
 from services.user_transaction import (
     add_user_transaction,
     read_user_transactions,
     delete_user_transaction,
     update_user_transaction,
+    update_user_transactions,
+    delete_user_transactions,
+    read_transaction_summary,
+    index_user_transaction,
     generate_CSV,
     generate_PDF,
 )
+from schemas.job import ExportJobRequest, JobResponse
+from services.job import enqueue_job
+from services.idempotency import run_idempotent
+from services.suggestion import read_suggestions, SuggestionOrder
+from services.categorizer import predict_category, predict_categories
 from auth import get_current_user_id
 
 router = APIRouter(prefix="/users/transaction", tags=["Users Transaction"])
 
+IdempotencyKeyHeader = Annotated[
+    Optional[str],
+    Header(
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Retries with the same key return the first response",
+    ),
+]
+
+IfMatchHeader = Annotated[
+    Optional[str],
+    Header(
+        alias="If-Match",
+        description='Version the change is based on, e.g. "3"; '
+        "fails with 412 when the transaction has changed since",
+    ),
+]
+
+
+def _if_match_version(if_match: Optional[str]) -> Optional[int]:
+    """Version named by an If-Match entity tag; None matches any version."""
+
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    tag = if_match.strip().removeprefix('"').removesuffix('"')
+
+    # Weak and foreign tags never match under the strong comparison If-Match uses.
+    if not tag.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match does not name a version of the transaction",
+        )
+
+    return int(tag)
+
 
 @router.get(
     "",
@@ -33,17 +97,130 @@ router = APIRouter(prefix="/users/transaction", tags=["Users Transaction"])
     response_description="List of transactions of a user",
 )
 def get_user_transactions_endpoint(
+    start: Annotated[
+        Optional[date],
+        Query(title="Start", description="First day to include (UTC)"),
+    ] = None,
+    end: Annotated[
+        Optional[date],
+        Query(title="End", description="Last day to include (UTC)"),
+    ] = None,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ) -> UserTransactionsResponse:
 
     transactions: UserTransactionsResponse = read_user_transactions(
-        db=db, user_id=user_id
+        db=db, user_id=user_id, start=start, end=end
     )
 
     return transactions
 
 
+@router.get(
+    "/suggest",
+    response_model=SuggestionsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Suggest titles and categories",
+    response_description="Titles and categories from the user's history matching the prefix",
+)
+def suggest_endpoint(
+    prefix: Annotated[
+        str,
+        Query(..., title="Prefix", description="Beginning of the title or category"),
+    ],
+    limit: Annotated[
+        int,
+        Query(ge=1, le=50, title="Limit", description="Maximum suggestions per list"),
+    ] = 10,
+    order_by: Annotated[
+        SuggestionOrder,
+        Query(title="Order By", description="Rank by usage frequency or recency"),
+    ] = "frequency",
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> SuggestionsResponse:
+
+    suggestions: SuggestionsResponse = read_suggestions(
+        db=db, user_id=user_id, prefix=prefix, limit=limit, order_by=order_by
+    )
+
+    return suggestions
+
+
+@router.get(
+    "/summary",
+    response_model=TransactionSummaryResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Summarize user transactions",
+    response_description="Income, expense and category totals in the user's base currency",
+)
+def get_transaction_summary_endpoint(
+    start: Annotated[
+        Optional[date],
+        Query(title="Start", description="First day to include (UTC)"),
+    ] = None,
+    end: Annotated[
+        Optional[date],
+        Query(title="End", description="Last day to include (UTC)"),
+    ] = None,
+    category: Annotated[
+        Optional[str],
+        Query(
+            title="Category",
+            description="Only this category and the categories below it",
+        ),
+    ] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> TransactionSummaryResponse:
+
+    summary: TransactionSummaryResponse = read_transaction_summary(
+        db=db, user_id=user_id, start=start, end=end, category=category
+    )
+
+    return summary
+
+
+@router.post(
+    "/predict-category",
+    response_model=CategoryPredictionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Predict category of a transaction",
+    response_description="Most likely category from the user's history",
+)
+def predict_category_endpoint(
+    category_prediction_request: CategoryPredictionRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> CategoryPredictionResponse:
+
+    prediction: CategoryPredictionResponse = predict_category(
+        db=db, user_id=user_id, request=category_prediction_request
+    )
+
+    return prediction
+
+
+@router.post(
+    "/predict-category/batch",
+    response_model=CategoryPredictionsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Predict categories of many transactions",
+    response_description="Predicted categories in request order",
+)
+def predict_categories_endpoint(
+    category_prediction_batch_request: CategoryPredictionBatchRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> CategoryPredictionsResponse:
+
+    predictions: CategoryPredictionsResponse = predict_categories(
+        db=db, user_id=user_id, requests=category_prediction_batch_request.items
+    )
+
+    return predictions
+
+
 @router.post(
     "",
     response_model=UserTransactionResponse,
@@ -53,21 +230,77 @@ def get_user_transactions_endpoint(
 )
 def add_user_transaction_endpoint(
     user_transaction_request: UserTransactionRequest,
+    response: Response,
+    idempotency_key: IdempotencyKeyHeader = None,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ) -> UserTransactionResponse:
 
-    user_transaction_response: UserTransactionRequest = add_user_transaction(
-        db=db, user_id=user_id, user_transaction_request=user_transaction_request
+    user_transaction_response: UserTransactionResponse = run_idempotent(
+        db=db,
+        user_id=user_id,
+        key=idempotency_key,
+        scope="POST /users/transaction",
+        request=user_transaction_request,
+        response=response,
+        handler=lambda commit: add_user_transaction(
+            db=db,
+            user_id=user_id,
+            user_transaction_request=user_transaction_request,
+            commit=commit,
+        ),
+        on_commit=index_user_transaction,
     )
 
     return user_transaction_response
 
 
+@router.patch(
+    "",
+    response_model=UserTransactionBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update many user transactions",
+    response_description="Transactions changed, or matched on a dry run",
+)
+def update_user_transactions_endpoint(
+    user_transaction_batch_update_request: UserTransactionBatchUpdateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> UserTransactionBatchResponse:
+
+    updated: UserTransactionBatchResponse = update_user_transactions(
+        db=db, user_id=user_id, request=user_transaction_batch_update_request
+    )
+
+    return updated
+
+
+# A POST, since proxies and clients may drop the body of a DELETE.
+@router.post(
+    "/delete",
+    response_model=UserTransactionBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete many user transactions",
+    response_description="Transactions deleted, or matched on a dry run",
+)
+def delete_user_transactions_endpoint(
+    user_transaction_selection: UserTransactionSelection,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> UserTransactionBatchResponse:
+
+    deleted: UserTransactionBatchResponse = delete_user_transactions(
+        db=db, user_id=user_id, selection=user_transaction_selection
+    )
+
+    return deleted
+
+
 @router.put(
     "/{user_transaction_id}",
     response_model=UserTransactionResponse,
     status_code=status.HTTP_202_ACCEPTED,
+    responses={412: {"description": "Transaction changed since If-Match version"}},
     summary="Updates user transaction",
 )
 def update_user_transaction_endpoint(
@@ -78,6 +311,8 @@ def update_user_transaction_endpoint(
         ),
     ],
     user_transaction_update_request: UserTransactionUpdateRequest,
+    response: Response,
+    if_match: IfMatchHeader = None,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ) -> UserTransactionResponse:
@@ -87,8 +322,11 @@ def update_user_transaction_endpoint(
         user_id=user_id,
         user_transaction_id=user_transaction_id,
         user_transaction_update_request=user_transaction_update_request,
+        expected_version=_if_match_version(if_match),
     )
 
+    response.headers["ETag"] = f'"{updated_user_transaction.version}"'
+
     return updated_user_transaction
 
 
@@ -96,6 +334,7 @@ def update_user_transaction_endpoint(
     "/{user_transaction_id}",
     response_model=UserTransactionResponse,
     status_code=status.HTTP_202_ACCEPTED,
+    responses={412: {"description": "Transaction changed since If-Match version"}},
     summary="Delete user transaction",
 )
 def delete_user_transaction_endpoint(
@@ -105,17 +344,57 @@ def delete_user_transaction_endpoint(
             ..., title="Transaction ID", description="Unique ID of the user transaction"
         ),
     ],
+    if_match: IfMatchHeader = None,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ) -> UserTransactionResponse:
 
     deleted_user_transaction: UserTransactionResponse = delete_user_transaction(
-        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+        db=db,
+        user_id=user_id,
+        user_transaction_id=user_transaction_id,
+        expected_version=_if_match_version(if_match),
     )
 
     return deleted_user_transaction
 
 
+@router.post(
+    "/export-jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue an export of the user's transactions",
+    response_description="The queued job; download the file from /users/jobs/{id}/download",
+)
+def add_export_job_endpoint(
+    export_job_request: ExportJobRequest,
+    response: Response,
+    idempotency_key: IdempotencyKeyHeader = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db_session),
+) -> JobResponse:
+
+    def enqueue_export(commit: bool) -> JobResponse:
+        job = enqueue_job(
+            db=db,
+            kind="export_transactions",
+            user_id=user_id,
+            payload={"user_id": user_id, **export_job_request.model_dump(mode="json")},
+            commit=commit,
+        )
+        return JobResponse.model_validate(job)
+
+    return run_idempotent(
+        db=db,
+        user_id=user_id,
+        key=idempotency_key,
+        scope="POST /users/transaction/export-jobs",
+        request=export_job_request,
+        response=response,
+        handler=enqueue_export,
+    )
+
+
 @router.post(
     "/export-csv",
     status_code=status.HTTP_200_OK,
@@ -126,8 +405,10 @@ def delete_user_transaction_endpoint(
     summary="Download the transactions CSV file",
     response_description="Returns a CSV file containing exported transactions.",
 )
-def export_csv_endpoint(transactions: ExportRequest):
-    file_path = generate_CSV(data=transactions)
+def export_csv_endpoint(
+    transactions: ExportRequest, db: Session = Depends(get_db_session)
+):
+    file_path = generate_CSV(db=db, data=transactions)
 
     return FileResponse(
         path=file_path,
@@ -148,9 +429,11 @@ def export_csv_endpoint(transactions: ExportRequest):
     summary="Download the transactions PDF file",
     response_description="Returns a PDF file containing exported transactions.",
 )
-def export_pdf_endpoint(transactions: ExportRequest):
+def export_pdf_endpoint(
+    transactions: ExportRequest, db: Session = Depends(get_db_session)
+):
 
-    file_path = generate_PDF(data=transactions)
+    file_path = generate_PDF(db=db, data=transactions)
 
     return FileResponse(
         path=file_path,
@@ -0,0 +1,139 @@
+from typing import Annotated, Type
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from models import Attachment
+
+
+class AttachmentResponse(BaseModel):
+
+    id: Annotated[
+        int,
+        Field(
+            ...,
+            title="Attachment ID",
+            description="Unique ID of the attachment",
+            example=1,
+        ),
+    ]
+
+    user_transaction_id: Annotated[
+        int,
+        Field(
+            ...,
+            title="Transaction ID",
+            description="Unique ID of the user transaction",
+            example=1,
+        ),
+    ]
+
+    filename: Annotated[
+        str,
+        Field(
+            ...,
+            title="File Name",
+            description="Original name of the uploaded file",
+            example="receipt.jpg",
+        ),
+    ]
+
+    content_type: Annotated[
+        str,
+        Field(
+            ...,
+            title="Content Type",
+            description="MIME type of the file",
+            example="image/jpeg",
+        ),
+    ]
+
+    size: Annotated[
+        int,
+        Field(..., title="Size", description="File size in bytes", example=48213),
+    ]
+
+    sha256: Annotated[
+        str,
+        Field(
+            ...,
+            title="SHA-256",
+            description="Hex digest of the file content",
+            example="9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+        ),
+    ]
+
+    url: Annotated[
+        str,
+        Field(
+            ...,
+            title="Download URL",
+            description="Path to download the file",
+            example="/users/attachments/1",
+        ),
+    ]
+
+    thumbnails: Annotated[
+        dict[int, str],
+        Field(
+            ...,
+            title="Thumbnail URLs",
+            description="Thumbnail paths by size in pixels, empty until generated",
+            example={128: "/users/attachments/1/thumbnails/128"},
+        ),
+    ]
+
+    created_at: Annotated[
+        datetime,
+        Field(
+            ...,
+            title="Created At",
+            description="Timestamp when the file was uploaded",
+            example="2025-10-07T12:30:00Z",
+        ),
+    ]
+
+    @classmethod
+    def from_orm_obj(
+        cls: Type["AttachmentResponse"], obj: "Attachment"
+    ) -> "AttachmentResponse":
+
+        return cls(
+            id=obj.id,
+            user_transaction_id=obj.user_transaction_id,
+            filename=obj.filename,
+            content_type=obj.content_type,
+            size=obj.size,
+            sha256=obj.sha256,
+            url=f"/users/attachments/{obj.id}",
+            thumbnails={
+                size: f"/users/attachments/{obj.id}/thumbnails/{size}"
+                for size in sorted(obj.blob.thumbnail_sizes or [])
+            },
+            created_at=obj.created_at,
+        )
+
+
+class AttachmentsResponse(BaseModel):
+
+    attachments: Annotated[
+        list[AttachmentResponse],
+        Field(
+            ...,
+            title="Attachment List",
+            description="Attachments of a user transaction",
+        ),
+    ]
+
+
+class AttachmentUsage(BaseModel):
+
+    used: Annotated[
+        int,
+        Field(..., title="Used", description="Bytes used by the user's attachments"),
+    ]
+
+    quota: Annotated[
+        int,
+        Field(..., title="Quota", description="Maximum bytes the user may store"),
+    ]
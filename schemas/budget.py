@@ -0,0 +1,117 @@
+from typing import Annotated
+from decimal import Decimal
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class BudgetRequest(BaseModel):
+
+    category: Annotated[
+        str,
+        Field(
+            ...,
+            title="Category Name",
+            description="Name of the budgeted category",
+            example="Food",
+        ),
+    ]
+
+    amount: Annotated[
+        Decimal,
+        Field(
+            ...,
+            gt=0,
+            title="Monthly Limit",
+            description="Monthly spending limit with up to 2 decimal places",
+            example="400.00",
+        ),
+    ]
+
+
+class BudgetStatus(BaseModel):
+
+    category: Annotated[
+        str,
+        Field(
+            ...,
+            title="Category Name",
+            description="Name of the budgeted category",
+            example="Food",
+        ),
+    ]
+
+    month: Annotated[
+        date,
+        Field(
+            ...,
+            title="Month",
+            description="First day of the evaluated month (UTC)",
+            example="2025-10-01",
+        ),
+    ]
+
+    limit: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Monthly Limit",
+            description="Monthly spending limit",
+            example="400.00",
+        ),
+    ]
+
+    spent: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Spent",
+            description="Amount spent in the category during the month",
+            example="350.00",
+        ),
+    ]
+
+    percent: Annotated[
+        float,
+        Field(
+            ...,
+            title="Percent Used",
+            description="Spent amount as a percentage of the limit",
+            example=87.5,
+        ),
+    ]
+
+    threshold: Annotated[
+        int | None,
+        Field(
+            None,
+            title="Crossed Threshold",
+            description="Highest crossed alert threshold (80 or 100), null when below 80%",
+            example=80,
+        ),
+    ]
+
+
+class BudgetsResponse(BaseModel):
+
+    budgets: Annotated[
+        list[BudgetStatus],
+        Field(
+            ...,
+            title="Budget List",
+            description="Budgets of a user with their current month status",
+        ),
+    ]
+
+
+class ReconciliationResult(BaseModel):
+
+    repaired: Annotated[
+        int,
+        Field(..., title="Repaired", description="Counters inserted or corrected"),
+    ]
+
+    removed: Annotated[
+        int,
+        Field(..., title="Removed", description="Counters with no backing rows"),
+    ]
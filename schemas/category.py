@@ -1,4 +1,6 @@
-from typing import Annotated
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -20,10 +22,20 @@ class CategoryRead(BaseModel):
         Field(
             ...,
             title="Category Name",
-            description="The unique name of the category",
+            description="The name of the category, unique per user",
             example="Rent",
         ),
     ]
+
+    parent_id: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="Parent Category ID",
+            description="Parent in the user's category tree, null at the top level",
+            example=None,
+        ),
+    ]
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -35,3 +47,98 @@ class CategoriesResponse(BaseModel):
     ]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryStats(CategoryRead):
+
+    transaction_count: Annotated[
+        int,
+        Field(
+            ...,
+            title="Transaction Count",
+            description="Number of the user's transactions in the category",
+            example=42,
+        ),
+    ]
+
+    spent: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Spent",
+            description="Total of EXPENSE transactions in the base currency",
+            example="245.90",
+        ),
+    ]
+
+    income: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Income",
+            description="Total of INCOME transactions in the base currency",
+            example="0.00",
+        ),
+    ]
+
+    last_used_at: Annotated[
+        Optional[datetime],
+        Field(
+            None,
+            title="Last Used At",
+            description="Time of the latest transaction, null if never used",
+            example="2026-03-14T12:30:00Z",
+        ),
+    ]
+
+
+class CategoryStatsResponse(BaseModel):
+
+    base_currency: Annotated[
+        str,
+        Field(
+            ...,
+            title="Base Currency",
+            description="Currency all totals are converted to",
+            example="USD",
+        ),
+    ]
+
+    categories: Annotated[
+        list[CategoryStats],
+        Field(
+            title="Categories List",
+            description="The user's categories, most used first",
+        ),
+    ]
+
+
+class CategoryMigrationResult(BaseModel):
+
+    adopted: Annotated[
+        int,
+        Field(
+            ...,
+            title="Adopted",
+            description="Shared categories taken over by their only remaining user",
+        ),
+    ]
+
+    copied: Annotated[
+        int,
+        Field(
+            ...,
+            title="Copied",
+            description="Users moved from a shared category to a copy of their own",
+        ),
+    ]
+
+    batches: Annotated[
+        int,
+        Field(..., title="Batches", description="Number of transactions committed"),
+    ]
+
+    duration_seconds: Annotated[
+        float,
+        Field(..., title="Duration", description="Wall-clock time of the run"),
+    ]
@@ -0,0 +1,137 @@
+from typing import Annotated, Any, Literal, Optional
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from enums import JobStatus
+
+
+class JobResponse(BaseModel):
+
+    id: Annotated[
+        int,
+        Field(..., title="Job ID", description="Unique ID of the job", example=1),
+    ]
+
+    kind: Annotated[
+        str,
+        Field(
+            ...,
+            title="Kind",
+            description="Type of work the job performs",
+            example="export_transactions",
+        ),
+    ]
+
+    status: Annotated[
+        JobStatus,
+        Field(
+            ...,
+            title="Status",
+            description="Job status: QUEUED, RUNNING, SUCCEEDED or FAILED",
+        ),
+    ]
+
+    attempts: Annotated[
+        int,
+        Field(..., title="Attempts", description="Number of runs started", example=1),
+    ]
+
+    max_attempts: Annotated[
+        int,
+        Field(
+            ...,
+            title="Max Attempts",
+            description="Runs allowed before the job fails",
+            example=5,
+        ),
+    ]
+
+    result: Annotated[
+        Optional[dict[str, Any]],
+        Field(None, title="Result", description="Result of a succeeded job"),
+    ]
+
+    last_error: Annotated[
+        Optional[str],
+        Field(None, title="Last Error", description="Error of the last failed run"),
+    ]
+
+    run_after: Annotated[
+        datetime,
+        Field(
+            ...,
+            title="Run After",
+            description="Earliest time the job is run or retried",
+            example="2025-10-07T12:30:00Z",
+        ),
+    ]
+
+    created_at: Annotated[
+        datetime,
+        Field(
+            ...,
+            title="Created At",
+            description="Timestamp when the job was queued",
+            example="2025-10-07T12:30:00Z",
+        ),
+    ]
+
+    finished_at: Annotated[
+        Optional[datetime],
+        Field(
+            None,
+            title="Finished At",
+            description="Timestamp when the job succeeded or failed",
+            example="2025-10-07T12:30:05Z",
+        ),
+    ]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobsResponse(BaseModel):
+
+    jobs: Annotated[
+        list[JobResponse],
+        Field(..., title="Job List", description="Most recent jobs of a user"),
+    ]
+
+
+class ExportJobRequest(BaseModel):
+
+    format: Annotated[
+        Literal["csv", "pdf"],
+        Field(..., title="Format", description="Export file format", example="csv"),
+    ]
+
+    base_currency: Annotated[
+        str | None,
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Base Currency",
+            description="Adds a column with amounts converted to this currency",
+            example="USD",
+        ),
+    ]
+
+    start: Annotated[
+        date | None,
+        Field(
+            None,
+            title="Start",
+            description="First day to export (UTC)",
+            example="2025-10-01",
+        ),
+    ]
+
+    end: Annotated[
+        date | None,
+        Field(
+            None,
+            title="End",
+            description="Last day to export (UTC)",
+            example="2025-10-31",
+        ),
+    ]
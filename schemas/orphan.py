@@ -0,0 +1,48 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class OrphanCollectionResult(BaseModel):
+
+    transactions: Annotated[
+        int,
+        Field(
+            ...,
+            title="Transactions",
+            description="Transaction templates without user transactions or recurring rules",
+        ),
+    ]
+
+    categories: Annotated[
+        int,
+        Field(
+            ...,
+            title="Categories",
+            description="Categories without linked users or budgets",
+        ),
+    ]
+
+    attachments: Annotated[
+        int,
+        Field(
+            ...,
+            title="Attachments",
+            description="Attachments whose user transaction no longer exists",
+        ),
+    ]
+
+    blobs: Annotated[
+        int,
+        Field(..., title="Blobs", description="Stored files without attachments"),
+    ]
+
+    batches: Annotated[
+        int,
+        Field(..., title="Batches", description="Number of delete statements run"),
+    ]
+
+    duration_seconds: Annotated[
+        float,
+        Field(..., title="Duration", description="Wall-clock time of the sweep"),
+    ]
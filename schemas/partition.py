@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class PartitionMaintenanceResult(BaseModel):
+
+    created: Annotated[
+        list[str],
+        Field(
+            ...,
+            title="Created",
+            description="Names of the partitions created by this run",
+            example=["user_transaction_p202611"],
+        ),
+    ]
+
+    partitions: Annotated[
+        int,
+        Field(
+            ...,
+            title="Partitions",
+            description="Total number of user transaction partitions, including the default",
+        ),
+    ]
@@ -0,0 +1,56 @@
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+PREFERENCES_VERSION_KEY = "schema_version"
+
+
+class PreferencesV1(BaseModel):
+
+    schema_version: Annotated[
+        Literal[1],
+        Field(
+            1,
+            title="Schema Version",
+            description="Version of the preferences shape, set by the server",
+            example=1,
+        ),
+    ]
+
+    theme: Annotated[
+        Optional[Literal["light", "dark", "system"]],
+        Field(None, title="Theme", description="Colour theme", example="dark"),
+    ]
+
+    notifications: Annotated[
+        Optional[bool],
+        Field(
+            None,
+            title="Notifications",
+            description="Whether notifications are enabled",
+            example=True,
+        ),
+    ]
+
+    base_currency: Annotated[
+        Optional[str],
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Base Currency",
+            description="ISO 4217 currency totals and budgets are reported in",
+            example="EUR",
+        ),
+    ]
+
+    # Keys clients added before preferences had a shape are kept as they are.
+    model_config = ConfigDict(extra="allow", strict=True)
+
+
+# Every shape preferences were ever stored in, by schema version; stored
+# documents are migrated up to the latest one when read.
+PREFERENCES_SCHEMAS: dict[int, type[BaseModel]] = {1: PreferencesV1}
+
+PREFERENCES_VERSION = max(PREFERENCES_SCHEMAS)
+
+Preferences = PREFERENCES_SCHEMAS[PREFERENCES_VERSION]
@@ -0,0 +1,246 @@
+from typing import Annotated, Optional, Type
+from decimal import Decimal
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+from enums import TransactionType, RecurrenceFrequency
+from models import RecurringRule
+
+
+class RecurringRuleRequest(BaseModel):
+
+    type: Annotated[
+        TransactionType,
+        Field(
+            ...,
+            title="Transaction type",
+            description="Transaction type: EXPENSE or INCOME",
+        ),
+    ]
+
+    title: Annotated[
+        str, Field(..., title="Transaction Title", description="Title of transaction")
+    ]
+
+    category: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Category Name",
+            description="The unique name of the category",
+            example="Rent",
+        ),
+    ]
+
+    amount: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Transaction Amount",
+            description="Amount of each occurrence with up to 2 decimal places",
+            example="1500.50",
+        ),
+    ]
+
+    currency: Annotated[
+        str | None,
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Currency",
+            description="ISO 4217 currency code, defaults to the user's base currency",
+            example="EUR",
+        ),
+    ]
+
+    details: Annotated[
+        Optional[str],
+        Field(
+            None,
+            title="Details",
+            description="Details copied to each occurrence",
+            example="Monthly rent payment",
+        ),
+    ]
+
+    frequency: Annotated[
+        RecurrenceFrequency,
+        Field(
+            ...,
+            title="Frequency",
+            description="Recurrence frequency: DAILY, WEEKLY, MONTHLY or YEARLY",
+        ),
+    ]
+
+    interval: Annotated[
+        int,
+        Field(
+            1,
+            ge=1,
+            title="Interval",
+            description="Number of frequency units between occurrences",
+            example=1,
+        ),
+    ]
+
+    day_of_month: Annotated[
+        int | None,
+        Field(
+            None,
+            ge=1,
+            le=31,
+            title="Day of Month",
+            description="Day of month for MONTHLY and YEARLY rules, defaults to the start date's day",
+            example=1,
+        ),
+    ]
+
+    start_date: Annotated[
+        date,
+        Field(
+            ...,
+            title="Start Date",
+            description="Date of the first occurrence",
+            example="2025-10-01",
+        ),
+    ]
+
+    end_date: Annotated[
+        date | None,
+        Field(
+            None,
+            title="End Date",
+            description="Last date an occurrence may fall on",
+            example="2026-09-30",
+        ),
+    ]
+
+    @model_validator(mode="after")
+    def check_dates(self) -> "RecurringRuleRequest":
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringRuleResponse(RecurringRuleRequest):
+
+    id: Annotated[
+        int,
+        Field(
+            ...,
+            title="Recurring Rule ID",
+            description="Unique ID of the recurring rule",
+            example=1,
+        ),
+    ]
+
+    user_id: Annotated[
+        int,
+        Field(..., title="User ID", description="Unique ID of the user", example=1),
+    ]
+
+    next_run_on: Annotated[
+        date | None,
+        Field(
+            None,
+            title="Next Run On",
+            description="Date of the next occurrence, null when the rule has finished",
+            example="2025-11-01",
+        ),
+    ]
+
+    last_run_on: Annotated[
+        date | None,
+        Field(
+            None,
+            title="Last Run On",
+            description="Date of the last materialized occurrence",
+            example="2025-10-01",
+        ),
+    ]
+
+    created_at: Annotated[
+        datetime,
+        Field(
+            ...,
+            title="Created At",
+            description="Timestamp when the rule was created",
+            example="2025-10-07T12:30:00Z",
+        ),
+    ]
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_obj(
+        cls: Type["RecurringRuleResponse"], obj: "RecurringRule"
+    ) -> "RecurringRuleResponse":
+
+        return cls(
+            id=obj.id,
+            user_id=obj.user_id,
+            type=obj.transaction.type,
+            title=obj.transaction.title,
+            category=(
+                obj.transaction.category.name if obj.transaction.category else None
+            ),
+            amount=obj.amount,
+            currency=obj.currency,
+            details=obj.details,
+            frequency=obj.frequency,
+            interval=obj.interval,
+            day_of_month=obj.day_of_month,
+            start_date=obj.start_date,
+            end_date=obj.end_date,
+            next_run_on=obj.next_run_on,
+            last_run_on=obj.last_run_on,
+            created_at=obj.created_at,
+        )
+
+
+class RecurringRulesResponse(BaseModel):
+
+    recurring_rules: Annotated[
+        list[RecurringRuleResponse],
+        Field(
+            ...,
+            title="Recurring Rule List",
+            description="List of recurring rules of a user",
+        ),
+    ]
+
+
+class MaterializationResult(BaseModel):
+
+    rules: Annotated[
+        int,
+        Field(..., title="Rules", description="Number of due rules processed"),
+    ]
+
+    inserted: Annotated[
+        int,
+        Field(
+            ...,
+            title="Inserted",
+            description="Number of user transactions created",
+        ),
+    ]
+
+    skipped: Annotated[
+        int,
+        Field(
+            ...,
+            title="Skipped",
+            description="Occurrences that were already materialized",
+        ),
+    ]
+
+    locked: Annotated[
+        bool,
+        Field(
+            ...,
+            title="Locked",
+            description="True when another instance held the materialization lock",
+        ),
+    ]
@@ -0,0 +1,187 @@
+from typing import Annotated, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+from core import settings
+from enums import SyncOperationType, SyncStatus
+from schemas.user_transaction import (
+    UserTransactionRequest,
+    UserTransactionResponse,
+    UserTransactionUpdateRequest,
+)
+
+
+class SyncOperation(BaseModel):
+
+    op: Annotated[
+        SyncOperationType,
+        Field(..., title="Operation", description="CREATE, UPDATE or DELETE"),
+    ]
+
+    client_id: Annotated[
+        UUID,
+        Field(
+            ...,
+            title="Client ID",
+            description="Client identifier of the transaction, unique per user",
+            example="6f1c2a9e-4b7d-4c1e-9a53-0d8f2b7e5c41",
+        ),
+    ]
+
+    id: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="User Transaction ID",
+            description="Server ID of the transaction; client_id is used when absent",
+            example=1,
+        ),
+    ]
+
+    version: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="Version",
+            description="Last version the client saw; updates and deletes of any "
+            "other version are conflicts",
+            example=1,
+        ),
+    ]
+
+    transaction: Annotated[
+        Optional[UserTransactionRequest],
+        Field(None, title="Transaction", description="New transaction, for CREATE"),
+    ]
+
+    changes: Annotated[
+        Optional[UserTransactionUpdateRequest],
+        Field(None, title="Changes", description="Fields to change, for UPDATE"),
+    ]
+
+    @model_validator(mode="after")
+    def check_payload(self) -> "SyncOperation":
+
+        if self.op == SyncOperationType.CREATE and self.transaction is None:
+            raise ValueError("CREATE operations need a transaction")
+
+        if self.op == SyncOperationType.UPDATE and self.changes is None:
+            raise ValueError("UPDATE operations need changes")
+
+        return self
+
+
+class SyncRequest(BaseModel):
+
+    cursor: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="Cursor",
+            description="Cursor of the previous sync; omit to get every transaction",
+            example=42,
+        ),
+    ]
+
+    operations: Annotated[
+        list[SyncOperation],
+        Field(
+            [],
+            title="Operations",
+            description="Changes made on the client, applied in order",
+            max_length=settings.SYNC_MAX_OPERATIONS,
+        ),
+    ]
+
+
+class SyncOperationResult(BaseModel):
+
+    op: Annotated[
+        SyncOperationType,
+        Field(..., title="Operation", description="CREATE, UPDATE or DELETE"),
+    ]
+
+    client_id: Annotated[
+        UUID,
+        Field(..., title="Client ID", description="Client identifier of the operation"),
+    ]
+
+    status: Annotated[
+        SyncStatus,
+        Field(
+            ...,
+            title="Status",
+            description="APPLIED, CONFLICT, NOT_FOUND or REJECTED",
+        ),
+    ]
+
+    transaction: Annotated[
+        Optional[UserTransactionResponse],
+        Field(
+            None,
+            title="Transaction",
+            description="Server state of the transaction after the operation",
+        ),
+    ]
+
+    detail: Annotated[
+        Optional[str],
+        Field(None, title="Detail", description="Why the operation was not applied"),
+    ]
+
+
+class SyncDeletion(BaseModel):
+
+    id: Annotated[
+        int,
+        Field(..., title="User Transaction ID", description="ID of the deleted row"),
+    ]
+
+    client_id: Annotated[
+        Optional[UUID],
+        Field(None, title="Client ID", description="Client identifier of the row"),
+    ]
+
+
+class SyncResponse(BaseModel):
+
+    results: Annotated[
+        list[SyncOperationResult],
+        Field(..., title="Results", description="Outcome of each operation, in order"),
+    ]
+
+    changes: Annotated[
+        list[UserTransactionResponse],
+        Field(
+            ...,
+            title="Changes",
+            description="Transactions written since the cursor, including by this sync",
+        ),
+    ]
+
+    deleted: Annotated[
+        list[SyncDeletion],
+        Field(
+            ..., title="Deleted", description="Transactions deleted since the cursor"
+        ),
+    ]
+
+    cursor: Annotated[
+        int,
+        Field(
+            ...,
+            title="Cursor",
+            description="Cursor to send with the next sync",
+            example=57,
+        ),
+    ]
+
+    has_more: Annotated[
+        bool,
+        Field(
+            ...,
+            title="Has More",
+            description="Whether more changes follow; sync again with the new cursor",
+        ),
+    ]
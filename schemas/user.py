@@ -48,7 +48,7 @@ class UserCreateRequest(BaseModel):
         Field(
             title="User Preferences",
             description="Preferences stored as JSON",
-            example={"theme": "dark", "notifications": True},
+            example={"theme": "dark", "notifications": True, "base_currency": "EUR"},
             default=None,
         ),
     ]
@@ -107,7 +107,7 @@ class UserResponse(BaseModel):
         Field(
             title="User Preferences",
             description="Preferences stored as JSON",
-            example={"theme": "dark", "notifications": True},
+            example={"theme": "dark", "notifications": True, "base_currency": "EUR"},
             default=None,
         ),
     ]
@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -15,6 +15,30 @@ class UserCategoryRequest(BaseModel):
         ),
     ]
 
+    parent: Annotated[
+        Optional[str],
+        Field(
+            None,
+            title="Parent Category",
+            description="Category of the user to nest it under",
+            example="Housing",
+        ),
+    ]
+
+
+class UserCategoryUpdateRequest(BaseModel):
+
+    parent: Annotated[
+        Optional[str],
+        Field(
+            ...,
+            title="Parent Category",
+            description="Category of the user to move it and its subcategories "
+            "under; null moves them to the top level",
+            example="Housing",
+        ),
+    ]
+
 
 class UserCategoryResponse(BaseModel):
 
@@ -27,4 +51,14 @@ class UserCategoryResponse(BaseModel):
         Field(..., title="Category ID", description="ID of the category", example=1),
     ]
 
+    parent_category_id: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="Parent Category ID",
+            description="Parent in the user's category tree, null at the top level",
+            example=None,
+        ),
+    ]
+
     model_config = ConfigDict(from_attributes=True)
@@ -1,11 +1,14 @@
 from typing import Annotated, Optional, Type
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
+from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
+from core import settings
 from enums import TransactionType
 from models import UserTransaction
+from schemas.budget import BudgetStatus
 
 
 class UserTranactionBase(BaseModel):
@@ -20,6 +23,17 @@ class UserTranactionBase(BaseModel):
         ),
     ]
 
+    currency: Annotated[
+        str | None,
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Currency",
+            description="ISO 4217 currency code, defaults to the user's base currency",
+            example="EUR",
+        ),
+    ]
+
     details: Annotated[
         Optional[str],
         Field(
@@ -73,6 +87,15 @@ class UserTransactionCreate(UserTranactionBase):
         ),
     ]
 
+    client_id: Annotated[
+        UUID | None,
+        Field(
+            None,
+            title="Client ID",
+            description="Identifier generated by the client, unique per user",
+        ),
+    ]
+
 
 class UserTransactionRequest(UserTranactionBase):
 
@@ -99,6 +122,16 @@ class UserTransactionRequest(UserTranactionBase):
         str, Field(..., title="Transaction Title", description="Title of transaction")
     ]
 
+    client_id: Annotated[
+        UUID | None,
+        Field(
+            None,
+            title="Client ID",
+            description="Identifier generated by the client, unique per user",
+            example="6f1c2a9e-4b7d-4c1e-9a53-0d8f2b7e5c41",
+        ),
+    ]
+
 
 class UserTransactionResponse(UserTransactionRequest):
 
@@ -142,6 +175,35 @@ class UserTransactionResponse(UserTransactionRequest):
         ),
     ]
 
+    version: Annotated[
+        int | None,
+        Field(
+            None,
+            title="Version",
+            description="Incremented on every update of the transaction",
+            example=1,
+        ),
+    ]
+
+    sync_seq: Annotated[
+        int | None,
+        Field(
+            None,
+            title="Sync Sequence",
+            description="Position of the last write in the sync change feed",
+            example=42,
+        ),
+    ]
+
+    budget: Annotated[
+        BudgetStatus | None,
+        Field(
+            None,
+            title="Budget Status",
+            description="Status of the category budget after this write, if one exists",
+        ),
+    ]
+
     model_config = ConfigDict(from_attributes=True)
 
     @classmethod
@@ -153,10 +215,14 @@ class UserTransactionResponse(UserTransactionRequest):
             id=obj.id,
             user_id=obj.user_id,
             amount=obj.amount,
+            currency=obj.currency,
             details=obj.details,
             attachments=obj.attachments,
             created_at=obj.created_at,
             updated_at=obj.updated_at,
+            client_id=obj.client_id,
+            version=obj.version,
+            sync_seq=obj.sync_seq,
             category=(
                 obj.transaction.category.name if obj.transaction.category else None
             ),
@@ -189,6 +255,17 @@ class UserTransactionUpdateRequest(BaseModel):
         ),
     ]
 
+    currency: Annotated[
+        str | None,
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Currency",
+            description="ISO 4217 currency code",
+            example="EUR",
+        ),
+    ]
+
     details: Annotated[
         str | None,
         Field(
@@ -244,6 +321,149 @@ class UserTransactionUpdateRequest(BaseModel):
     ]
 
 
+class UserTransactionSelection(BaseModel):
+
+    ids: Annotated[
+        list[int] | None,
+        Field(
+            None,
+            title="User Transaction IDs",
+            description="Transactions to change",
+            example=[1, 2, 3],
+            max_length=settings.TRANSACTION_BATCH_MAX_IDS,
+        ),
+    ]
+
+    start: Annotated[
+        date | None,
+        Field(None, title="Start", description="First day to include (UTC)"),
+    ]
+
+    end: Annotated[
+        date | None,
+        Field(None, title="End", description="Last day to include (UTC)"),
+    ]
+
+    category: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Category Name",
+            description="Only transactions in this category",
+            example="Rent",
+        ),
+    ]
+
+    title: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Transaction Title",
+            description="Only transactions with this title",
+            example="Coffee",
+        ),
+    ]
+
+    dry_run: Annotated[
+        bool,
+        Field(
+            False,
+            title="Dry Run",
+            description="Count the matching transactions without changing them",
+        ),
+    ]
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "UserTransactionSelection":
+
+        if self.ids is None and not self.model_dump(
+            include={"start", "end", "category", "title"}, exclude_none=True
+        ):
+            raise ValueError("Select transactions by ids or by at least one filter")
+
+        return self
+
+
+class UserTransactionBatchChanges(BaseModel):
+
+    category: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Category Name",
+            description="The unique name of the category",
+            example="Rent",
+        ),
+    ]
+
+    type: Annotated[
+        TransactionType | None,
+        Field(
+            None,
+            title="Transaction type",
+            description="Transaction type: EXPENSE or INCOME",
+        ),
+    ]
+
+    title: Annotated[
+        str | None,
+        Field(None, title="Transaction Title", description="Title of transaction"),
+    ]
+
+    details: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Details",
+            description="Additional transaction details or notes",
+            example="Monthly rent payment",
+        ),
+    ]
+
+    @model_validator(mode="after")
+    def check_changes(self) -> "UserTransactionBatchChanges":
+
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("At least one field must change")
+
+        return self
+
+
+class UserTransactionBatchUpdateRequest(UserTransactionSelection):
+
+    changes: Annotated[
+        UserTransactionBatchChanges,
+        Field(..., title="Changes", description="Fields to set on every match"),
+    ]
+
+
+class UserTransactionBatchResponse(BaseModel):
+
+    count: Annotated[
+        int,
+        Field(
+            ...,
+            title="Count",
+            description="Number of transactions changed, or matched on a dry run",
+            example=3,
+        ),
+    ]
+
+    ids: Annotated[
+        list[int],
+        Field(
+            ...,
+            title="User Transaction IDs",
+            description="Transactions changed, or matched on a dry run",
+            example=[1, 2, 3],
+        ),
+    ]
+
+    dry_run: Annotated[
+        bool, Field(..., title="Dry Run", description="Whether nothing was changed")
+    ]
+
+
 class ExportRequest(BaseModel):
 
     transactions: Annotated[
@@ -254,3 +474,195 @@ class ExportRequest(BaseModel):
             description="List of transactions of a user",
         ),
     ]
+
+    base_currency: Annotated[
+        str | None,
+        Field(
+            None,
+            pattern=r"^[A-Z]{3}$",
+            title="Base Currency",
+            description="Adds a column with amounts converted to this currency",
+            example="USD",
+        ),
+    ]
+
+
+class SuggestionsResponse(BaseModel):
+
+    titles: Annotated[
+        list[str],
+        Field(
+            ...,
+            title="Title Suggestions",
+            description="Transaction titles from the user's history matching the prefix",
+            example=["Rent", "Restaurant"],
+        ),
+    ]
+
+    categories: Annotated[
+        list[str],
+        Field(
+            ...,
+            title="Category Suggestions",
+            description="Category names of the user matching the prefix",
+            example=["Rent"],
+        ),
+    ]
+
+
+class CategoryPredictionRequest(BaseModel):
+
+    title: Annotated[
+        str, Field(..., title="Transaction Title", description="Title of transaction")
+    ]
+
+    details: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Details",
+            description="Additional transaction details or notes",
+            example="Monthly rent payment",
+        ),
+    ]
+
+    amount: Annotated[
+        Decimal | None,
+        Field(
+            None,
+            title="Transaction Amount",
+            description="Amount of transaction with up to 2 decimal places",
+            example="1500.50",
+        ),
+    ]
+
+    type: Annotated[
+        TransactionType | None,
+        Field(
+            None,
+            title="Transaction type",
+            description="Transaction type: EXPENSE or INCOME",
+        ),
+    ]
+
+
+class CategoryPredictionBatchRequest(BaseModel):
+
+    items: Annotated[
+        list[CategoryPredictionRequest],
+        Field(
+            ...,
+            title="Prediction Items",
+            description="Transactions to predict categories for",
+            max_length=1000,
+        ),
+    ]
+
+
+class CategoryPredictionResponse(BaseModel):
+
+    category: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Category Name",
+            description="Most likely category, or null when the user has no history",
+            example="Rent",
+        ),
+    ]
+
+    confidence: Annotated[
+        float,
+        Field(
+            ...,
+            title="Confidence",
+            description="Posterior probability of the predicted category",
+            example=0.92,
+        ),
+    ]
+
+
+class CategoryPredictionsResponse(BaseModel):
+
+    predictions: Annotated[
+        list[CategoryPredictionResponse],
+        Field(
+            ...,
+            title="Predictions",
+            description="Predicted categories in the same order as the request items",
+        ),
+    ]
+
+
+class CategoryTotal(BaseModel):
+
+    type: Annotated[
+        TransactionType,
+        Field(
+            ...,
+            title="Transaction type",
+            description="Transaction type: EXPENSE or INCOME",
+        ),
+    ]
+
+    category: Annotated[
+        str | None,
+        Field(
+            None,
+            title="Category Name",
+            description="Category name, null for uncategorized transactions",
+            example="Groceries",
+        ),
+    ]
+
+    total: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Total",
+            description="Total amount in the base currency",
+            example="245.90",
+        ),
+    ]
+
+
+class TransactionSummaryResponse(BaseModel):
+
+    base_currency: Annotated[
+        str,
+        Field(
+            ...,
+            title="Base Currency",
+            description="Currency all totals are converted to",
+            example="USD",
+        ),
+    ]
+
+    income: Annotated[
+        Decimal,
+        Field(..., title="Income", description="Total income", example="3200.00"),
+    ]
+
+    expense: Annotated[
+        Decimal,
+        Field(..., title="Expense", description="Total expense", example="1870.45"),
+    ]
+
+    balance: Annotated[
+        Decimal,
+        Field(
+            ...,
+            title="Balance",
+            description="Income minus expense",
+            example="1329.55",
+        ),
+    ]
+
+    categories: Annotated[
+        list[CategoryTotal],
+        Field(
+            ...,
+            title="Category Totals",
+            description="Totals per transaction type and category",
+        ),
+    ]
@@ -0,0 +1,227 @@
+import hashlib
+import os
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core import settings
+from db import add_commit_refresh
+from models import Attachment, Blob, UserTransaction
+from schemas.attachment import AttachmentResponse, AttachmentsResponse, AttachmentUsage
+from storage import get_storage
+from services.thumbnail import thumbnail_key
+from workers.thumbnails import enqueue_thumbnails
+
+ATTACHMENT_LOCK_NAMESPACE = 7_210_031
+
+
+def _get_user_transaction_id(
+    db: Session, user_id: int, user_transaction_id: int
+) -> int:
+
+    found: Optional[int] = db.scalar(
+        select(UserTransaction.id).where(
+            UserTransaction.id == user_transaction_id,
+            UserTransaction.user_id == user_id,
+        )
+    )
+
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Transaction not found for user with id {user_id}",
+        )
+
+    return found
+
+
+def get_user_attachment(db: Session, user_id: int, attachment_id: int) -> Attachment:
+
+    attachment: Attachment | None = Attachment.get_one(
+        db, id=attachment_id, user_id=user_id
+    )
+
+    if not attachment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Attachment not found for user with id {user_id}",
+        )
+
+    return attachment
+
+
+def _used_bytes(db: Session, user_id: int) -> int:
+    return db.scalar(
+        select(func.coalesce(func.sum(Attachment.size), 0)).where(
+            Attachment.user_id == user_id
+        )
+    )
+
+
+def _hash_file(file: BinaryIO, limit: int) -> tuple[str, int]:
+
+    digest = hashlib.sha256()
+    size = 0
+
+    while chunk := file.read(settings.STORAGE_CHUNK_SIZE):
+        size += len(chunk)
+
+        if size > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File exceeds the attachment size limit or the storage quota",
+            )
+
+        digest.update(chunk)
+
+    return digest.hexdigest(), size
+
+
+def read_attachment_usage(db: Session, user_id: int) -> AttachmentUsage:
+    return AttachmentUsage(
+        used=_used_bytes(db=db, user_id=user_id),
+        quota=settings.ATTACHMENT_QUOTA_BYTES,
+    )
+
+
+def read_attachments(
+    db: Session, user_id: int, user_transaction_id: int
+) -> AttachmentsResponse:
+
+    _get_user_transaction_id(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
+
+    attachments = db.scalars(
+        select(Attachment)
+        .where(Attachment.user_transaction_id == user_transaction_id)
+        .order_by(Attachment.id)
+    ).all()
+
+    return AttachmentsResponse(
+        attachments=[AttachmentResponse.from_orm_obj(obj) for obj in attachments]
+    )
+
+
+def add_attachment(
+    db: Session, user_id: int, user_transaction_id: int, upload: UploadFile
+) -> AttachmentResponse:
+
+    _get_user_transaction_id(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
+
+    # Serialize uploads per user so concurrent requests cannot overshoot the quota.
+    db.execute(select(func.pg_advisory_xact_lock(ATTACHMENT_LOCK_NAMESPACE, user_id)))
+
+    remaining = settings.ATTACHMENT_QUOTA_BYTES - _used_bytes(db=db, user_id=user_id)
+    sha256, size = _hash_file(
+        upload.file, limit=min(settings.ATTACHMENT_MAX_BYTES, remaining)
+    )
+
+    db.execute(insert(Blob).values(sha256=sha256, size=size).on_conflict_do_nothing())
+    # Lock the blob so a concurrent delete of the last reference cannot remove
+    # the stored object while it is being attached again.
+    db.execute(select(Blob.sha256).where(Blob.sha256 == sha256).with_for_update())
+
+    storage = get_storage()
+
+    if not storage.exists(sha256):
+        upload.file.seek(0)
+        storage.put(sha256, upload.file)
+
+    attachment = Attachment(
+        user_id=user_id,
+        user_transaction_id=user_transaction_id,
+        sha256=sha256,
+        filename=os.path.basename(upload.filename or "attachment")[:255],
+        content_type=upload.content_type or "application/octet-stream",
+        size=size,
+    )
+
+    add_commit_refresh(db, attachment)
+
+    if (
+        settings.THUMBNAIL_ENABLED
+        and attachment.blob.thumbnail_sizes is None
+        and attachment.content_type.startswith("image/")
+    ):
+        enqueue_thumbnails(sha256, size)
+
+    return AttachmentResponse.from_orm_obj(attachment)
+
+
+def delete_attachment(
+    db: Session, user_id: int, attachment_id: int
+) -> AttachmentResponse:
+
+    attachment = get_user_attachment(
+        db=db, user_id=user_id, attachment_id=attachment_id
+    )
+
+    deleted_attachment = AttachmentResponse.from_orm_obj(attachment)
+
+    # The blob and its files are left to the orphan sweep, which removes them
+    # only once nothing refers to them, so a failed commit here cannot leave
+    # rows pointing at deleted content.
+    db.delete(attachment)
+    db.commit()
+
+    return deleted_attachment
+
+
+def get_user_thumbnail_key(
+    db: Session, user_id: int, attachment_id: int, size: int
+) -> str:
+
+    attachment = get_user_attachment(
+        db=db, user_id=user_id, attachment_id=attachment_id
+    )
+
+    if size not in (attachment.blob.thumbnail_sizes or []):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Thumbnail of size {size} not available",
+        )
+
+    return thumbnail_key(attachment.sha256, size)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Return the inclusive byte span of a single-range ``Range`` header."""
+
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes=") :].strip()
+
+    # Multi-range requests are answered with the full content.
+    if "," in spec:
+        return None
+
+    first, _, last = spec.partition("-")
+
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = size - int(last)
+            end = size - 1
+    except ValueError:
+        return None
+
+    start = max(start, 0)
+    end = min(end, size - 1)
+
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return start, end
@@ -0,0 +1,334 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, delete, and_, func, cast, Date, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from enums import TransactionType
+from models import (
+    Budget,
+    Category,
+    SpendCounter,
+    Transaction,
+    User,
+    UserTransaction,
+)
+from schemas.budget import (
+    BudgetRequest,
+    BudgetStatus,
+    BudgetsResponse,
+    ReconciliationResult,
+)
+from services.user_category import get_or_create_user_category
+from services.fx_rate import (
+    convert_amount,
+    convert_amounts,
+    get_user_base_currencies,
+)
+from services.sync import lock_user_changes
+
+BUDGET_THRESHOLDS = (100, 80)
+UPSERT_CHUNK_SIZE = 1000
+
+
+def month_of(moment: datetime) -> date:
+    return moment.astimezone(timezone.utc).date().replace(day=1)
+
+
+def current_month() -> date:
+    return month_of(datetime.now(timezone.utc))
+
+
+def _budget_status(
+    category: str, month: date, limit: Decimal, spent: Decimal
+) -> BudgetStatus:
+
+    percent = float(spent / limit * 100)
+
+    return BudgetStatus(
+        category=category,
+        month=month,
+        limit=limit,
+        spent=spent,
+        percent=round(percent, 2),
+        threshold=next(
+            (threshold for threshold in BUDGET_THRESHOLDS if percent >= threshold),
+            None,
+        ),
+    )
+
+
+def apply_spend(
+    db: Session,
+    user_id: int,
+    category_id: Optional[int],
+    type: TransactionType,
+    amount: Decimal,
+    currency: str,
+    created_at: datetime,
+    base_currency: str,
+    sign: int = 1,
+) -> Optional[Decimal]:
+
+    if category_id is None or type != TransactionType.EXPENSE:
+        return None
+
+    amount = convert_amount(
+        db, amount, currency, created_at.astimezone(timezone.utc).date(), base_currency
+    )
+
+    stmt = insert(SpendCounter).values(
+        user_id=user_id,
+        category_id=category_id,
+        month=month_of(created_at),
+        spent=sign * amount,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "category_id", "month"],
+        set_={"spent": SpendCounter.spent + stmt.excluded.spent},
+    ).returning(SpendCounter.spent)
+
+    return db.scalar(stmt)
+
+
+def bulk_apply_spend(db: Session, deltas: dict[tuple[int, int, date], Decimal]) -> None:
+
+    if not deltas:
+        return
+
+    stmt = insert(SpendCounter).values(
+        [
+            {
+                "user_id": user_id,
+                "category_id": category_id,
+                "month": month,
+                "spent": spent,
+            }
+            for (user_id, category_id, month), spent in deltas.items()
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "category_id", "month"],
+            set_={"spent": SpendCounter.spent + stmt.excluded.spent},
+        )
+    )
+
+
+def evaluate_budget(
+    db: Session, user_id: int, category_id: int, month: date, spent: Decimal
+) -> Optional[BudgetStatus]:
+
+    budget: Budget | None = Budget.get_one(db, user_id=user_id, category_id=category_id)
+
+    if not budget:
+        return None
+
+    return _budget_status(budget.category.name, month, budget.amount, spent)
+
+
+def read_budgets(db: Session, user_id: int) -> BudgetsResponse:
+
+    month = current_month()
+
+    rows = db.execute(
+        select(Category.name, Budget.amount, SpendCounter.spent)
+        .join(Category, Category.id == Budget.category_id)
+        .outerjoin(
+            SpendCounter,
+            and_(
+                SpendCounter.user_id == Budget.user_id,
+                SpendCounter.category_id == Budget.category_id,
+                SpendCounter.month == month,
+            ),
+        )
+        .where(Budget.user_id == user_id)
+        .order_by(Category.name)
+    ).all()
+
+    return BudgetsResponse(
+        budgets=[
+            _budget_status(name, month, limit, spent or Decimal("0"))
+            for name, limit, spent in rows
+        ]
+    )
+
+
+def set_budget(
+    db: Session, user_id: int, budget_request: BudgetRequest
+) -> BudgetStatus:
+
+    category_id: int = get_or_create_user_category(
+        db=db, user_id=user_id, category_name=budget_request.category
+    )
+
+    budget: Budget | None = Budget.get_one(db, user_id=user_id, category_id=category_id)
+
+    if budget:
+        budget.amount = budget_request.amount
+    else:
+        db.add(
+            Budget(
+                user_id=user_id,
+                category_id=category_id,
+                amount=budget_request.amount,
+            )
+        )
+
+    db.commit()
+
+    month = current_month()
+    spent = db.scalar(
+        select(SpendCounter.spent).where(
+            SpendCounter.user_id == user_id,
+            SpendCounter.category_id == category_id,
+            SpendCounter.month == month,
+        )
+    )
+
+    return _budget_status(
+        budget_request.category, month, budget_request.amount, spent or Decimal("0")
+    )
+
+
+def delete_budget(db: Session, user_id: int, category_name: str) -> None:
+
+    budget: Budget | None = db.scalar(
+        select(Budget)
+        .join(Category, Category.id == Budget.category_id)
+        .where(Budget.user_id == user_id, Category.name == category_name)
+    )
+
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Budget for category '{category_name}' not found",
+        )
+
+    db.delete(budget)
+    db.commit()
+
+
+def reconcile_user_spend_counters(db: Session, user_id: int) -> tuple[int, int]:
+    """Rewrite the user's counters from their transactions; returns the
+    counters repaired and removed. Not committed.
+
+    Every writer of counters holds the user's change lock, so none can commit
+    an increment between the totals read here and the upsert that replaces
+    them.
+    """
+
+    lock_user_changes(db=db, user_ids=[user_id])
+
+    day = cast(func.timezone("UTC", UserTransaction.created_at), Date)
+
+    rows = db.execute(
+        select(
+            Transaction.category_id,
+            UserTransaction.currency,
+            day.label("day"),
+            func.sum(UserTransaction.amount).label("spent"),
+        )
+        .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+        .where(
+            UserTransaction.user_id == user_id,
+            Transaction.type == TransactionType.EXPENSE,
+            Transaction.category_id.isnot(None),
+        )
+        .group_by(Transaction.category_id, UserTransaction.currency, day)
+    ).all()
+
+    counters: dict[tuple[int, date], Decimal] = defaultdict(Decimal)
+
+    if rows:
+        base_currency = get_user_base_currencies(db=db, user_ids={user_id})[user_id]
+        converted = convert_amounts(
+            db,
+            [row.spent for row in rows],
+            [row.currency for row in rows],
+            [row.day for row in rows],
+            base_currency,
+        )
+
+        for row, spent in zip(rows, converted):
+            counters[(row.category_id, row.day.replace(day=1))] += spent
+
+    repaired = 0
+    items = list(counters.items())
+
+    for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+        upsert = insert(SpendCounter).values(
+            [
+                {
+                    "user_id": user_id,
+                    "category_id": category_id,
+                    "month": month,
+                    "spent": spent,
+                }
+                for (category_id, month), spent in items[
+                    start : start + UPSERT_CHUNK_SIZE
+                ]
+            ]
+        )
+        repaired += db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["user_id", "category_id", "month"],
+                set_={"spent": upsert.excluded.spent},
+                where=SpendCounter.spent.is_distinct_from(upsert.excluded.spent),
+            )
+        ).rowcount
+
+    month = cast(
+        func.date_trunc("month", func.timezone("UTC", UserTransaction.created_at)),
+        Date,
+    )
+
+    backing_rows = (
+        select(UserTransaction.id)
+        .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+        .where(
+            UserTransaction.user_id == SpendCounter.user_id,
+            Transaction.category_id == SpendCounter.category_id,
+            Transaction.type == TransactionType.EXPENSE,
+            month == SpendCounter.month,
+        )
+    )
+
+    removed = db.execute(
+        delete(SpendCounter)
+        .where(SpendCounter.user_id == user_id, ~exists(backing_rows))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return repaired, removed
+
+
+def reconcile_spend_counters(
+    db: Session, user_id: Optional[int] = None
+) -> ReconciliationResult:
+    """Repair counters of one user, or of every user one at a time, each in
+    its own transaction so a user's writes wait for their own repair only."""
+
+    user_ids = (
+        [user_id]
+        if user_id is not None
+        else db.scalars(select(User.id).order_by(User.id)).all()
+    )
+
+    repaired = 0
+    removed = 0
+
+    for counter_user_id in user_ids:
+        user_repaired, user_removed = reconcile_user_spend_counters(
+            db=db, user_id=counter_user_id
+        )
+        db.commit()
+
+        repaired += user_repaired
+        removed += user_removed
+
+    return ReconciliationResult(repaired=repaired, removed=removed)
@@ -0,0 +1,248 @@
+import math
+import re
+from decimal import Decimal
+from threading import Lock
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core import settings, LRUCache
+from enums import TransactionType
+from models import Category, Transaction, UserTransaction
+from schemas.user_transaction import (
+    CategoryPredictionRequest,
+    CategoryPredictionResponse,
+    CategoryPredictionsResponse,
+)
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+
+
+def extract_features(
+    title: str,
+    details: Optional[str] = None,
+    amount: Optional[Decimal] = None,
+    type: Optional[TransactionType] = None,
+) -> list[str]:
+
+    features = _TOKEN_PATTERN.findall(title.casefold())
+
+    if details:
+        features.extend(_TOKEN_PATTERN.findall(details.casefold()))
+
+    if amount is not None:
+        features.append(f"#amount:{int(math.log2(abs(float(amount)) + 1))}")
+
+    if type is not None:
+        features.append(f"#type:{TransactionType(type).value}")
+
+    return features
+
+
+class NaiveBayesCategorizer:
+    """Multinomial naive Bayes over title/details tokens plus amount and type buckets.
+
+    Counts are kept per category as ``{token_id: count}`` against a shared
+    vocabulary, so learning and unlearning a row are both O(len(features)).
+    """
+
+    def __init__(self):
+        self._vocabulary: dict[str, int] = {}
+        self._category_docs: dict[str, int] = {}
+        self._category_tokens: dict[str, dict[int, int]] = {}
+        self._category_totals: dict[str, int] = {}
+        self._docs = 0
+        self.lock = Lock()
+
+    def learn(self, features: Iterable[str], category: str) -> None:
+
+        counts = self._category_tokens.setdefault(category, {})
+
+        for feature in features:
+            token_id = self._vocabulary.setdefault(feature, len(self._vocabulary))
+            counts[token_id] = counts.get(token_id, 0) + 1
+            self._category_totals[category] = self._category_totals.get(category, 0) + 1
+
+        self._category_docs[category] = self._category_docs.get(category, 0) + 1
+        self._docs += 1
+
+    def forget(self, features: Iterable[str], category: str) -> None:
+        """Unlearn a row. A model that never saw the row (it was written by
+        another process) only loses counts it has, so none go negative."""
+
+        counts = self._category_tokens.get(category)
+
+        if counts is None:
+            return
+
+        for feature in features:
+            token_id = self._vocabulary.get(feature)
+
+            if token_id is None or counts.get(token_id, 0) <= 0:
+                continue
+
+            counts[token_id] -= 1
+            if not counts[token_id]:
+                del counts[token_id]
+
+            self._category_totals[category] = max(
+                self._category_totals.get(category, 0) - 1, 0
+            )
+
+        self._category_docs[category] -= 1
+        self._docs = max(self._docs - 1, 0)
+
+        if self._category_docs[category] <= 0:
+            del self._category_docs[category]
+            del self._category_tokens[category]
+            self._category_totals.pop(category, None)
+
+    def predict(self, features: Iterable[str]) -> tuple[Optional[str], float]:
+
+        if not self._category_docs:
+            return None, 0.0
+
+        known = [feature for feature in features if feature in self._vocabulary]
+
+        if all(feature.startswith("#") for feature in known):
+            return None, 0.0
+
+        token_ids = [self._vocabulary[feature] for feature in known]
+        vocabulary_size = len(self._vocabulary) or 1
+
+        scores: dict[str, float] = {}
+        for category, docs in self._category_docs.items():
+            counts = self._category_tokens[category]
+            denominator = math.log(
+                self._category_totals.get(category, 0) + vocabulary_size
+            )
+
+            score = math.log(docs / self._docs)
+            for token_id in token_ids:
+                score += math.log(counts.get(token_id, 0) + 1) - denominator
+
+            scores[category] = score
+
+        best = max(scores, key=scores.get)
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+
+        return best, 1.0 / normalizer
+
+
+_user_categorizers = LRUCache(maxsize=settings.CATEGORIZER_CACHE_SIZE)
+
+
+def _train_user_categorizer(db: Session, user_id: int) -> NaiveBayesCategorizer:
+
+    categorizer = NaiveBayesCategorizer()
+
+    rows = db.execute(
+        select(
+            Transaction.title,
+            UserTransaction.details,
+            UserTransaction.amount,
+            Transaction.type,
+            Category.name,
+        )
+        .join(UserTransaction, UserTransaction.transaction_id == Transaction.id)
+        .join(Category, Category.id == Transaction.category_id)
+        .where(UserTransaction.user_id == user_id)
+    )
+
+    for title, details, amount, type, category in rows:
+        categorizer.learn(extract_features(title, details, amount, type), category)
+
+    return categorizer
+
+
+def get_user_categorizer(db: Session, user_id: int) -> NaiveBayesCategorizer:
+    return _user_categorizers.get_or_set(
+        user_id, lambda: _train_user_categorizer(db=db, user_id=user_id)
+    )
+
+
+def _predict(
+    categorizer: NaiveBayesCategorizer, request: CategoryPredictionRequest
+) -> CategoryPredictionResponse:
+
+    features = extract_features(
+        request.title, request.details, request.amount, request.type
+    )
+
+    with categorizer.lock:
+        category, confidence = categorizer.predict(features)
+
+    return CategoryPredictionResponse(category=category, confidence=confidence)
+
+
+def predict_category(
+    db: Session, user_id: int, request: CategoryPredictionRequest
+) -> CategoryPredictionResponse:
+
+    categorizer = get_user_categorizer(db=db, user_id=user_id)
+
+    return _predict(categorizer, request)
+
+
+def predict_categories(
+    db: Session, user_id: int, requests: list[CategoryPredictionRequest]
+) -> CategoryPredictionsResponse:
+
+    categorizer = get_user_categorizer(db=db, user_id=user_id)
+
+    return CategoryPredictionsResponse(
+        predictions=[_predict(categorizer, request) for request in requests]
+    )
+
+
+def suggest_category(
+    db: Session, user_id: int, request: CategoryPredictionRequest
+) -> Optional[str]:
+
+    prediction = predict_category(db=db, user_id=user_id, request=request)
+
+    if prediction.confidence < settings.CATEGORY_PREDICTION_MIN_CONFIDENCE:
+        return None
+
+    return prediction.category
+
+
+def learn_transaction_category(
+    user_id: int,
+    title: str,
+    details: Optional[str],
+    amount: Decimal,
+    type: TransactionType,
+    category: Optional[str],
+) -> None:
+
+    categorizer: NaiveBayesCategorizer | None = _user_categorizers.get(user_id)
+
+    if categorizer is None or not category:
+        return
+
+    with categorizer.lock:
+        categorizer.learn(extract_features(title, details, amount, type), category)
+
+
+def forget_transaction_category(
+    user_id: int,
+    title: str,
+    details: Optional[str],
+    amount: Decimal,
+    type: TransactionType,
+    category: Optional[str],
+) -> None:
+
+    categorizer: NaiveBayesCategorizer | None = _user_categorizers.get(user_id)
+
+    if categorizer is None or not category:
+        return
+
+    with categorizer.lock:
+        categorizer.forget(extract_features(title, details, amount, type), category)
+
+
+def evict_user_categorizer(user_id: int) -> None:
+    _user_categorizers.pop(user_id)
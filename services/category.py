@@ -1,61 +1,51 @@
-from sqlalchemy import select
+from sqlalchemy import select, Select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from fastapi import HTTPException, status
+from models import Category, UserCategory
 
-from db import add_commit_refresh
 
-from models import Category
-from schemas.category import CategoriesResponse
+def user_category_id(user_id: int, category_name: str) -> Select:
+    """Id of the user's category named ``category_name``.
 
+    Categories shared from before names were per user are found through the
+    user's link until ``migrate-categories`` has given them a copy of their own.
+    """
 
-def read_categories(db: Session) -> CategoriesResponse:
+    owned = select(Category.id).where(
+        Category.user_id == user_id, Category.name == category_name
+    )
+    linked = (
+        select(Category.id)
+        .join(UserCategory, UserCategory.category_id == Category.id)
+        .where(UserCategory.user_id == user_id, Category.name == category_name)
+    )
 
-    categories = Category.get_all(db)
+    return owned.union_all(linked).limit(1)
 
-    if not categories:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No categories found",
-        )
 
-    return CategoriesResponse(categories=categories)
+def get_or_create_category(
+    db: Session, user_id: int, category_name: str, commit: bool = True
+) -> int:
 
+    matching = user_category_id(user_id=user_id, category_name=category_name)
 
-def read_category_users(db: Session, category_name: str) -> list[int]:
+    category_id: int | None = db.scalar(matching)
 
-    category = Category.get_one(db, name=category_name)
+    if category_id is not None:
+        return category_id
 
-    if not category:
-        return []
+    category_id = db.scalar(
+        insert(Category)
+        .values(user_id=user_id, name=category_name)
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+        .returning(Category.id)
+    )
 
-    user_ids: list[int] = [uc.user_id for uc in category.users]
+    if category_id is None:
+        category_id = db.scalar(matching)
 
-    return user_ids
+    if commit:
+        db.commit()
 
-
-def get_or_create_category(db: Session, category_name: str) -> int:
-
-    existing_category = Category.get_one(db, name=category_name)
-
-    if existing_category:
-        return existing_category.id
-
-    new_category = Category(name=category_name)
-
-    add_commit_refresh(db, new_category)
-
-    return new_category.id
-
-
-def get_category_id(db: Session, category_name: str) -> str:
-
-    category = Category.get_one(db, name=category_name)
-
-    if not category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Category {category_name} not found",
-        )
-
-    return category.id
+    return category_id
@@ -0,0 +1,361 @@
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    exists,
+    func,
+    case,
+    literal,
+    and_,
+    or_,
+    union_all,
+    BigInteger,
+    Row,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from core import settings
+from models import (
+    Budget,
+    Category,
+    RecurringRule,
+    SpendCounter,
+    Transaction,
+    UserCategory,
+    UserTransaction,
+)
+from schemas.category import CategoryMigrationResult
+from services.user_category import subtree_prefix, unlink_category_node
+
+logger = logging.getLogger(__name__)
+
+
+def _category_users(category_id: int, other_than: Optional[int] = None) -> list[Select]:
+    """User ids referencing ``category_id``, one query per referencing table."""
+
+    queries = [
+        select(UserCategory.user_id).where(UserCategory.category_id == category_id),
+        select(Budget.user_id).where(Budget.category_id == category_id),
+        select(SpendCounter.user_id).where(SpendCounter.category_id == category_id),
+        select(UserTransaction.user_id)
+        .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+        .where(Transaction.category_id == category_id),
+        select(RecurringRule.user_id)
+        .join(Transaction, Transaction.id == RecurringRule.transaction_id)
+        .where(Transaction.category_id == category_id),
+    ]
+
+    if other_than is not None:
+        queries = [
+            query.where(query.selected_columns[0] != other_than) for query in queries
+        ]
+
+    return queries
+
+
+def _next_user(db: Session, category_id: int) -> Optional[int]:
+    """Any user of the category; the UNION stops at its first row, so hot
+    categories cost an index probe, not a scan of their transactions."""
+
+    return db.scalar(union_all(*_category_users(category_id)).limit(1))
+
+
+def _owned_category(db: Session, user_id: int, category_name: str) -> Optional[int]:
+    return db.scalar(
+        select(Category.id).where(
+            Category.user_id == user_id, Category.name == category_name
+        )
+    )
+
+
+def _move_templates(db: Session, user_id: int, category_id: int, copy_id: int):
+    """Point the user's transactions and recurring rules at templates of the
+    copy. Their rows read the same, so sync order and timestamps are kept."""
+
+    used = or_(
+        exists().where(
+            UserTransaction.user_id == user_id,
+            UserTransaction.transaction_id == Transaction.id,
+        ),
+        exists().where(
+            RecurringRule.user_id == user_id,
+            RecurringRule.transaction_id == Transaction.id,
+        ),
+    )
+
+    db.execute(
+        insert(Transaction)
+        .from_select(
+            ["type", "title", "category_id"],
+            select(
+                Transaction.type, Transaction.title, literal(copy_id, BigInteger)
+            ).where(Transaction.category_id == category_id, used),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    copy = aliased(Transaction)
+    same_template = and_(
+        Transaction.category_id == category_id,
+        copy.category_id == copy_id,
+        copy.type == Transaction.type,
+        copy.title == Transaction.title,
+    )
+
+    db.execute(
+        update(UserTransaction)
+        .where(
+            UserTransaction.user_id == user_id,
+            UserTransaction.transaction_id == Transaction.id,
+            same_template,
+        )
+        .values(
+            transaction_id=copy.id,
+            sync_seq=UserTransaction.sync_seq,
+            updated_at=UserTransaction.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(RecurringRule)
+        .where(
+            RecurringRule.user_id == user_id,
+            RecurringRule.transaction_id == Transaction.id,
+            same_template,
+        )
+        .values(transaction_id=copy.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _move_budgets(db: Session, user_id: int, category_id: int, copy_id: int):
+    """Budgets and spend counters follow the copy; where the copy already has
+    a budget it is kept, and counters of the same month are added up."""
+
+    kept = aliased(Budget)
+
+    db.execute(
+        update(Budget)
+        .where(
+            Budget.user_id == user_id,
+            Budget.category_id == category_id,
+            ~exists().where(kept.user_id == user_id, kept.category_id == copy_id),
+        )
+        .values(category_id=copy_id, updated_at=Budget.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(Budget).where(
+            Budget.user_id == user_id, Budget.category_id == category_id
+        )
+    )
+
+    counters = db.execute(
+        delete(SpendCounter)
+        .where(SpendCounter.user_id == user_id, SpendCounter.category_id == category_id)
+        .returning(SpendCounter.month, SpendCounter.spent)
+    ).all()
+
+    if counters:
+        statement = insert(SpendCounter).values(
+            [
+                {
+                    "user_id": user_id,
+                    "category_id": copy_id,
+                    "month": month,
+                    "spent": spent,
+                }
+                for month, spent in counters
+            ]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "category_id", "month"],
+                set_={"spent": SpendCounter.spent + statement.excluded.spent},
+            )
+        )
+
+
+def _move_tree_node(db: Session, user_id: int, category_id: int, copy_id: int):
+    """The copy takes the shared category's place in the user's tree."""
+
+    # A copy the user already had linked leaves its own place first.
+    existing: Optional[Row] = db.execute(
+        select(
+            UserCategory.category_id,
+            UserCategory.parent_category_id,
+            UserCategory.path,
+        ).where(UserCategory.user_id == user_id, UserCategory.category_id == copy_id)
+    ).one_or_none()
+
+    if existing is not None:
+        unlink_category_node(db=db, user_id=user_id, node=existing)
+
+    node: Optional[Row] = db.execute(
+        select(
+            UserCategory.category_id,
+            UserCategory.parent_category_id,
+            UserCategory.path,
+        ).where(
+            UserCategory.user_id == user_id, UserCategory.category_id == category_id
+        )
+    ).one_or_none()
+
+    if node is None:
+        return
+
+    db.execute(
+        insert(UserCategory).values(
+            user_id=user_id,
+            category_id=copy_id,
+            parent_category_id=node.parent_category_id,
+            path=node.path,
+        )
+    )
+    db.execute(
+        update(UserCategory)
+        .where(
+            UserCategory.user_id == user_id,
+            UserCategory.path.like(f"{subtree_prefix(node)}%"),
+        )
+        .values(
+            path=func.replace(UserCategory.path, f"/{category_id}/", f"/{copy_id}/"),
+            parent_category_id=case(
+                (
+                    UserCategory.parent_category_id == category_id,
+                    literal(copy_id, BigInteger),
+                ),
+                else_=UserCategory.parent_category_id,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(UserCategory).where(
+            UserCategory.user_id == user_id, UserCategory.category_id == category_id
+        )
+    )
+
+
+def _copy_for_user(db: Session, user_id: int, category: Row) -> None:
+    """Move every reference the user has to the shared ``category`` onto a
+    category of their own with the same name."""
+
+    copy_id: Optional[int] = db.scalar(
+        insert(Category)
+        .values(user_id=user_id, name=category.name)
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+        .returning(Category.id)
+    )
+
+    if copy_id is None:
+        copy_id = _owned_category(db=db, user_id=user_id, category_name=category.name)
+
+    _move_templates(db=db, user_id=user_id, category_id=category.id, copy_id=copy_id)
+    _move_budgets(db=db, user_id=user_id, category_id=category.id, copy_id=copy_id)
+    _move_tree_node(db=db, user_id=user_id, category_id=category.id, copy_id=copy_id)
+
+
+def _adopt(db: Session, user_id: int, category: Row) -> bool:
+    """Make ``user_id`` the owner of the shared ``category`` if nobody else
+    uses it and they have no category of that name yet.
+
+    The check is part of the UPDATE, and the caller's lock on the category row
+    blocks new rows referencing it until commit, so no other user can link it
+    between the check and the change of owner.
+    """
+
+    if _owned_category(db=db, user_id=user_id, category_name=category.name):
+        return False
+
+    others = [
+        ~query.exists()
+        for query in _category_users(category_id=category.id, other_than=user_id)
+    ]
+
+    return (
+        db.scalar(
+            update(Category)
+            .where(Category.id == category.id, *others)
+            .values(user_id=user_id)
+            .returning(Category.id)
+        )
+        is not None
+    )
+
+
+def migrate_shared_categories(
+    db: Session,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> CategoryMigrationResult:
+    """Give each user of a shared category one of their own, ``batch_size``
+    users per transaction.
+
+    Every user but the last gets a copy, and their templates, budgets, spend
+    counters and tree node are moved onto it; the last one takes the shared
+    row over, so categories with a single user are not copied at all. Only
+    that user's rows are touched, and a run can be stopped and resumed at any
+    point. Shared categories nobody uses are left to the orphan collector.
+    """
+
+    batch_size = batch_size or settings.CATEGORY_MIGRATION_BATCH_SIZE
+    started = time.monotonic()
+
+    adopted = 0
+    copied = 0
+    batches = 0
+    after = 0
+
+    while max_batches is None or batches < max_batches:
+        moved = 0
+
+        while moved < batch_size:
+            category: Optional[Row] = db.execute(
+                select(Category.id, Category.name)
+                .where(Category.user_id.is_(None), Category.id > after)
+                .order_by(Category.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).one_or_none()
+
+            if category is None:
+                break
+
+            user_id = _next_user(db=db, category_id=category.id)
+
+            if user_id is None:
+                after = category.id
+                continue
+
+            if _adopt(db=db, user_id=user_id, category=category):
+                adopted += 1
+                after = category.id
+            else:
+                _copy_for_user(db=db, user_id=user_id, category=category)
+                copied += 1
+
+            moved += 1
+
+        db.commit()
+        batches += 1
+
+        if moved < batch_size:
+            break
+
+    result = CategoryMigrationResult(
+        adopted=adopted,
+        copied=copied,
+        batches=batches,
+        duration_seconds=round(time.monotonic() - started, 3),
+    )
+
+    logger.info("Category migration finished: %s", result)
+
+    return result
@@ -0,0 +1,215 @@
+import csv
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from threading import Lock
+from typing import Iterable, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core import settings
+from models import FxRate, User
+
+CENT = Decimal("0.01")
+LOAD_CHUNK_SIZE = 5000
+
+
+class UnknownCurrencyError(HTTPException):
+
+    def __init__(self, currency: str):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No exchange rates available for currency '{currency}'",
+        )
+
+
+class FxRateCache:
+    """In-memory rates per currency as parallel, date-sorted arrays."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._dates: dict[str, list[date]] = {}
+        self._rates: dict[str, list[Decimal]] = {}
+        self._loaded_at: float | None = None
+        self._lock = Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self, db: Session) -> None:
+
+        with self._lock:
+            if (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self.ttl_seconds
+            ):
+                return
+
+            dates: dict[str, list[date]] = defaultdict(list)
+            rates: dict[str, list[Decimal]] = defaultdict(list)
+
+            for currency, rate_date, rate in db.execute(
+                select(FxRate.currency, FxRate.rate_date, FxRate.rate).order_by(
+                    FxRate.currency, FxRate.rate_date
+                )
+            ):
+                dates[currency].append(rate_date)
+                rates[currency].append(rate)
+
+            self._dates, self._rates = dict(dates), dict(rates)
+            self._loaded_at = time.monotonic()
+
+    def _rate_on(self, currency: str, day: date) -> Decimal:
+
+        if currency == settings.FX_REFERENCE_CURRENCY:
+            return Decimal(1)
+
+        dates = self._dates.get(currency)
+
+        if not dates:
+            raise UnknownCurrencyError(currency)
+
+        return self._rates[currency][max(bisect_right(dates, day) - 1, 0)]
+
+    def ensure_known(self, db: Session, currency: str) -> None:
+
+        self._ensure_loaded(db)
+
+        if currency != settings.FX_REFERENCE_CURRENCY and currency not in self._dates:
+            raise UnknownCurrencyError(currency)
+
+    def factors(
+        self, db: Session, pairs: Iterable[tuple[str, date]], target: str
+    ) -> dict[tuple[str, date], Decimal]:
+
+        self._ensure_loaded(db)
+
+        factors: dict[tuple[str, date], Decimal] = {}
+        target_rates: dict[date, Decimal] = {}
+
+        for currency, day in pairs:
+            if (currency, day) in factors:
+                continue
+
+            if currency == target:
+                factors[(currency, day)] = Decimal(1)
+                continue
+
+            if day not in target_rates:
+                target_rates[day] = self._rate_on(target, day)
+
+            factors[(currency, day)] = self._rate_on(currency, day) / target_rates[day]
+
+        return factors
+
+
+_fx_rates = FxRateCache(ttl_seconds=settings.FX_CACHE_TTL_SECONDS)
+
+
+def get_user_base_currency(db: Session, user_id: int) -> str:
+
+    base_currency: Optional[str] = db.scalar(
+        select(User.preferences["base_currency"].astext).where(User.id == user_id)
+    )
+
+    return base_currency or settings.DEFAULT_CURRENCY
+
+
+def get_user_base_currencies(db: Session, user_ids: set[int]) -> dict[int, str]:
+
+    if not user_ids:
+        return {}
+
+    rows = db.execute(
+        select(User.id, User.preferences["base_currency"].astext).where(
+            User.id.in_(user_ids)
+        )
+    ).all()
+
+    return {
+        user_id: base_currency or settings.DEFAULT_CURRENCY
+        for user_id, base_currency in rows
+    }
+
+
+def ensure_currency_supported(db: Session, currency: str) -> None:
+    _fx_rates.ensure_known(db, currency)
+
+
+def convert_amounts(
+    db: Session,
+    amounts: Sequence[Decimal],
+    currencies: Sequence[str],
+    days: Sequence[date],
+    target: str,
+) -> list[Decimal]:
+
+    keys = list(zip(currencies, days))
+    factors = _fx_rates.factors(db, keys, target)
+
+    return [
+        (amount * factors[key]).quantize(CENT, rounding=ROUND_HALF_UP)
+        for amount, key in zip(amounts, keys)
+    ]
+
+
+def convert_amount(
+    db: Session, amount: Decimal, currency: str, day: date, target: str
+) -> Decimal:
+
+    if currency == target:
+        return amount
+
+    return convert_amounts(db, [amount], [currency], [day], target)[0]
+
+
+def load_fx_rates_csv(db: Session, path: str) -> int:
+    """Upsert rates from a ``date,currency,rate`` CSV file; returns rows loaded."""
+
+    loaded = 0
+
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        chunk: dict[tuple[str, date], Decimal] = {}
+
+        for row in reader:
+            key = (row["currency"].strip().upper(), date.fromisoformat(row["date"]))
+            chunk[key] = Decimal(row["rate"])
+
+            if len(chunk) >= LOAD_CHUNK_SIZE:
+                loaded += _upsert_rates(db, chunk)
+                chunk = {}
+
+        loaded += _upsert_rates(db, chunk)
+
+    db.commit()
+    _fx_rates.invalidate()
+
+    return loaded
+
+
+def _upsert_rates(db: Session, rates: dict[tuple[str, date], Decimal]) -> int:
+
+    if not rates:
+        return 0
+
+    stmt = insert(FxRate).values(
+        [
+            {"currency": currency, "rate_date": rate_date, "rate": rate}
+            for (currency, rate_date), rate in rates.items()
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["currency", "rate_date"],
+            set_={"rate": stmt.excluded.rate},
+        )
+    )
+
+    return len(rates)
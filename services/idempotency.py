@@ -0,0 +1,185 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core import settings
+from models import IdempotencyKey
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def request_hash(scope: str, request: BaseModel) -> str:
+    """Fingerprint of the endpoint and body a key was first used with."""
+
+    body = json.dumps(
+        {"scope": scope, "body": request.model_dump(mode="json")},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _key(user_id: int, key: str):
+    return and_(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+
+
+def reserve_idempotency_key(
+    db: Session, user_id: int, key: str, request_hash: str
+) -> Optional[dict]:
+    """Claim ``key`` for a new request, or return the stored response of the
+    request that already used it."""
+
+    now = datetime.now(timezone.utc)
+
+    # Expired keys and reservations of requests that never finished are free.
+    db.execute(
+        delete(IdempotencyKey).where(
+            _key(user_id, key),
+            or_(
+                IdempotencyKey.expires_at <= now,
+                and_(
+                    IdempotencyKey.response.is_(None),
+                    IdempotencyKey.created_at
+                    <= now
+                    - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT_SECONDS),
+                ),
+            ),
+        )
+    )
+
+    reserved = db.scalar(
+        insert(IdempotencyKey)
+        .values(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+        )
+        .on_conflict_do_nothing()
+        .returning(IdempotencyKey.key)
+    )
+
+    stored = None
+
+    if reserved is None:
+        stored = db.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.response).where(
+                _key(user_id, key)
+            )
+        ).one_or_none()
+
+    db.commit()
+
+    if reserved is not None:
+        return None
+
+    if stored is None or stored.response is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+        )
+
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request",
+        )
+
+    return stored.response
+
+
+def complete_idempotency_key(
+    db: Session, user_id: int, key: str, response: dict, commit: bool = True
+) -> None:
+
+    db.execute(
+        update(IdempotencyKey).where(_key(user_id, key)).values(response=response)
+    )
+
+    if commit:
+        db.commit()
+
+
+def release_idempotency_key(db: Session, user_id: int, key: str) -> None:
+    """Free ``key`` after its request failed, so a retry runs it again."""
+
+    db.execute(
+        delete(IdempotencyKey).where(
+            _key(user_id, key), IdempotencyKey.response.is_(None)
+        )
+    )
+    db.commit()
+
+
+def run_idempotent(
+    db: Session,
+    user_id: int,
+    key: Optional[str],
+    scope: str,
+    request: BaseModel,
+    response: Response,
+    handler: Callable[[bool], ResponseModel],
+    on_commit: Optional[Callable[[ResponseModel], None]] = None,
+) -> ResponseModel | dict:
+    """Run ``handler`` once per ``key``; a retry with the same key and request
+    gets the first response back without running it again.
+
+    ``handler`` takes a ``commit`` flag. Under a key it is called with
+    ``False`` and its writes are committed together with the stored response,
+    so a crash cannot leave the work done but the key pending. ``on_commit``
+    runs after that commit, and not on replays.
+    """
+
+    if key is None:
+        return handler(True)
+
+    stored = reserve_idempotency_key(
+        db=db, user_id=user_id, key=key, request_hash=request_hash(scope, request)
+    )
+
+    if stored is not None:
+        response.headers[REPLAYED_HEADER] = "true"
+        return stored
+
+    try:
+        result = handler(False)
+        complete_idempotency_key(
+            db=db,
+            user_id=user_id,
+            key=key,
+            response=result.model_dump(mode="json"),
+            commit=False,
+        )
+        db.commit()
+    except BaseException:
+        db.rollback()
+        release_idempotency_key(db=db, user_id=user_id, key=key)
+        raise
+
+    if on_commit is not None:
+        on_commit(result)
+
+    return result
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+
+    purged = db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.expires_at <= datetime.now(timezone.utc)
+        )
+    ).rowcount
+    db.commit()
+
+    return purged
@@ -0,0 +1,234 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, delete, and_, or_, func, Row
+from sqlalchemy.orm import Session
+
+from core import settings
+from enums import JobStatus
+from models import Job
+from schemas.job import JobResponse, JobsResponse
+
+USER_JOB_LIMIT = 50
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Optional[dict[str, Any]] = None,
+    user_id: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    commit: bool = True,
+) -> Job:
+    """Queue a job; with ``commit=False`` it becomes visible with the caller's commit."""
+
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        user_id=user_id,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+    db.add(job)
+
+    if commit:
+        db.commit()
+        db.refresh(job)
+    else:
+        db.flush()
+
+    return job
+
+
+def get_user_job(db: Session, user_id: int, job_id: int) -> Job:
+
+    job: Job | None = Job.get_one(db, id=job_id, user_id=user_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found for user with id {user_id}",
+        )
+
+    return job
+
+
+def read_job(db: Session, user_id: int, job_id: int) -> JobResponse:
+    return JobResponse.model_validate(
+        get_user_job(db=db, user_id=user_id, job_id=job_id)
+    )
+
+
+def read_jobs(db: Session, user_id: int) -> JobsResponse:
+
+    jobs = db.scalars(
+        select(Job)
+        .where(Job.user_id == user_id)
+        .order_by(Job.id.desc())
+        .limit(USER_JOB_LIMIT)
+    ).all()
+
+    return JobsResponse(jobs=[JobResponse.model_validate(job) for job in jobs])
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[Row]:
+    """Lock the next runnable job for ``worker_id``, or return None."""
+
+    lease_expired = Job.locked_at < func.now() - timedelta(
+        seconds=settings.JOB_LEASE_SECONDS
+    )
+
+    candidate = (
+        select(Job.id)
+        .where(
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_after <= func.now()),
+                # Jobs of a worker that died mid-run are picked up again.
+                and_(
+                    Job.status == JobStatus.RUNNING,
+                    Job.attempts < Job.max_attempts,
+                    lease_expired,
+                ),
+            )
+        )
+        .order_by(Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    job = db.execute(
+        update(Job)
+        .where(Job.id == candidate)
+        .values(
+            status=JobStatus.RUNNING,
+            locked_by=worker_id,
+            locked_at=func.now(),
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+    ).one_or_none()
+    db.commit()
+
+    return job
+
+
+def _job_to_finish(job_id: int, only_running: bool) -> list:
+
+    if only_running:
+        return [Job.id == job_id, Job.status == JobStatus.RUNNING]
+
+    return [Job.id == job_id]
+
+
+def complete_job(
+    db: Session, job_id: int, result: Optional[dict], only_running: bool = False
+) -> bool:
+    """False when the job row is gone, e.g. deleted with its user, or with
+    ``only_running`` when it was already finished by someone else."""
+
+    completed: int = db.execute(
+        update(Job)
+        .where(*_job_to_finish(job_id, only_running))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            last_error=None,
+            locked_by=None,
+            finished_at=func.now(),
+        )
+    ).rowcount
+    db.commit()
+
+    return bool(completed)
+
+
+def retry_delay(attempts: int) -> float:
+
+    delay = min(
+        settings.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOB_BACKOFF_MAX_SECONDS,
+    )
+
+    return delay * random.uniform(0.5, 1.0)
+
+
+def fail_job(
+    db: Session,
+    job_id: int,
+    attempts: int,
+    max_attempts: int,
+    error: str,
+    only_running: bool = False,
+) -> None:
+
+    values: dict[str, Any] = {"last_error": error[:4000], "locked_by": None}
+
+    if attempts < max_attempts:
+        values["status"] = JobStatus.QUEUED
+        values["run_after"] = datetime.now(timezone.utc) + timedelta(
+            seconds=retry_delay(attempts)
+        )
+    else:
+        values["status"] = JobStatus.FAILED
+        values["finished_at"] = func.now()
+
+    db.execute(
+        update(Job).where(*_job_to_finish(job_id, only_running)).values(**values)
+    )
+    db.commit()
+
+
+def renew_job_lease(db: Session, job_id: int) -> bool:
+    """Move the lease of a running job forward; False once the job is no
+    longer running."""
+
+    renewed: int = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+        .values(locked_at=func.now())
+    ).rowcount
+    db.commit()
+
+    return bool(renewed)
+
+
+def fail_exhausted_jobs(db: Session) -> int:
+    """Fail running jobs whose lease expired after their last allowed attempt."""
+
+    failed = db.execute(
+        update(Job)
+        .where(
+            Job.status == JobStatus.RUNNING,
+            Job.attempts >= Job.max_attempts,
+            Job.locked_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        )
+        .values(
+            status=JobStatus.FAILED,
+            last_error="Worker lease expired",
+            locked_by=None,
+            finished_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    return failed
+
+
+def prune_finished_jobs(db: Session, older_than: timedelta) -> list[Row]:
+
+    pruned = db.execute(
+        delete(Job)
+        .where(
+            Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+            Job.finished_at < func.now() - older_than,
+        )
+        .returning(Job.id, Job.result)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+
+    return pruned
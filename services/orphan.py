@@ -0,0 +1,175 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import select, delete, exists, func, Delete
+from sqlalchemy.orm import Session
+
+from core import settings
+from models import (
+    Attachment,
+    Blob,
+    Budget,
+    Category,
+    RecurringRule,
+    Transaction,
+    UserCategory,
+    UserTransaction,
+)
+from schemas.orphan import OrphanCollectionResult
+from services.thumbnail import thumbnail_key
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def _orphan_transactions(batch_size: int) -> Delete:
+
+    batch = (
+        select(Transaction.id)
+        .where(
+            ~exists().where(UserTransaction.transaction_id == Transaction.id),
+            ~exists().where(RecurringRule.transaction_id == Transaction.id),
+        )
+        .order_by(Transaction.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    return (
+        delete(Transaction).where(Transaction.id.in_(batch)).returning(Transaction.id)
+    )
+
+
+def _orphan_categories(batch_size: int) -> Delete:
+
+    batch = (
+        select(Category.id)
+        .where(
+            ~exists().where(UserCategory.category_id == Category.id),
+            ~exists().where(Budget.category_id == Category.id),
+        )
+        .order_by(Category.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    return delete(Category).where(Category.id.in_(batch)).returning(Category.id)
+
+
+def _orphan_attachments(batch_size: int) -> Delete:
+
+    batch = (
+        select(Attachment.id)
+        .where(
+            ~exists().where(UserTransaction.id == Attachment.user_transaction_id),
+        )
+        .order_by(Attachment.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    return delete(Attachment).where(Attachment.id.in_(batch)).returning(Attachment.id)
+
+
+def _orphan_blobs(batch_size: int) -> Delete:
+
+    # The grace period keeps blobs of uploads that are still in flight.
+    batch = (
+        select(Blob.sha256)
+        .where(
+            ~exists().where(Attachment.sha256 == Blob.sha256),
+            Blob.created_at
+            < func.now() - timedelta(seconds=settings.ORPHAN_BLOB_GRACE_SECONDS),
+        )
+        .order_by(Blob.sha256)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    return (
+        delete(Blob)
+        .where(Blob.sha256.in_(batch))
+        .returning(Blob.sha256, Blob.thumbnail_sizes)
+    )
+
+
+def _delete_stored_blobs(rows) -> None:
+
+    storage = get_storage()
+
+    for sha256, thumbnail_sizes in rows:
+        for size in thumbnail_sizes or []:
+            storage.delete(thumbnail_key(sha256, size))
+        storage.delete(sha256)
+
+
+def _sweep(
+    db: Session,
+    build: Callable[[int], Delete],
+    batch_size: int,
+    max_batches: Optional[int],
+    on_deleted: Optional[Callable] = None,
+) -> tuple[int, int]:
+
+    deleted = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        rows = db.execute(
+            build(batch_size).execution_options(synchronize_session=False)
+        ).all()
+        batches += 1
+
+        if on_deleted is not None:
+            # Runs before commit, while the deleted rows are still locked.
+            on_deleted(rows)
+
+        db.commit()
+        deleted += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    return deleted, batches
+
+
+def collect_orphans(
+    db: Session,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> OrphanCollectionResult:
+    """Delete unreferenced templates, categories, attachments and blobs in chunks."""
+
+    batch_size = batch_size or settings.ORPHAN_GC_BATCH_SIZE
+    started = time.monotonic()
+
+    transactions, transaction_batches = _sweep(
+        db, _orphan_transactions, batch_size, max_batches
+    )
+    categories, category_batches = _sweep(
+        db, _orphan_categories, batch_size, max_batches
+    )
+    # Attachments go before blobs so the files they held are freed in the same run.
+    attachments, attachment_batches = _sweep(
+        db, _orphan_attachments, batch_size, max_batches
+    )
+    blobs, blob_batches = _sweep(
+        db, _orphan_blobs, batch_size, max_batches, on_deleted=_delete_stored_blobs
+    )
+
+    result = OrphanCollectionResult(
+        transactions=transactions,
+        categories=categories,
+        attachments=attachments,
+        blobs=blobs,
+        batches=sum(
+            (transaction_batches, category_batches, attachment_batches, blob_batches)
+        ),
+        duration_seconds=round(time.monotonic() - started, 3),
+    )
+
+    logger.info("Orphan collection finished: %s", result)
+
+    return result
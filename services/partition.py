@@ -0,0 +1,156 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import Session
+
+from core import settings
+from schemas.partition import PartitionMaintenanceResult
+
+logger = logging.getLogger(__name__)
+
+PARTITION_LOCK_KEY = 7_210_035
+PARENT_TABLE = "user_transaction"
+DEFAULT_PARTITION = "user_transaction_default"
+
+
+def add_months(month: date, months: int) -> date:
+
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+
+    return date(year, month_index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    # Bounds are spelled in UTC so they do not depend on the session time zone.
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def read_partitions(db: Session) -> list[str]:
+
+    return list(
+        db.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "WHERE parent.relname = :parent ORDER BY child.relname"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+    )
+
+
+def create_month_partition(db: Session, month: date) -> bool:
+    """Create the partition for ``month``; returns False if it already exists."""
+
+    name = partition_name(month)
+
+    if name in read_partitions(db):
+        return False
+
+    start, end = _bound(month), _bound(add_months(month, 1))
+    in_range = {
+        "start": datetime.combine(month, datetime.min.time(), timezone.utc),
+        "end": datetime.combine(
+            add_months(month, 1), datetime.min.time(), timezone.utc
+        ),
+    }
+
+    parked = db.scalar(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        in_range,
+    )
+
+    if not parked:
+        db.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ({start}) TO ({end})"
+            )
+        )
+        return True
+
+    # Postgres refuses to create a partition whose range overlaps rows held in
+    # the default partition, so those rows are moved into a detached table
+    # that is then attached.
+    db.execute(
+        text(
+            f"CREATE TABLE {name} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        in_range,
+    )
+    db.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({start}) TO ({end})"
+        )
+    )
+
+    return True
+
+
+def _parked_months(db: Session) -> list[date]:
+    """Months with rows in the default partition, e.g. transactions imported
+    or synced with a date before the oldest partition."""
+
+    return [
+        moment.date()
+        for moment in db.scalars(
+            text(
+                "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+                f"FROM {DEFAULT_PARTITION}"
+            )
+        )
+    ]
+
+
+def ensure_user_transaction_partitions(
+    db: Session, months_ahead: Optional[int] = None, today: Optional[date] = None
+) -> PartitionMaintenanceResult:
+    """Create monthly partitions from the current month through
+    ``months_ahead``, and for every month with rows parked in the default
+    partition, moving those rows out of it."""
+
+    months_ahead = (
+        settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    )
+    current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+
+    db.execute(select(func.pg_advisory_xact_lock(PARTITION_LOCK_KEY)))
+
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    months.update(_parked_months(db))
+
+    created = [
+        partition_name(month)
+        for month in sorted(months)
+        if create_month_partition(db=db, month=month)
+    ]
+
+    db.commit()
+
+    result = PartitionMaintenanceResult(
+        created=created, partitions=len(read_partitions(db))
+    )
+
+    if created:
+        logger.info("Created user transaction partitions: %s", ", ".join(created))
+
+    return result
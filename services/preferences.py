@@ -0,0 +1,247 @@
+import re
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import Text, case, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from core import settings, TTLCache
+from models import User
+from schemas.preferences import (
+    PREFERENCES_VERSION,
+    PREFERENCES_VERSION_KEY,
+    Preferences,
+)
+from services.budget import reconcile_user_spend_counters
+from services.fx_rate import ensure_currency_supported, get_user_base_currency
+from services.sync import lock_user_changes
+
+PreferencesMigration = Callable[[dict[str, Any]], dict[str, Any]]
+
+_migrations: dict[int, PreferencesMigration] = {}
+
+_user_preferences = TTLCache(
+    maxsize=settings.PREFERENCES_CACHE_SIZE,
+    ttl_seconds=settings.PREFERENCES_CACHE_TTL_SECONDS,
+)
+
+
+def preferences_migration(
+    from_version: int,
+) -> Callable[[PreferencesMigration], PreferencesMigration]:
+    """Register the decorated function as the migration of preferences stored
+    at ``from_version`` to the next version."""
+
+    def register(migration: PreferencesMigration) -> PreferencesMigration:
+        _migrations[from_version] = migration
+        return migration
+
+    return register
+
+
+@preferences_migration(from_version=0)
+def _unversioned_to_v1(preferences: dict[str, Any]) -> dict[str, Any]:
+    """Preferences saved as free-form JSON: normalize the keys v1 knows and
+    drop values it cannot hold; other keys are kept."""
+
+    migrated = dict(preferences)
+
+    currency = migrated.pop("base_currency", None)
+    if isinstance(currency, str):
+        currency = currency.strip().upper()
+        if re.fullmatch("[A-Z]{3}", currency):
+            migrated["base_currency"] = currency
+
+    theme = migrated.pop("theme", None)
+    if isinstance(theme, str) and theme.lower() in ("light", "dark", "system"):
+        migrated["theme"] = theme.lower()
+
+    notifications = migrated.pop("notifications", None)
+    if isinstance(notifications, bool):
+        migrated["notifications"] = notifications
+
+    return migrated
+
+
+def _stored_version(preferences: dict[str, Any]) -> int:
+    """Schema version ``preferences`` were stored at. The server only writes
+    integers, so any other version key was set by a client and the document is
+    migrated as unversioned."""
+
+    version = preferences.get(PREFERENCES_VERSION_KEY, 0)
+
+    if (
+        isinstance(version, bool)
+        or not isinstance(version, int)
+        or not 0 <= version <= PREFERENCES_VERSION
+    ):
+        return 0
+
+    return version
+
+
+def upgrade_preferences(preferences: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """Migrate preferences stored at any schema version to the current one."""
+
+    upgraded = dict(preferences or {})
+    version = _stored_version(upgraded)
+
+    while version < PREFERENCES_VERSION:
+        upgraded = _migrations[version](upgraded)
+        version += 1
+
+    upgraded[PREFERENCES_VERSION_KEY] = version
+
+    return upgraded
+
+
+def validate_preferences(preferences: dict[str, Any]) -> dict[str, Any]:
+
+    try:
+        Preferences.model_validate(preferences)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[
+                {"loc": list(error["loc"]), "msg": error["msg"]}
+                for error in exc.errors()
+            ],
+        )
+
+    return preferences
+
+
+def evict_user_preferences(user_id: int) -> None:
+    _user_preferences.pop(user_id)
+
+
+def read_user_preferences(db: Session, user_id: int) -> Preferences:
+    """The user's preferences, from the cache while it is fresh."""
+
+    preferences = _user_preferences.get(user_id)
+
+    if preferences is None:
+        stored = db.execute(
+            select(User.preferences).where(User.id == user_id)
+        ).one_or_none()
+
+        if stored is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with id {user_id} not found",
+            )
+
+        preferences = upgrade_preferences(stored.preferences)
+        _user_preferences.set(user_id, preferences)
+
+    return Preferences.model_validate(preferences)
+
+
+def _merge_patch(target: ColumnElement, patch: dict[str, Any]) -> ColumnElement:
+    """SQL applying the JSON merge patch (RFC 7396) ``patch`` to the jsonb
+    expression ``target``: null removes a key, objects merge recursively and
+    any other value replaces what was there."""
+
+    document = case(
+        (func.jsonb_typeof(target) == "object", target), else_=literal({}, JSONB)
+    )
+
+    removed = [key for key, value in patch.items() if value is None]
+    replaced = {
+        key: value
+        for key, value in patch.items()
+        if value is not None and not isinstance(value, dict)
+    }
+
+    if removed:
+        document = document.op("-", return_type=JSONB)(literal(removed, ARRAY(Text)))
+
+    if replaced:
+        document = document.op("||", return_type=JSONB)(literal(replaced, JSONB))
+
+    for key, value in patch.items():
+        if isinstance(value, dict):
+            document = document.op("||", return_type=JSONB)(
+                func.jsonb_build_object(
+                    key, _merge_patch(target.op("->", return_type=JSONB)(key), value)
+                )
+            )
+
+    return document
+
+
+def _apply_patch(db: Session, user_id: int, patch: dict[str, Any]) -> Optional[dict]:
+    """Merge ``patch`` in one UPDATE; None when the user is missing or their
+    preferences are stored at an older version."""
+
+    return db.scalar(
+        update(User)
+        .where(
+            User.id == user_id,
+            User.preferences.contains({PREFERENCES_VERSION_KEY: PREFERENCES_VERSION}),
+        )
+        .values(preferences=_merge_patch(User.preferences, patch))
+        .returning(User.preferences)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def patch_user_preferences(
+    db: Session, user_id: int, patch: dict[str, Any]
+) -> Preferences:
+
+    if PREFERENCES_VERSION_KEY in patch:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"'{PREFERENCES_VERSION_KEY}' is set by the server",
+        )
+
+    if isinstance(patch.get("base_currency"), str):
+        ensure_currency_supported(db=db, currency=patch["base_currency"])
+
+    previous_currency: Optional[str] = None
+
+    if "base_currency" in patch:
+        lock_user_changes(db=db, user_ids=[user_id])
+        previous_currency = get_user_base_currency(db=db, user_id=user_id)
+
+    preferences = _apply_patch(db=db, user_id=user_id, patch=patch)
+
+    if preferences is None:
+        stored = db.execute(
+            select(User.preferences).where(User.id == user_id).with_for_update()
+        ).one_or_none()
+
+        if stored is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with id {user_id} not found",
+            )
+
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(preferences=upgrade_preferences(stored.preferences))
+            .execution_options(synchronize_session=False)
+        )
+        preferences = _apply_patch(db=db, user_id=user_id, patch=patch)
+
+    try:
+        validate_preferences(preferences)
+    except HTTPException:
+        db.rollback()
+        raise
+
+    base_currency = preferences.get("base_currency") or settings.DEFAULT_CURRENCY
+
+    if previous_currency is not None and base_currency != previous_currency:
+        reconcile_user_spend_counters(db=db, user_id=user_id)
+
+    db.commit()
+
+    _user_preferences.set(user_id, preferences)
+
+    return Preferences.model_validate(preferences)
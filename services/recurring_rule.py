@@ -0,0 +1,348 @@
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core import settings
+from db import add_commit_refresh
+from enums import RecurrenceFrequency, TransactionType
+from models import RecurringRule, Transaction, UserTransaction
+from schemas.transaction import TransactionBase
+from schemas.recurring_rule import (
+    RecurringRuleRequest,
+    RecurringRuleResponse,
+    RecurringRulesResponse,
+    MaterializationResult,
+)
+from services.transaction import get_or_create_transaction
+from services.user_category import get_or_create_user_category
+from services.budget import bulk_apply_spend, month_of
+from services.fx_rate import (
+    convert_amounts,
+    ensure_currency_supported,
+    get_user_base_currency,
+    get_user_base_currencies,
+)
+from services.suggestion import evict_user_suggestions
+from services.categorizer import evict_user_categorizer
+from services.sync import lock_user_changes
+
+RECURRING_LOCK_KEY = 7_210_028
+MAX_OCCURRENCES_PER_RULE = 366
+INSERT_CHUNK_SIZE = 1000
+
+
+def _add_months(day: date, months: int, day_of_month: int) -> date:
+
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+
+    return date(year, month, min(day_of_month, monthrange(year, month)[1]))
+
+
+def next_occurrence(rule: RecurringRule, occurrence: date) -> date:
+
+    day_of_month = rule.day_of_month or rule.start_date.day
+
+    if rule.frequency == RecurrenceFrequency.DAILY:
+        return occurrence + timedelta(days=rule.interval)
+
+    if rule.frequency == RecurrenceFrequency.WEEKLY:
+        return occurrence + timedelta(weeks=rule.interval)
+
+    if rule.frequency == RecurrenceFrequency.MONTHLY:
+        return _add_months(occurrence, rule.interval, day_of_month)
+
+    return _add_months(occurrence, 12 * rule.interval, day_of_month)
+
+
+def first_occurrence(rule: RecurringRule) -> Optional[date]:
+
+    occurrence = rule.start_date
+
+    if rule.frequency in (RecurrenceFrequency.MONTHLY, RecurrenceFrequency.YEARLY):
+        occurrence = _add_months(
+            rule.start_date, 0, rule.day_of_month or rule.start_date.day
+        )
+
+        if occurrence < rule.start_date:
+            occurrence = next_occurrence(rule, occurrence)
+
+    if rule.end_date is not None and occurrence > rule.end_date:
+        return None
+
+    return occurrence
+
+
+def _get_user_recurring_rule(
+    db: Session, user_id: int, recurring_rule_id: int
+) -> RecurringRule:
+
+    rule: RecurringRule | None = RecurringRule.get_one(
+        db, id=recurring_rule_id, user_id=user_id
+    )
+
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recurring rule not found for user with id {user_id}",
+        )
+
+    return rule
+
+
+def read_recurring_rules(db: Session, user_id: int) -> RecurringRulesResponse:
+
+    rules = db.scalars(
+        select(RecurringRule)
+        .where(RecurringRule.user_id == user_id)
+        .order_by(RecurringRule.id)
+    ).all()
+
+    return RecurringRulesResponse(
+        recurring_rules=[RecurringRuleResponse.from_orm_obj(rule) for rule in rules]
+    )
+
+
+def add_recurring_rule(
+    db: Session, user_id: int, recurring_rule_request: RecurringRuleRequest
+) -> RecurringRuleResponse:
+
+    category_id: int | None = None
+
+    if recurring_rule_request.category is not None:
+        category_id = get_or_create_user_category(
+            db=db, user_id=user_id, category_name=recurring_rule_request.category
+        )
+
+    transaction: TransactionBase = TransactionBase(
+        category_id=category_id,
+        **recurring_rule_request.model_dump(include={"type", "title"}),
+    )
+
+    transaction_id = get_or_create_transaction(db=db, transaction=transaction)
+
+    base_currency: str = get_user_base_currency(db=db, user_id=user_id)
+    currency: str = recurring_rule_request.currency or base_currency
+
+    if currency != base_currency:
+        ensure_currency_supported(db=db, currency=currency)
+
+    new_rule = RecurringRule(
+        user_id=user_id,
+        transaction_id=transaction_id,
+        **recurring_rule_request.model_dump(
+            exclude={"type", "title", "category", "currency"}
+        ),
+        currency=currency,
+    )
+    new_rule.next_run_on = first_occurrence(new_rule)
+
+    add_commit_refresh(db, new_rule)
+
+    return RecurringRuleResponse.from_orm_obj(new_rule)
+
+
+def delete_recurring_rule(
+    db: Session, user_id: int, recurring_rule_id: int
+) -> RecurringRuleResponse:
+
+    rule = _get_user_recurring_rule(
+        db=db, user_id=user_id, recurring_rule_id=recurring_rule_id
+    )
+
+    deleted_rule = RecurringRuleResponse.from_orm_obj(rule)
+
+    db.delete(rule)
+    db.commit()
+
+    return deleted_rule
+
+
+def _plan_rule(rule, today: date) -> tuple[list[date], Optional[date]]:
+
+    occurrences: list[date] = []
+    occurrence: Optional[date] = rule.next_run_on
+
+    while (
+        occurrence is not None
+        and occurrence <= today
+        and len(occurrences) < MAX_OCCURRENCES_PER_RULE
+    ):
+        if rule.end_date is not None and occurrence > rule.end_date:
+            break
+
+        occurrences.append(occurrence)
+        occurrence = next_occurrence(rule, occurrence)
+
+    if occurrence is not None and rule.end_date is not None:
+        if occurrence > rule.end_date:
+            occurrence = None
+
+    return occurrences, occurrence
+
+
+def _convert_spend_deltas(
+    db: Session, spent_rows: list[tuple]
+) -> dict[tuple[int, int, date], Decimal]:
+
+    base_currencies = get_user_base_currencies(
+        db=db, user_ids={rule.user_id for rule, _, _ in spent_rows}
+    )
+
+    rows_by_base: dict[str, list[tuple]] = defaultdict(list)
+    for row in spent_rows:
+        rows_by_base[base_currencies[row[0].user_id]].append(row)
+
+    spend_deltas: dict[tuple[int, int, date], Decimal] = defaultdict(Decimal)
+
+    for base_currency, group in rows_by_base.items():
+        converted = convert_amounts(
+            db,
+            [amount for _, amount, _ in group],
+            [rule.currency for rule, _, _ in group],
+            [created_at.astimezone(timezone.utc).date() for _, _, created_at in group],
+            base_currency,
+        )
+
+        for (rule, _, created_at), amount in zip(group, converted):
+            spend_deltas[
+                (rule.user_id, rule.category_id, month_of(created_at))
+            ] += amount
+
+    return spend_deltas
+
+
+def materialize_due_occurrences(
+    db: Session, today: Optional[date] = None, batch_size: Optional[int] = None
+) -> MaterializationResult:
+
+    today = today or datetime.now(timezone.utc).date()
+    batch_size = batch_size or settings.RECURRING_BATCH_SIZE
+
+    result = MaterializationResult(rules=0, inserted=0, skipped=0, locked=False)
+    affected_user_ids: set[int] = set()
+    last_rule_id = 0
+
+    while True:
+        if not db.scalar(select(func.pg_try_advisory_xact_lock(RECURRING_LOCK_KEY))):
+            db.rollback()
+            result.locked = True
+            break
+
+        rules = db.execute(
+            select(
+                RecurringRule.id,
+                RecurringRule.user_id,
+                RecurringRule.transaction_id,
+                RecurringRule.amount,
+                RecurringRule.currency,
+                RecurringRule.details,
+                RecurringRule.frequency,
+                RecurringRule.interval,
+                RecurringRule.day_of_month,
+                RecurringRule.start_date,
+                RecurringRule.end_date,
+                RecurringRule.next_run_on,
+                RecurringRule.last_run_on,
+                Transaction.category_id,
+                Transaction.type,
+            )
+            .join(Transaction, Transaction.id == RecurringRule.transaction_id)
+            .where(
+                RecurringRule.next_run_on <= today,
+                RecurringRule.id > last_rule_id,
+            )
+            .order_by(RecurringRule.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True, of=RecurringRule)
+        ).all()
+
+        if not rules:
+            db.rollback()
+            break
+
+        rows: list[dict] = []
+        rule_updates: list[dict] = []
+
+        for rule in rules:
+            occurrences, next_run_on = _plan_rule(rule, today)
+
+            rows.extend(
+                {
+                    "user_id": rule.user_id,
+                    "transaction_id": rule.transaction_id,
+                    "amount": rule.amount,
+                    "currency": rule.currency,
+                    "details": rule.details,
+                    "created_at": datetime.combine(occurrence, time.min, timezone.utc),
+                    "recurring_rule_id": rule.id,
+                }
+                for occurrence in occurrences
+            )
+            rule_updates.append(
+                {
+                    "id": rule.id,
+                    "next_run_on": next_run_on,
+                    "last_run_on": occurrences[-1] if occurrences else rule.last_run_on,
+                }
+            )
+
+        rules_by_id = {rule.id: rule for rule in rules}
+        spent_rows: list[tuple] = []
+
+        lock_user_changes(db=db, user_ids={rule.user_id for rule in rules})
+
+        inserted = 0
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            inserted_rows = db.execute(
+                insert(UserTransaction)
+                .values(rows[start : start + INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(
+                    index_elements=["recurring_rule_id", "created_at"],
+                    index_where=UserTransaction.recurring_rule_id.isnot(None),
+                )
+                .returning(
+                    UserTransaction.recurring_rule_id,
+                    UserTransaction.amount,
+                    UserTransaction.created_at,
+                )
+            ).all()
+
+            inserted += len(inserted_rows)
+
+            for recurring_rule_id, amount, created_at in inserted_rows:
+                rule = rules_by_id[recurring_rule_id]
+                affected_user_ids.add(rule.user_id)
+
+                if (
+                    rule.category_id is not None
+                    and rule.type == TransactionType.EXPENSE
+                ):
+                    spent_rows.append((rule, amount, created_at))
+
+        spend_deltas = _convert_spend_deltas(db=db, spent_rows=spent_rows)
+
+        bulk_apply_spend(db=db, deltas=spend_deltas)
+        db.execute(update(RecurringRule), rule_updates)
+        db.commit()
+
+        result.rules += len(rules)
+        result.inserted += inserted
+        result.skipped += len(rows) - inserted
+        last_rule_id = rules[-1].id
+
+        if len(rules) < batch_size:
+            break
+
+    for user_id in affected_user_ids:
+        evict_user_suggestions(user_id=user_id)
+        evict_user_categorizer(user_id=user_id)
+
+    return result
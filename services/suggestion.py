@@ -0,0 +1,202 @@
+import heapq
+from bisect import bisect_left
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Literal
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session
+
+from core import settings, LRUCache
+from models import Category, Transaction, UserCategory, UserTransaction
+from schemas.user_transaction import SuggestionsResponse
+
+SuggestionOrder = Literal["frequency", "recent"]
+
+_NEVER_USED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class PrefixIndex:
+    """Case-insensitive prefix index kept as a sorted array of keys."""
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._entries: dict[str, list] = {}
+
+    def add(self, term: str, last_used: datetime | None, count: int = 1) -> None:
+        key = term.casefold()
+        last_used = last_used or _NEVER_USED
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._keys.insert(bisect_left(self._keys, key), key)
+            self._entries[key] = [term, count, last_used]
+            return
+
+        entry[0] = term
+        entry[1] += count
+        entry[2] = max(entry[2], last_used)
+
+    def remove(self, term: str, count: int = 1, keep_empty: bool = False) -> None:
+        key = term.casefold()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        entry[1] = max(entry[1] - count, 0)
+
+        if entry[1] == 0 and not keep_empty:
+            self.discard(term)
+
+    def discard(self, term: str) -> None:
+        key = term.casefold()
+
+        if self._entries.pop(key, None) is None:
+            return
+
+        del self._keys[bisect_left(self._keys, key)]
+
+    def search(self, prefix: str, limit: int, order_by: SuggestionOrder) -> list[str]:
+        prefix = prefix.casefold()
+
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", lo=start)
+
+        if order_by == "recent":
+            rank = lambda key: (self._entries[key][2], self._entries[key][1])
+        else:
+            rank = lambda key: (self._entries[key][1], self._entries[key][2])
+
+        best = heapq.nlargest(limit, self._keys[start:end], key=rank)
+
+        return [self._entries[key][0] for key in best]
+
+
+class UserSuggestionIndex:
+
+    def __init__(self):
+        self.titles = PrefixIndex()
+        self.categories = PrefixIndex()
+        self.lock = Lock()
+
+
+_user_indexes = LRUCache(maxsize=settings.SUGGESTION_CACHE_SIZE)
+
+
+def _build_user_index(db: Session, user_id: int) -> UserSuggestionIndex:
+
+    index = UserSuggestionIndex()
+
+    title_rows = db.execute(
+        select(
+            Transaction.title,
+            func.count(UserTransaction.id),
+            func.max(UserTransaction.created_at),
+        )
+        .join(UserTransaction, UserTransaction.transaction_id == Transaction.id)
+        .where(UserTransaction.user_id == user_id)
+        .group_by(Transaction.title)
+    ).all()
+
+    for title, count, last_used in title_rows:
+        index.titles.add(title, last_used, count)
+
+    category_rows = db.execute(
+        select(
+            Category.name,
+            func.count(UserTransaction.id),
+            func.max(UserTransaction.created_at),
+        )
+        .join(UserCategory, UserCategory.category_id == Category.id)
+        .outerjoin(Transaction, Transaction.category_id == Category.id)
+        .outerjoin(
+            UserTransaction,
+            and_(
+                UserTransaction.transaction_id == Transaction.id,
+                UserTransaction.user_id == user_id,
+            ),
+        )
+        .where(UserCategory.user_id == user_id)
+        .group_by(Category.name)
+    ).all()
+
+    for name, count, last_used in category_rows:
+        index.categories.add(name, last_used, count)
+
+    return index
+
+
+def read_suggestions(
+    db: Session,
+    user_id: int,
+    prefix: str,
+    limit: int = 10,
+    order_by: SuggestionOrder = "frequency",
+) -> SuggestionsResponse:
+
+    index: UserSuggestionIndex = _user_indexes.get_or_set(
+        user_id, lambda: _build_user_index(db=db, user_id=user_id)
+    )
+
+    with index.lock:
+        return SuggestionsResponse(
+            titles=index.titles.search(prefix, limit, order_by),
+            categories=index.categories.search(prefix, limit, order_by),
+        )
+
+
+def record_transaction_suggestion(
+    user_id: int, title: str, category: str | None, used_at: datetime
+) -> None:
+
+    index: UserSuggestionIndex | None = _user_indexes.get(user_id)
+
+    if index is None:
+        return
+
+    with index.lock:
+        index.titles.add(title, used_at)
+        if category:
+            index.categories.add(category, used_at)
+
+
+def forget_transaction_suggestion(
+    user_id: int, title: str, category: str | None
+) -> None:
+
+    index: UserSuggestionIndex | None = _user_indexes.get(user_id)
+
+    if index is None:
+        return
+
+    with index.lock:
+        index.titles.remove(title)
+        if category:
+            index.categories.remove(category, keep_empty=True)
+
+
+def record_category_suggestion(user_id: int, category: str) -> None:
+
+    index: UserSuggestionIndex | None = _user_indexes.get(user_id)
+
+    if index is None:
+        return
+
+    with index.lock:
+        index.categories.add(category, None, count=0)
+
+
+def forget_category_suggestion(user_id: int, category: str) -> None:
+
+    index: UserSuggestionIndex | None = _user_indexes.get(user_id)
+
+    if index is None:
+        return
+
+    with index.lock:
+        index.categories.discard(category)
+
+
+def evict_user_suggestions(user_id: int) -> None:
+    _user_indexes.pop(user_id)
@@ -0,0 +1,145 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session, lazyload
+
+from core import settings
+from models import User, UserTransaction, UserTransactionTombstone
+from schemas.sync import SyncDeletion, SyncOperationResult, SyncResponse
+from schemas.user_transaction import UserTransactionResponse
+
+
+def lock_user_changes(db: Session, user_ids: Iterable[int]) -> None:
+    """Hold off other writes to the users' transactions until commit.
+
+    Every write takes the next value of ``user_transaction_sync_seq``; with
+    the lock held, a user's values become visible in increasing order, so a
+    cursor never skips a change committed after it was read.
+    """
+
+    db.execute(
+        select(User.id)
+        .where(User.id.in_(sorted(set(user_ids))))
+        .order_by(User.id)
+        .with_for_update(key_share=True)
+    )
+
+
+def record_tombstone(db: Session, user_transaction: UserTransaction) -> None:
+
+    db.add(
+        UserTransactionTombstone(
+            user_transaction_id=user_transaction.id,
+            user_id=user_transaction.user_id,
+            client_id=user_transaction.client_id,
+        )
+    )
+
+
+def record_tombstones(
+    db: Session, user_id: int, deleted: Iterable[tuple[int, Optional[UUID]]]
+) -> None:
+    """Tombstones for ``(id, client_id)`` pairs of deleted rows, in one
+    statement."""
+
+    rows = [
+        {"user_transaction_id": id, "user_id": user_id, "client_id": client_id}
+        for id, client_id in deleted
+    ]
+
+    if rows:
+        db.execute(insert(UserTransactionTombstone), rows)
+
+
+def find_user_transaction(
+    db: Session, user_id: int, id: Optional[int], client_id: Optional[UUID]
+) -> Optional[UserTransaction]:
+    """The user's transaction by server id, or by client id without one."""
+
+    query = (
+        select(UserTransaction)
+        .options(lazyload(UserTransaction.user))
+        .where(UserTransaction.user_id == user_id)
+    )
+
+    if id is not None:
+        query = query.where(UserTransaction.id == id)
+    else:
+        query = query.where(UserTransaction.client_id == client_id)
+
+    return db.scalars(query.limit(1)).first()
+
+
+def find_tombstone(
+    db: Session, user_id: int, id: Optional[int], client_id: Optional[UUID]
+) -> Optional[UserTransactionTombstone]:
+
+    query = select(UserTransactionTombstone).where(
+        UserTransactionTombstone.user_id == user_id
+    )
+
+    if id is not None:
+        query = query.where(UserTransactionTombstone.user_transaction_id == id)
+    else:
+        query = query.where(UserTransactionTombstone.client_id == client_id)
+
+    return db.scalars(query.limit(1)).first()
+
+
+def read_sync_changes(
+    db: Session,
+    user_id: int,
+    cursor: Optional[int],
+    results: list[SyncOperationResult],
+) -> SyncResponse:
+    """Writes and deletions after ``cursor`` in sync order, at most
+    SYNC_CHANGES_LIMIT of them; without a cursor, every live transaction."""
+
+    limit = settings.SYNC_CHANGES_LIMIT
+    after = cursor or 0
+
+    rows = db.scalars(
+        select(UserTransaction)
+        .options(lazyload(UserTransaction.user))
+        .where(UserTransaction.user_id == user_id, UserTransaction.sync_seq > after)
+        .order_by(UserTransaction.sync_seq)
+        .limit(limit + 1)
+    ).all()
+
+    tombstones = []
+
+    if cursor is not None:
+        tombstones = db.execute(
+            select(
+                UserTransactionTombstone.user_transaction_id,
+                UserTransactionTombstone.client_id,
+                UserTransactionTombstone.sync_seq,
+            )
+            .where(
+                UserTransactionTombstone.user_id == user_id,
+                UserTransactionTombstone.sync_seq > after,
+            )
+            .order_by(UserTransactionTombstone.sync_seq)
+            .limit(limit + 1)
+        ).all()
+
+    feed = sorted([*rows, *tombstones], key=lambda change: change.sync_seq)
+    has_more = len(feed) > limit
+    feed = feed[:limit]
+
+    return SyncResponse(
+        results=results,
+        changes=[
+            UserTransactionResponse.from_orm_obj(change)
+            for change in feed
+            if isinstance(change, UserTransaction)
+        ],
+        deleted=[
+            SyncDeletion(id=change.user_transaction_id, client_id=change.client_id)
+            for change in feed
+            if not isinstance(change, UserTransaction)
+        ],
+        cursor=feed[-1].sync_seq if feed else after,
+        has_more=has_more,
+    )
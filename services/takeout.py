@@ -0,0 +1,452 @@
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import zipfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO, Callable, Iterator, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select, update, func
+from sqlalchemy.orm import Session
+
+from core import settings
+from db import get_db
+from enums import JobStatus
+from models import (
+    Attachment,
+    Budget,
+    Category,
+    Job,
+    RecurringRule,
+    Transaction,
+    User,
+    UserCategory,
+    UserTransaction,
+)
+from services.job import complete_job, fail_job, renew_job_lease
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+TAKEOUT_JOB = "user_takeout"
+TAKEOUT_FILENAME = "takeout.zip"
+TAKEOUT_MEDIA_TYPE = "application/zip"
+TAKEOUT_LOCK_NAMESPACE = 7_210_045
+
+_END = object()
+
+
+def takeout_etag(job_id: int) -> str:
+    return f'"takeout-{job_id}"'
+
+
+def _json_default(value: Any) -> Any:
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+
+    if isinstance(value, Enum):
+        return value.value
+
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _takeout_tables(user_id: int) -> list[tuple[str, Select]]:
+    """NDJSON entries of the archive and the query behind each one."""
+
+    template = (Transaction.type, Transaction.title, Category.name.label("category"))
+
+    return [
+        (
+            "user.ndjson",
+            # Password hashes and OAuth tokens are credentials, not user data.
+            select(User.id, User.name, User.email, User.preferences).where(
+                User.id == user_id
+            ),
+        ),
+        (
+            "categories.ndjson",
+            select(Category.id, Category.name)
+            .join(UserCategory, UserCategory.category_id == Category.id)
+            .where(UserCategory.user_id == user_id)
+            .order_by(Category.id),
+        ),
+        (
+            "transactions.ndjson",
+            select(
+                UserTransaction.id,
+                UserTransaction.client_id,
+                *template,
+                UserTransaction.amount,
+                UserTransaction.currency,
+                UserTransaction.details,
+                UserTransaction.attachments,
+                UserTransaction.recurring_rule_id,
+                UserTransaction.version,
+                UserTransaction.created_at,
+                UserTransaction.updated_at,
+            )
+            .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(UserTransaction.user_id == user_id)
+            .order_by(UserTransaction.created_at, UserTransaction.id),
+        ),
+        (
+            "budgets.ndjson",
+            select(
+                Budget.id,
+                Category.name.label("category"),
+                Budget.amount,
+                Budget.created_at,
+                Budget.updated_at,
+            )
+            .join(Category, Category.id == Budget.category_id)
+            .where(Budget.user_id == user_id)
+            .order_by(Budget.id),
+        ),
+        (
+            "recurring_rules.ndjson",
+            select(
+                RecurringRule.id,
+                *template,
+                RecurringRule.amount,
+                RecurringRule.currency,
+                RecurringRule.details,
+                RecurringRule.frequency,
+                RecurringRule.interval,
+                RecurringRule.day_of_month,
+                RecurringRule.start_date,
+                RecurringRule.end_date,
+                RecurringRule.next_run_on,
+                RecurringRule.last_run_on,
+                RecurringRule.created_at,
+            )
+            .join(Transaction, Transaction.id == RecurringRule.transaction_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(RecurringRule.user_id == user_id)
+            .order_by(RecurringRule.id),
+        ),
+        (
+            "attachments.ndjson",
+            select(
+                Attachment.id,
+                Attachment.user_transaction_id,
+                Attachment.filename,
+                Attachment.content_type,
+                Attachment.size,
+                Attachment.sha256,
+                Attachment.created_at,
+            )
+            .where(Attachment.user_id == user_id)
+            .order_by(Attachment.id),
+        ),
+    ]
+
+
+def _attachment_path(attachment_id: int, filename: str) -> str:
+
+    name = PurePosixPath(filename.replace("\\", "/")).name
+
+    if name in ("", ".", ".."):
+        name = "file"
+
+    return f"attachments/{attachment_id}/{name}"
+
+
+def write_takeout(
+    db: Session,
+    user_id: int,
+    archive: zipfile.ZipFile,
+    heartbeat: Optional[Callable[[], None]] = None,
+) -> None:
+    """Write the user's rows as NDJSON, then their attachment files, calling
+    ``heartbeat`` after each.
+
+    Rows come from server-side cursors and files from storage in chunks, so
+    neither a table nor a file is ever held in memory whole.
+    """
+
+    heartbeat = heartbeat or (lambda: None)
+
+    fetch = {"yield_per": settings.TAKEOUT_FETCH_SIZE}
+
+    for name, query in _takeout_tables(user_id):
+        with archive.open(name, "w", force_zip64=True) as entry:
+            for row in db.execute(query.execution_options(**fetch)):
+                line = json.dumps(row._asdict(), default=_json_default)
+                entry.write(line.encode() + b"\n")
+
+        heartbeat()
+
+    storage = get_storage()
+
+    attachments = db.execute(
+        select(Attachment.id, Attachment.filename, Attachment.sha256, Attachment.size)
+        .where(Attachment.user_id == user_id)
+        .order_by(Attachment.id)
+        .execution_options(**fetch)
+    )
+
+    for attachment in attachments:
+        path = _attachment_path(attachment.id, attachment.filename)
+
+        with archive.open(path, "w", force_zip64=True) as entry:
+            if attachment.size:
+                for chunk in storage.iter_range(
+                    attachment.sha256, 0, attachment.size - 1
+                ):
+                    entry.write(chunk)
+
+        heartbeat()
+
+
+class _TakeoutTee:
+    """Write-only file for ZipFile that copies the archive into the upload of
+    the cached copy and, while the client is still reading, onto its queue."""
+
+    def __init__(self, chunk_size: int, upload: Optional[BinaryIO] = None):
+        self.upload = upload
+        self.chunk_size = chunk_size
+        self.chunks: queue.Queue = queue.Queue(maxsize=settings.TAKEOUT_QUEUE_CHUNKS)
+        self.detached = threading.Event()
+        self.buffer = bytearray()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+
+        self.buffer += data
+
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+        return len(data)
+
+    def flush(self) -> None:
+
+        if not self.buffer:
+            return
+
+        chunk = bytes(self.buffer)
+        self.buffer.clear()
+
+        self.upload.write(chunk)
+        self.size += len(chunk)
+        self.send(chunk)
+
+    def send(self, item: Any) -> None:
+        """Queue ``item`` for the client; a client that stopped reading is
+        dropped so it no longer holds up the cached copy."""
+
+        deadline = time.monotonic() + settings.TAKEOUT_CLIENT_TIMEOUT_SECONDS
+
+        while not self.detached.is_set():
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                if time.monotonic() > deadline:
+                    self.detached.set()
+
+    def __iter__(self) -> Iterator[bytes]:
+
+        try:
+            while True:
+                item = self.chunks.get()
+
+                if item is _END:
+                    return
+
+                if isinstance(item, BaseException):
+                    raise item
+
+                yield item
+        finally:
+            self.detached.set()
+
+
+def _build_takeout(user_id: int, job_id: int, key: str, tee: _TakeoutTee) -> None:
+
+    storage = get_storage()
+    read_fd, write_fd = os.pipe()
+    upload_errors: list[BaseException] = []
+
+    def upload() -> None:
+        with os.fdopen(read_fd, "rb") as reader:
+            try:
+                storage.put(key, reader)
+            except BaseException as exc:
+                upload_errors.append(exc)
+
+    uploader = threading.Thread(target=upload, name=f"takeout-{job_id}", daemon=True)
+    uploader.start()
+
+    renewed_at = time.monotonic()
+
+    def heartbeat() -> None:
+        """Keep the job's lease fresh so it is not expired mid-build; stop
+        the build once the job was finished elsewhere."""
+
+        nonlocal renewed_at
+
+        if time.monotonic() - renewed_at < settings.TAKEOUT_LEASE_RENEW_SECONDS:
+            return
+
+        with get_db() as db:
+            if not renew_job_lease(db=db, job_id=job_id):
+                raise RuntimeError(f"Takeout {job_id} is no longer running")
+
+        renewed_at = time.monotonic()
+
+    try:
+        with os.fdopen(write_fd, "wb") as writer:
+            tee.upload = writer
+
+            with get_db() as db:
+                with zipfile.ZipFile(tee, "w", zipfile.ZIP_DEFLATED) as archive:
+                    write_takeout(
+                        db=db, user_id=user_id, archive=archive, heartbeat=heartbeat
+                    )
+                tee.flush()
+
+        uploader.join()
+
+        if upload_errors:
+            raise upload_errors[0]
+
+        with get_db() as db:
+            completed = complete_job(
+                db=db,
+                job_id=job_id,
+                result={
+                    "storage_key": key,
+                    "filename": TAKEOUT_FILENAME,
+                    "media_type": TAKEOUT_MEDIA_TYPE,
+                    "size": tee.size,
+                },
+                only_running=True,
+            )
+
+        # The user was deleted, or the job failed, while the archive was
+        # built; nothing refers to the stored copy any more.
+        if not completed:
+            storage.delete(key)
+    except Exception as exc:
+        logger.exception("Takeout %s for user %s failed", job_id, user_id)
+        uploader.join()
+        storage.delete(key)
+
+        with get_db() as db:
+            fail_job(
+                db=db,
+                job_id=job_id,
+                attempts=1,
+                max_attempts=1,
+                error=f"{type(exc).__name__}: {exc}",
+                only_running=True,
+            )
+
+        tee.send(exc)
+    else:
+        tee.send(_END)
+
+
+def stream_takeout(db: Session, user_id: int) -> tuple[int, Iterator[bytes]]:
+    """Start building the user's archive and return its job id and a stream
+    of its bytes.
+
+    The archive is built once, in a background thread, and written to storage
+    as it goes; the stored copy is what Range requests resume from. It is
+    finished even if the client disconnects.
+    """
+
+    # Held until the job row is committed, so a concurrent request sees it.
+    db.execute(select(func.pg_advisory_xact_lock(TAKEOUT_LOCK_NAMESPACE, user_id)))
+
+    running = (
+        Job.user_id == user_id,
+        Job.kind == TAKEOUT_JOB,
+        Job.status == JobStatus.RUNNING,
+    )
+
+    # Builds renew their lease as they go; one that stopped died with its
+    # process and would otherwise block every later export.
+    db.execute(
+        update(Job)
+        .where(
+            *running,
+            Job.locked_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        )
+        .values(
+            status=JobStatus.FAILED,
+            last_error="Takeout build stopped renewing its lease",
+            locked_by=None,
+            finished_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    busy = db.scalar(select(Job.id).where(*running).limit(1))
+
+    if busy is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export {busy} is still being prepared",
+        )
+
+    job = Job(
+        kind=TAKEOUT_JOB,
+        user_id=user_id,
+        payload={},
+        status=JobStatus.RUNNING,
+        attempts=1,
+        max_attempts=1,
+        locked_by=f"takeout:{socket.gethostname()}:{os.getpid()}",
+        locked_at=func.now(),
+    )
+    db.add(job)
+    db.commit()
+
+    job_id = job.id
+    tee = _TakeoutTee(chunk_size=get_storage().chunk_size)
+
+    threading.Thread(
+        target=_build_takeout,
+        args=(user_id, job_id, f"takeout-{job_id}.zip", tee),
+        name=f"takeout-build-{job_id}",
+        daemon=True,
+    ).start()
+
+    return job_id, iter(tee)
+
+
+def find_takeout(db: Session, user_id: int, if_range: Optional[str]) -> Optional[Job]:
+    """The stored archive a Range request resumes: the one ``If-Range``
+    names, or the latest without it."""
+
+    query = select(Job).where(
+        Job.user_id == user_id,
+        Job.kind == TAKEOUT_JOB,
+        Job.status == JobStatus.SUCCEEDED,
+    )
+
+    if if_range is not None:
+        tag = if_range.strip().removeprefix("W/").strip('"')
+        job_id = tag.removeprefix("takeout-")
+
+        if not tag.startswith("takeout-") or not job_id.isdigit():
+            return None
+
+        query = query.where(Job.id == int(job_id))
+
+    return db.scalars(query.order_by(Job.id.desc()).limit(1)).first()
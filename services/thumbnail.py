@@ -0,0 +1,60 @@
+import io
+import logging
+import tempfile
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core import settings
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+def thumbnail_key(sha256: str, size: int) -> str:
+    return f"{sha256}.thumb{size}.jpg"
+
+
+def render_thumbnails(sha256: str, byte_size: int, sizes: list[int]) -> list[int]:
+    """Write JPEG thumbnails of a stored image; returns the sizes produced.
+
+    Runs in a worker process. Non-image content yields an empty list.
+    """
+
+    storage = get_storage()
+    sizes = sorted(sizes, reverse=True)
+
+    missing = [
+        size for size in sizes if not storage.exists(thumbnail_key(sha256, size))
+    ]
+    if not missing:
+        return sizes
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as original:
+        # Stream the original in chunks; Pillow needs a seekable file.
+        for chunk in storage.iter_range(sha256, 0, byte_size - 1):
+            original.write(chunk)
+        original.seek(0)
+
+        try:
+            image = Image.open(original)
+            # Let JPEG decode directly at a reduced scale close to the largest
+            # requested size instead of decoding the full-resolution image.
+            image.draft("RGB", (missing[0], missing[0]))
+            image = ImageOps.exif_transpose(image).convert("RGB")
+        except (UnidentifiedImageError, OSError):
+            logger.info("Attachment %s is not a decodable image", sha256)
+            return []
+
+        for size in missing:
+            # Sizes are descending, so each step shrinks the previous result.
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=settings.THUMBNAIL_QUALITY)
+            buffer.seek(0)
+
+            storage.put(thumbnail_key(sha256, size), buffer)
+
+    return sizes
@@ -1,10 +1,9 @@
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from fastapi import HTTPException, status
 
-from db import add_commit_refresh
-
 from models import Transaction
 from schemas.transaction import TransactionsResponse, TransactionBase
 
@@ -22,20 +21,34 @@ def read_transactions(db: Session) -> TransactionsResponse:
     return TransactionsResponse(transactions=list(transactions))
 
 
-def get_or_create_transaction(db: Session, transaction: TransactionBase) -> int:
+def get_or_create_transaction(
+    db: Session, transaction: TransactionBase, commit: bool = True
+) -> int:
+    """Id of the shared template matching ``transaction``, inserting it when
+    missing. Only ids are read, so the cost does not depend on how many users
+    share the template."""
 
-    existing_transaction = Transaction.get_one(
-        db,
-        type=transaction.type,
-        title=transaction.title,
-        category_id=transaction.category_id,
-    )
+    values = transaction.model_dump()
+    matching = select(Transaction.id).filter_by(**values)
+
+    transaction_id: int | None = db.scalar(matching)
 
-    if existing_transaction:
-        return existing_transaction.id
+    if transaction_id is not None:
+        return transaction_id
+
+    # A concurrent request may insert the same template between the two
+    # statements; the conflict leaves its row to be read back.
+    transaction_id = db.scalar(
+        insert(Transaction)
+        .values(**values)
+        .on_conflict_do_nothing(constraint="uq_type_title_category")
+        .returning(Transaction.id)
+    )
 
-    new_transaction = Transaction(**transaction.model_dump())
+    if transaction_id is None:
+        transaction_id = db.scalar(matching)
 
-    add_commit_refresh(db, new_transaction)
+    if commit:
+        db.commit()
 
-    return new_transaction.id
+    return transaction_id
@@ -1,13 +1,43 @@
+import hashlib
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, exists, Row
+from sqlalchemy.orm import Session, lazyload
+
+from core import settings
 
 from db import add_commit_refresh
 
-from models import User
+from enums import JobStatus
+from models import Job, User
+from schemas.job import JobResponse
 from schemas.user import UserCreateRequest, UserResponse, UserUpdateRequest
 from auth import get_password_hash, verify_password
+from services.suggestion import evict_user_suggestions
+from services.categorizer import evict_user_categorizer
+from services.job import enqueue_job
+from services.budget import reconcile_user_spend_counters
+from services.fx_rate import ensure_currency_supported, get_user_base_currency
+from services.sync import lock_user_changes
+from services.preferences import (
+    evict_user_preferences,
+    upgrade_preferences,
+    validate_preferences,
+)
+from storage import get_storage
+
+DELETE_USER_JOB = "delete_user"
+
+# What UserResponse shows; profile reads select only these.
+PROFILE_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.hashed_password,
+    User.google_auth,
+    User.preferences,
+)
 
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
@@ -23,9 +53,12 @@ def get_user(db: Session, user_id: int) -> Optional[User]:
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+def authenticate_user(db: Session, email: str, password: str) -> Row | str:
+    """The ``id`` of the user if the password matches, or why it does not."""
 
-    user: User | None = User.get_one(db, email=email)
+    user: Row | None = db.execute(
+        select(User.id, User.hashed_password).where(User.email == email)
+    ).one_or_none()
 
     if not user:
         return "Incorrect email"
@@ -37,15 +70,34 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
 
 
 def read_user(db: Session, user_id: int) -> UserResponse:
+    """The profile columns of the user, without loading the User object and
+    its eager relationships."""
+
+    user: Row | None = db.execute(
+        select(*PROFILE_COLUMNS).where(User.id == user_id)
+    ).one_or_none()
 
-    user = get_user(db=db, user_id=user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found",
+        )
 
     return UserResponse.model_validate(user)
 
 
+def profile_etag(user: UserResponse) -> str:
+
+    digest = hashlib.sha256(user.model_dump_json().encode()).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+
 def create_user(db: Session, user_create_request: UserCreateRequest) -> UserResponse:
 
-    is_email_exist = User.get_one(db, email=user_create_request.email)
+    is_email_exist: bool = db.scalar(
+        select(exists().where(User.email == user_create_request.email))
+    )
 
     if is_email_exist:
         return "Email already exist"
@@ -60,6 +112,11 @@ def create_user(db: Session, user_create_request: UserCreateRequest) -> UserResp
             user_create_request.password
         )
 
+    if new_user_data.get("preferences") is not None:
+        new_user_data["preferences"] = validate_preferences(
+            upgrade_preferences(new_user_data["preferences"])
+        )
+
     new_user: User = User(**new_user_data)
 
     add_commit_refresh(db, new_user)
@@ -67,24 +124,119 @@ def create_user(db: Session, user_create_request: UserCreateRequest) -> UserResp
     return UserResponse.model_validate(new_user)
 
 
+def _delete_user_rows(db: Session, user_id: int) -> bool:
+    """Delete the user row and commit; the foreign keys cascade to everything
+    the user owns, so no child rows are loaded."""
+
+    # Jobs go with the user, and with them the only reference to the exports
+    # and takeouts they stored, so the files are removed first.
+    results = db.scalars(
+        select(Job.result).where(
+            Job.user_id == user_id,
+            Job.status == JobStatus.SUCCEEDED,
+            Job.result.has_key("storage_key"),
+        )
+    ).all()
+
+    storage = get_storage()
+
+    for result in results:
+        storage.delete(result["storage_key"])
+
+    deleted: int = db.execute(
+        delete(User)
+        .where(User.id == user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Templates and categories only this user had are left for the batched
+    # orphan collector.
+    if deleted and not db.scalar(
+        select(
+            exists().where(
+                Job.kind == "collect_orphans", Job.status == JobStatus.QUEUED
+            )
+        )
+    ):
+        enqueue_job(db=db, kind="collect_orphans", commit=False)
+
+    db.commit()
+
+    evict_user_suggestions(user_id=user_id)
+    evict_user_categorizer(user_id=user_id)
+    evict_user_preferences(user_id=user_id)
+
+    return bool(deleted)
+
+
 def delete_user(db: Session, user_id: int) -> UserResponse:
 
-    user: User | None = get_user(db=db, user_id=user_id)
+    user: User | None = db.scalar(
+        select(User).options(lazyload("*")).where(User.id == user_id)
+    )
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found",
+        )
 
     deleted_user = UserResponse.model_validate(user)
 
-    db.delete(user)
-    db.commit()
+    _delete_user_rows(db=db, user_id=user_id)
 
     return deleted_user
 
 
+def delete_user_account(db: Session, user_id: int) -> dict:
+    """Body of a background deletion; a user already gone counts as done."""
+
+    return {"deleted": _delete_user_rows(db=db, user_id=user_id)}
+
+
+def request_user_deletion(db: Session, user_id: int) -> JobResponse:
+    """Queue deletion of the user for a background worker, or return the
+    deletion already queued."""
+
+    job: Job | None = db.scalar(
+        select(Job).where(
+            Job.kind == DELETE_USER_JOB,
+            Job.payload["user_id"].as_integer() == user_id,
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+        )
+    )
+
+    # Not owned by the user, so the job outlives the row it deletes.
+    if job is None:
+        job = enqueue_job(db=db, kind=DELETE_USER_JOB, payload={"user_id": user_id})
+
+    return JobResponse.model_validate(job)
+
+
+def read_user_deletion(db: Session, job_id: int, user_id: int) -> JobResponse:
+    """The user's deletion job; other users' jobs are reported as missing."""
+
+    job: Job | None = db.scalar(
+        select(Job).where(
+            Job.id == job_id,
+            Job.kind == DELETE_USER_JOB,
+            Job.payload["user_id"].as_integer() == user_id,
+        )
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Deletion job {job_id} not found",
+        )
+
+    return JobResponse.model_validate(job)
+
+
 def update_user(
     db: Session, user_id: int, user_update_request: UserUpdateRequest
 ) -> UserResponse:
 
-    user: User | None = get_user(db=db, user_id=user_id)
-
     update_data = user_update_request.model_dump(exclude_unset=True, exclude_none=True)
 
     if update_data.get("password"):
@@ -93,10 +245,45 @@ def update_user(
     if user_update_request.password:
         update_data["hashed_password"] = get_password_hash(user_update_request.password)
 
-    for field, value in update_data.items():
-        setattr(user, field, value)
+    previous_currency: Optional[str] = None
+    base_currency: Optional[str] = None
+
+    if "preferences" in update_data:
+        update_data["preferences"] = validate_preferences(
+            upgrade_preferences(update_data["preferences"])
+        )
+
+        lock_user_changes(db=db, user_ids=[user_id])
+        previous_currency = get_user_base_currency(db=db, user_id=user_id)
+        base_currency = (
+            update_data["preferences"].get("base_currency") or settings.DEFAULT_CURRENCY
+        )
+
+        if base_currency != previous_currency:
+            ensure_currency_supported(db=db, currency=base_currency)
+
+    if not update_data:
+        return read_user(db=db, user_id=user_id)
+
+    user: Row | None = db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_data)
+        .returning(*PROFILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found",
+        )
+
+    if base_currency != previous_currency:
+        reconcile_user_spend_counters(db=db, user_id=user_id)
 
     db.commit()
-    db.refresh(user)
+
+    evict_user_preferences(user_id=user_id)
 
     return UserResponse.model_validate(user)
@@ -1,73 +1,345 @@
+from decimal import Decimal
+from typing import Optional
+
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    func,
+    cast,
+    case,
+    literal,
+    or_,
+    BigInteger,
+    ColumnElement,
+    Date,
+    Row,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from db import add_commit_refresh
-
-from models import Category, UserCategory
-from schemas.category import CategoriesResponse
+from enums import TransactionType
+from models import Category, Transaction, UserCategory, UserTransaction
+from schemas.category import (
+    CategoriesResponse,
+    CategoryRead,
+    CategoryStats,
+    CategoryStatsResponse,
+)
 from schemas.user_category import UserCategoryResponse
 from services.category import get_or_create_category
-from services.user import get_user
+from services.fx_rate import convert_amounts, get_user_base_currency
+from services.suggestion import record_category_suggestion, forget_category_suggestion
 
 
 def read_user_categories(db: Session, user_id: int) -> CategoriesResponse:
 
-    user = get_user(db=db, user_id=user_id)
+    rows = db.execute(
+        select(
+            Category.id,
+            Category.name,
+            UserCategory.parent_category_id.label("parent_id"),
+        )
+        .join(UserCategory, UserCategory.category_id == Category.id)
+        .where(UserCategory.user_id == user_id)
+        .order_by(Category.name)
+    ).all()
 
     categories: CategoriesResponse = CategoriesResponse(
-        categories=[uc.category for uc in user.categories]
+        categories=[CategoryRead.model_validate(row) for row in rows]
     )
     return categories
 
 
+def read_user_category_stats(db: Session, user_id: int) -> CategoryStatsResponse:
+    """The user's categories with usage totals, most used first.
+
+    One grouped query per (category, type, currency, day) so amounts can be
+    converted at the rate of their day, like the transaction summary.
+    """
+
+    base_currency: str = get_user_base_currency(db=db, user_id=user_id)
+    day = cast(func.timezone("UTC", UserTransaction.created_at), Date)
+
+    usage = (
+        select(
+            Transaction.category_id,
+            Transaction.type,
+            UserTransaction.currency,
+            day.label("day"),
+            func.count(UserTransaction.id).label("count"),
+            func.sum(UserTransaction.amount).label("amount"),
+            func.max(UserTransaction.created_at).label("last_used_at"),
+        )
+        .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+        .where(UserTransaction.user_id == user_id)
+        .group_by(
+            Transaction.category_id, Transaction.type, UserTransaction.currency, day
+        )
+        .subquery()
+    )
+
+    rows = db.execute(
+        select(
+            Category.id,
+            Category.name,
+            UserCategory.parent_category_id.label("parent_id"),
+            usage,
+        )
+        .join(UserCategory, UserCategory.category_id == Category.id)
+        .outerjoin(usage, usage.c.category_id == Category.id)
+        .where(UserCategory.user_id == user_id)
+    ).all()
+
+    used = [row for row in rows if row.count]
+
+    converted = convert_amounts(
+        db,
+        [row.amount for row in used],
+        [row.currency for row in used],
+        [row.day for row in used],
+        base_currency,
+    )
+
+    stats: dict[int, CategoryStats] = {
+        row.id: CategoryStats(
+            id=row.id,
+            name=row.name,
+            parent_id=row.parent_id,
+            transaction_count=0,
+            spent=Decimal("0.00"),
+            income=Decimal("0.00"),
+        )
+        for row in rows
+    }
+
+    for row, amount in zip(used, converted):
+        category = stats[row.id]
+        category.transaction_count += row.count
+
+        if row.type == TransactionType.EXPENSE:
+            category.spent += amount
+        else:
+            category.income += amount
+
+        if category.last_used_at is None or row.last_used_at > category.last_used_at:
+            category.last_used_at = row.last_used_at
+
+    return CategoryStatsResponse(
+        base_currency=base_currency,
+        categories=sorted(
+            stats.values(),
+            key=lambda category: (
+                -category.transaction_count,
+                -(category.last_used_at.timestamp() if category.last_used_at else 0),
+                category.name,
+            ),
+        ),
+    )
+
+
+def get_or_create_user_category(
+    db: Session, user_id: int, category_name: str, commit: bool = True
+) -> int:
+    """With ``commit=False`` new rows are flushed and committed by the caller."""
+
+    category_id: int = get_or_create_category(
+        db=db, user_id=user_id, category_name=category_name, commit=commit
+    )
+
+    linked: int = db.execute(
+        insert(UserCategory)
+        .values(user_id=user_id, category_id=category_id)
+        .on_conflict_do_nothing()
+    ).rowcount
+
+    if linked and commit:
+        db.commit()
+
+    return category_id
+
+
 def add_user_category(
-    db: Session, user_id: int, category_name: str
+    db: Session, user_id: int, category_name: str, parent: Optional[str] = None
 ) -> UserCategoryResponse:
 
-    category_id: int = get_or_create_category(db=db, category_name=category_name)
+    parent_node: Optional[Row] = None
 
-    existing_link = UserCategory.get_one(db,user_id=user_id, category_id=category_id)
+    if parent is not None:
+        parent_node = get_category_node(db=db, user_id=user_id, category_name=parent)
 
-    if existing_link:
+    category_id: int = get_or_create_category(
+        db=db, user_id=user_id, category_name=category_name
+    )
+
+    linked: Optional[Row] = db.execute(
+        insert(UserCategory)
+        .values(
+            user_id=user_id,
+            category_id=category_id,
+            parent_category_id=parent_node.category_id if parent_node else None,
+            path=subtree_prefix(parent_node) if parent_node else "/",
+        )
+        .on_conflict_do_nothing()
+        .returning(
+            UserCategory.user_id,
+            UserCategory.category_id,
+            UserCategory.parent_category_id,
+        )
+    ).one_or_none()
+
+    if linked is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Category '{category_name}' is already linked to this user.",
         )
 
-    new_user_category = UserCategory(user_id=user_id, category_id=category_id)
+    db.commit()
 
-    add_commit_refresh(db, new_user_category)
+    record_category_suggestion(user_id=user_id, category=category_name)
 
-    return UserCategoryResponse.model_validate(new_user_category)
+    return UserCategoryResponse.model_validate(linked)
 
 
-def delete_user_category(db: Session, user_id: int, category_name: str):
+def get_category_node(
+    db: Session, user_id: int, category_name: str, lock: bool = False
+) -> Row:
+    """The user's link to ``category_name`` with its place in their tree."""
 
-    user = get_user(db=db, user_id=user_id)
+    query = (
+        select(
+            UserCategory.category_id,
+            UserCategory.parent_category_id,
+            UserCategory.path,
+        )
+        .join(Category, Category.id == UserCategory.category_id)
+        .where(UserCategory.user_id == user_id, Category.name == category_name)
+    )
+
+    if lock:
+        query = query.with_for_update(of=UserCategory)
 
-    user_category_to_delete: UserCategory | None = None
-    for user_category in user.categories:
-        if user_category.category.name == category_name:
-            user_category_to_delete = user_category
-            break
+    node: Optional[Row] = db.execute(query).one_or_none()
 
-    if not user_category_to_delete:
+    if node is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Category '{category_name}' not linked to user with id {user_id}",
         )
 
-    category: Category = user_category_to_delete.category
+    return node
+
+
+def subtree_prefix(node: Row) -> str:
+    """Path shared by every descendant of ``node``."""
+
+    return f"{node.path}{node.category_id}/"
+
+
+def in_subtree(node: Row) -> ColumnElement[bool]:
+    """Filter for ``node`` and its descendants; with a user_id filter the
+    prefix match uses ix_user_category_user_id_path."""
+
+    return or_(
+        UserCategory.category_id == node.category_id,
+        UserCategory.path.like(f"{subtree_prefix(node)}%"),
+    )
 
-    db.delete(user_category_to_delete)
-    db.flush()
 
-    db.refresh(category)
+def category_subtree(user_id: int, node: Row) -> Select:
+    """Ids of ``node`` and all categories below it in the user's tree."""
+
+    return select(UserCategory.category_id).where(
+        UserCategory.user_id == user_id, in_subtree(node)
+    )
+
+
+def move_user_category(
+    db: Session, user_id: int, category_name: str, parent: Optional[str]
+) -> UserCategoryResponse:
+    """Put ``category_name`` and its subtree under ``parent``, or at the top
+    level without one, rewriting their paths in one UPDATE."""
+
+    node = get_category_node(
+        db=db, user_id=user_id, category_name=category_name, lock=True
+    )
+    parent_id: Optional[int] = None
+    path = "/"
+
+    if parent is not None:
+        parent_node = get_category_node(
+            db=db, user_id=user_id, category_name=parent, lock=True
+        )
 
-    if not category.users:
-        db.delete(category)
+        if parent_node.category_id == node.category_id or parent_node.path.startswith(
+            subtree_prefix(node)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Category '{parent}' is inside '{category_name}'",
+            )
 
+        parent_id, path = parent_node.category_id, subtree_prefix(parent_node)
+
+    db.execute(
+        update(UserCategory)
+        .where(UserCategory.user_id == user_id, in_subtree(node))
+        .values(
+            path=literal(path) + func.substr(UserCategory.path, len(node.path) + 1),
+            parent_category_id=case(
+                (
+                    UserCategory.category_id == node.category_id,
+                    literal(parent_id, BigInteger),
+                ),
+                else_=UserCategory.parent_category_id,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
 
+    return UserCategoryResponse(
+        user_id=user_id, category_id=node.category_id, parent_category_id=parent_id
+    )
+
+
+def unlink_category_node(db: Session, user_id: int, node: Row) -> None:
+    """Remove ``node`` from the user's tree; its subcategories move up to its
+    parent. Not committed."""
+
+    prefix = subtree_prefix(node)
+
+    db.execute(
+        update(UserCategory)
+        .where(UserCategory.user_id == user_id, UserCategory.path.like(f"{prefix}%"))
+        .values(
+            path=literal(node.path) + func.substr(UserCategory.path, len(prefix) + 1),
+            parent_category_id=case(
+                (
+                    UserCategory.parent_category_id == node.category_id,
+                    literal(node.parent_category_id, BigInteger),
+                ),
+                else_=UserCategory.parent_category_id,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(UserCategory).where(
+            UserCategory.user_id == user_id,
+            UserCategory.category_id == node.category_id,
+        )
+    )
+
+
+def delete_user_category(db: Session, user_id: int, category_name: str):
+
+    node = get_category_node(
+        db=db, user_id=user_id, category_name=category_name, lock=True
+    )
+    unlink_category_node(db=db, user_id=user_id, node=node)
+    db.commit()
 
+    forget_category_suggestion(user_id=user_id, category=category_name)
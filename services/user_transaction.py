@@ -1,7 +1,10 @@
 import os
 import csv
-from datetime import datetime
+import tempfile
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from typing import Optional
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -10,12 +13,27 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    values,
+    column,
+    func,
+    cast,
+    BigInteger,
+    Date,
+    Select,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, lazyload, joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 from db import add_commit_refresh
 
-from models import Transaction, UserTransaction, UserCategory
+from core import settings
+from enums import TransactionType, SyncOperationType, SyncStatus
+from models import Attachment, Category, Transaction, UserTransaction
 from schemas.transaction import TransactionBase
 from schemas.user_transaction import (
     UserTransactionResponse,
@@ -23,21 +41,173 @@ from schemas.user_transaction import (
     UserTransactionCreate,
     UserTransactionsResponse,
     UserTransactionUpdateRequest,
+    UserTransactionSelection,
+    UserTransactionBatchUpdateRequest,
+    UserTransactionBatchResponse,
     ExportRequest,
+    CategoryPredictionRequest,
+    CategoryTotal,
+    TransactionSummaryResponse,
+)
+from schemas.sync import SyncOperation, SyncOperationResult, SyncRequest, SyncResponse
+from services.user_category import (
+    get_or_create_user_category,
+    get_category_node,
+    category_subtree,
 )
-from services.category import get_or_create_category
+from services.category import user_category_id
 from services.transaction import get_or_create_transaction
-from services.user import get_user
+from storage import get_storage
+from services.fx_rate import (
+    convert_amounts,
+    ensure_currency_supported,
+    get_user_base_currency,
+)
+from services.suggestion import (
+    record_transaction_suggestion,
+    forget_transaction_suggestion,
+    evict_user_suggestions,
+)
+from services.budget import apply_spend, bulk_apply_spend, evaluate_budget, month_of
+from services.sync import (
+    lock_user_changes,
+    record_tombstone,
+    record_tombstones,
+    find_user_transaction,
+    find_tombstone,
+    read_sync_changes,
+)
+from services.categorizer import (
+    suggest_category,
+    learn_transaction_category,
+    forget_transaction_category,
+    evict_user_categorizer,
+)
+
 
+def index_user_transaction(user_transaction: UserTransactionResponse) -> None:
+    """Feed a committed transaction to the title suggestions and categorizer."""
+
+    record_transaction_suggestion(
+        user_id=user_transaction.user_id,
+        title=user_transaction.title,
+        category=user_transaction.category,
+        used_at=user_transaction.created_at,
+    )
+    learn_transaction_category(
+        user_id=user_transaction.user_id,
+        **user_transaction.model_dump(
+            include={"title", "details", "amount", "type", "category"}
+        ),
+    )
+
+
+def _unindex_user_transaction(user_transaction: UserTransactionResponse) -> None:
+
+    forget_transaction_suggestion(
+        user_id=user_transaction.user_id,
+        title=user_transaction.title,
+        category=user_transaction.category,
+    )
+    forget_transaction_category(
+        user_id=user_transaction.user_id,
+        **user_transaction.model_dump(
+            include={"title", "details", "amount", "type", "category"}
+        ),
+    )
 
-def read_user_transactions(db: Session, user_id: int) -> UserTransactionsResponse:
 
-    user = get_user(db=db, user_id=user_id)
+def _created_between(
+    query: Select, start: Optional[date], end: Optional[date]
+) -> Select:
+    """Bound ``query`` to whole UTC days so Postgres can prune partitions."""
+
+    if start is not None:
+        query = query.where(
+            UserTransaction.created_at
+            >= datetime.combine(start, time.min, timezone.utc)
+        )
+
+    if end is not None:
+        query = query.where(
+            UserTransaction.created_at
+            < datetime.combine(end + timedelta(days=1), time.min, timezone.utc)
+        )
+
+    return query
+
+
+def _get_user_transaction(
+    db: Session, user_id: int, user_transaction_id: int
+) -> UserTransaction:
+
+    user_transaction: UserTransaction | None = db.scalar(
+        select(UserTransaction)
+        .options(
+            lazyload(UserTransaction.user),
+            # Only the template and its category; not the rows sharing them.
+            joinedload(UserTransaction.transaction).options(
+                lazyload(Transaction.users),
+                joinedload(Transaction.category).lazyload("*"),
+            ),
+        )
+        .where(
+            UserTransaction.id == user_transaction_id,
+            UserTransaction.user_id == user_id,
+        )
+    )
+
+    if not user_transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Transaction not found for user with id {user_id}",
+        )
+
+    return user_transaction
+
+
+def _check_version(
+    user_transaction: UserTransaction, expected_version: Optional[int]
+) -> None:
+
+    if expected_version is not None and expected_version != user_transaction.version:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Transaction is at version {user_transaction.version}",
+        )
+
+
+def _flush_versioned(db: Session) -> None:
+    """Flush, reporting a row changed since it was read as a failed
+    precondition."""
+
+    try:
+        db.flush()
+    except StaleDataError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Transaction was changed by another request",
+        )
+
+
+def read_user_transactions(
+    db: Session,
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> UserTransactionsResponse:
+
+    query = (
+        select(UserTransaction)
+        .options(lazyload(UserTransaction.user))
+        .where(UserTransaction.user_id == user_id)
+        .order_by(UserTransaction.created_at, UserTransaction.id)
+    )
 
     transactions: UserTransactionsResponse = UserTransactionsResponse(
         transactions=[
             UserTransactionResponse.from_orm_obj(transactions)
-            for transactions in user.transactions
+            for transactions in db.scalars(_created_between(query, start, end))
         ]
     )
 
@@ -45,63 +215,125 @@ def read_user_transactions(db: Session, user_id: int) -> UserTransactionsRespons
 
 
 def add_user_transaction(
-    db: Session, user_id: int, user_transaction_request: UserTransactionRequest
+    db: Session,
+    user_id: int,
+    user_transaction_request: UserTransactionRequest,
+    commit: bool = True,
 ) -> UserTransactionResponse:
 
-    category_id: int = get_or_create_category(
-        db=db, category_name=user_transaction_request.category
-    )
+    category_name: str | None = user_transaction_request.category
+
+    if category_name is None:
+        category_name = suggest_category(
+            db=db,
+            user_id=user_id,
+            request=CategoryPredictionRequest(
+                **user_transaction_request.model_dump(
+                    include={"title", "details", "amount", "type"}
+                )
+            ),
+        )
 
-    existing_link = UserCategory.get_one(db, user_id=user_id, category_id=category_id)
+    # Every writer takes the lock before creating categories and templates,
+    # so two writers of one user never wait on each other's new rows.
+    lock_user_changes(db=db, user_ids=[user_id])
 
-    if not existing_link:
-        new_user_category = UserCategory(user_id=user_id, category_id=category_id)
-        add_commit_refresh(db, new_user_category)
+    category_id: int | None = None
+
+    if category_name is not None:
+        category_id = get_or_create_user_category(
+            db=db, user_id=user_id, category_name=category_name, commit=False
+        )
 
     transaction: TransactionBase = TransactionBase(
         category_id=category_id,
         **user_transaction_request.model_dump(include={"type", "title"}),
     )
 
-    transaction_id = get_or_create_transaction(db=db, transaction=transaction)
+    transaction_id = get_or_create_transaction(
+        db=db, transaction=transaction, commit=False
+    )
+
+    base_currency: str = get_user_base_currency(db=db, user_id=user_id)
+    currency: str = user_transaction_request.currency or base_currency
+
+    if currency != base_currency:
+        ensure_currency_supported(db=db, currency=currency)
 
     user_transaction_create: UserTransactionCreate = UserTransactionCreate(
         user_id=user_id,
         transaction_id=transaction_id,
+        currency=currency,
         **user_transaction_request.model_dump(
             exclude_none=True,
-            include={"amount", "details", "attachments", "created_at"},
+            include={"amount", "details", "attachments", "created_at", "client_id"},
         ),
     )
 
+    if user_transaction_create.client_id is not None and find_user_transaction(
+        db=db, user_id=user_id, id=None, client_id=user_transaction_create.client_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Transaction with client id {user_transaction_create.client_id} "
+            "already exists",
+        )
+
     new_user_transaction = UserTransaction(**user_transaction_create.model_dump())
 
-    add_commit_refresh(db, new_user_transaction)
+    db.add(new_user_transaction)
+    db.flush()
+
+    spent = apply_spend(
+        db=db,
+        user_id=user_id,
+        category_id=category_id,
+        type=user_transaction_request.type,
+        amount=new_user_transaction.amount,
+        currency=new_user_transaction.currency,
+        created_at=new_user_transaction.created_at,
+        base_currency=base_currency,
+    )
+
+    if commit:
+        add_commit_refresh(db, new_user_transaction)
+    else:
+        db.refresh(new_user_transaction)
 
     user_transaction_response: UserTransactionResponse = (
         UserTransactionResponse.from_orm_obj(new_user_transaction)
     )
 
+    if spent is not None:
+        user_transaction_response.budget = evaluate_budget(
+            db=db,
+            user_id=user_id,
+            category_id=category_id,
+            month=month_of(new_user_transaction.created_at),
+            spent=spent,
+        )
+
+    if commit:
+        index_user_transaction(user_transaction_response)
+
     return user_transaction_response
 
 
 def delete_user_transaction(
-    db: Session, user_id: int, user_transaction_id: int
+    db: Session,
+    user_id: int,
+    user_transaction_id: int,
+    expected_version: Optional[int] = None,
+    commit: bool = True,
 ) -> UserTransactionResponse:
 
-    user = get_user(db=db, user_id=user_id)
+    lock_user_changes(db=db, user_ids=[user_id])
 
-    user_transaction_to_delete: UserTransaction | None = None
-    for user_transaction in user.transactions:
-        if user_transaction.id == user_transaction_id:
-            user_transaction_to_delete = user_transaction
-            break
+    user_transaction_to_delete: UserTransaction = _get_user_transaction(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
 
-    if not user_transaction_to_delete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Transaction not found for user with id {user_id}",
-        )
+    _check_version(user_transaction_to_delete, expected_version)
 
     transaction: Transaction = user_transaction_to_delete.transaction
 
@@ -109,16 +341,37 @@ def delete_user_transaction(
         UserTransactionResponse.from_orm_obj(user_transaction_to_delete)
     )
 
+    apply_spend(
+        db=db,
+        user_id=user_id,
+        category_id=transaction.category_id,
+        type=transaction.type,
+        amount=user_transaction_to_delete.amount,
+        currency=user_transaction_to_delete.currency,
+        created_at=user_transaction_to_delete.created_at,
+        base_currency=get_user_base_currency(db=db, user_id=user_id),
+        sign=-1,
+    )
+
+    # Attachments have no foreign key to the partitioned table; their blobs are
+    # released by the orphan sweep.
+    db.execute(
+        delete(Attachment).where(
+            Attachment.user_transaction_id == user_transaction_to_delete.id
+        )
+    )
+    record_tombstone(db=db, user_transaction=user_transaction_to_delete)
     db.delete(user_transaction_to_delete)
-    db.flush()
 
-    db.refresh(transaction)
+    _flush_versioned(db)
 
-    if not transaction.users:
-        db.delete(transaction)
+    if not commit:
+        return deleted_user_transaction
 
     db.commit()
 
+    _unindex_user_transaction(deleted_user_transaction)
+
     return deleted_user_transaction
 
 
@@ -127,29 +380,74 @@ def update_user_transaction(
     user_id: int,
     user_transaction_id: int,
     user_transaction_update_request: UserTransactionUpdateRequest,
+    expected_version: Optional[int] = None,
+    commit: bool = True,
 ) -> UserTransactionResponse:
 
-    user = get_user(db=db, user_id=user_id)
+    # Taken before the read, so the version checked is the one updated.
+    lock_user_changes(db=db, user_ids=[user_id])
 
-    user_transaction_to_update: UserTransaction | None = None
-    for user_transaction in user.transactions:
-        if user_transaction.id == user_transaction_id:
-            user_transaction_to_update = user_transaction
-            break
+    user_transaction_to_update: UserTransaction = _get_user_transaction(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
 
-    if not user_transaction_to_update:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Transaction not found for user with id {user_id}",
-        )
+    _check_version(user_transaction_to_update, expected_version)
+
+    previous_user_transaction: UserTransactionResponse = (
+        UserTransactionResponse.from_orm_obj(user_transaction_to_update)
+    )
+
+    previous_spend = dict(
+        category_id=user_transaction_to_update.transaction.category_id,
+        type=user_transaction_to_update.transaction.type,
+        amount=user_transaction_to_update.amount,
+        currency=user_transaction_to_update.currency,
+        created_at=user_transaction_to_update.created_at,
+    )
 
     data = user_transaction_update_request.model_dump(
         exclude_unset=True, exclude_none=True
     )
 
+    template: Transaction = user_transaction_to_update.transaction
+    category_id: int | None = template.category_id
+
+    if "category" in data:
+        category_id = get_or_create_user_category(
+            db=db, user_id=user_id, category_name=data["category"], commit=False
+        )
+
+    # Templates are shared by every user with the same type, title and
+    # category, so an edit points this row at another one instead of
+    # changing it; the old template is left to the orphan collector.
+    if data.keys() & {"category", "type", "title"}:
+        transaction_id = get_or_create_transaction(
+            db=db,
+            transaction=TransactionBase(
+                category_id=category_id,
+                type=data.get("type", template.type),
+                title=data.get("title", template.title),
+            ),
+            commit=False,
+        )
+    else:
+        transaction_id = template.id
+
+    # Edits of the template alone still update the row, bumping its version
+    # and sync_seq.
+    user_transaction_to_update.updated_at = func.current_timestamp()
+    user_transaction_to_update.transaction_id = transaction_id
+
     if "amount" in data:
         user_transaction_to_update.amount = Decimal(data["amount"])
 
+    base_currency: str = get_user_base_currency(db=db, user_id=user_id)
+
+    if "currency" in data:
+        if data["currency"] != base_currency:
+            ensure_currency_supported(db=db, currency=data["currency"])
+        user_transaction_to_update.currency = data["currency"]
+
     if "details" in data:
         user_transaction_to_update.details = data["details"]
 
@@ -159,49 +457,536 @@ def update_user_transaction(
     if "created_at" in data:
         user_transaction_to_update.created_at = data["created_at"]
 
-    if "category" in data:
-        category_id: int = get_or_create_category(db=db, category_name=data["category"])
+    _flush_versioned(db)
+
+    db.expire(user_transaction_to_update)
+    user_transaction_to_update = _get_user_transaction(
+        db=db, user_id=user_id, user_transaction_id=user_transaction_id
+    )
+
+    apply_spend(
+        db=db, user_id=user_id, base_currency=base_currency, sign=-1, **previous_spend
+    )
+    spent = apply_spend(
+        db=db,
+        user_id=user_id,
+        category_id=category_id,
+        type=user_transaction_to_update.transaction.type,
+        amount=user_transaction_to_update.amount,
+        currency=user_transaction_to_update.currency,
+        created_at=user_transaction_to_update.created_at,
+        base_currency=base_currency,
+    )
+
+    updated_user_transaction: UserTransactionResponse = (
+        UserTransactionResponse.from_orm_obj(user_transaction_to_update)
+    )
+
+    if spent is not None:
+        updated_user_transaction.budget = evaluate_budget(
+            db=db,
+            user_id=user_id,
+            category_id=category_id,
+            month=month_of(user_transaction_to_update.created_at),
+            spent=spent,
+        )
+
+    if not commit:
+        return updated_user_transaction
+
+    db.commit()
+
+    _unindex_user_transaction(previous_user_transaction)
+    index_user_transaction(updated_user_transaction)
+
+    return updated_user_transaction
+
+
+def _apply_sync_operation(db: Session, user_id: int, operation: SyncOperation) -> tuple[
+    SyncOperationResult,
+    Optional[UserTransactionResponse],
+    Optional[UserTransactionResponse],
+]:
+    """Apply one sync operation; returns its result and the transaction before
+    and after it, for the suggestion and categorizer indexes."""
+
+    def result(
+        status: SyncStatus,
+        transaction: Optional[UserTransactionResponse] = None,
+        detail: Optional[str] = None,
+    ) -> SyncOperationResult:
+        return SyncOperationResult(
+            op=operation.op,
+            client_id=operation.client_id,
+            status=status,
+            transaction=transaction,
+            detail=detail,
+        )
+
+    if operation.op == SyncOperationType.CREATE:
+        existing = find_user_transaction(
+            db=db, user_id=user_id, id=None, client_id=operation.client_id
+        )
+
+        # A retried batch: the row was created by an earlier attempt.
+        if existing:
+            return (
+                result(
+                    SyncStatus.APPLIED, UserTransactionResponse.from_orm_obj(existing)
+                ),
+                None,
+                None,
+            )
+
+        if find_tombstone(
+            db=db, user_id=user_id, id=None, client_id=operation.client_id
+        ):
+            return (
+                result(SyncStatus.CONFLICT, detail="Transaction was deleted"),
+                None,
+                None,
+            )
+
+        created = add_user_transaction(
+            db=db,
+            user_id=user_id,
+            user_transaction_request=operation.transaction.model_copy(
+                update={"client_id": operation.client_id}
+            ),
+            commit=False,
+        )
+
+        return result(SyncStatus.APPLIED, created), None, created
 
-        existing_link = UserCategory.get_one(
-            db, user_id=user_id, category_id=category_id
+    target = find_user_transaction(
+        db=db, user_id=user_id, id=operation.id, client_id=operation.client_id
+    )
+
+    if target is None:
+        if not find_tombstone(
+            db=db, user_id=user_id, id=operation.id, client_id=operation.client_id
+        ):
+            return (
+                result(SyncStatus.NOT_FOUND, detail="Transaction not found"),
+                None,
+                None,
+            )
+
+        if operation.op == SyncOperationType.DELETE:
+            return result(SyncStatus.APPLIED), None, None
+
+        return result(SyncStatus.CONFLICT, detail="Transaction was deleted"), None, None
+
+    current = UserTransactionResponse.from_orm_obj(target)
+
+    if operation.version is not None and operation.version != target.version:
+        return (
+            result(
+                SyncStatus.CONFLICT,
+                current,
+                detail=f"Transaction is at version {target.version}",
+            ),
+            None,
+            None,
+        )
+
+    if operation.op == SyncOperationType.UPDATE:
+        updated = update_user_transaction(
+            db=db,
+            user_id=user_id,
+            user_transaction_id=target.id,
+            user_transaction_update_request=operation.changes,
+            commit=False,
+        )
+
+        return result(SyncStatus.APPLIED, updated), current, updated
+
+    delete_user_transaction(
+        db=db, user_id=user_id, user_transaction_id=target.id, commit=False
+    )
+
+    return result(SyncStatus.APPLIED), current, None
+
+
+def sync_user_transactions(
+    db: Session, user_id: int, sync_request: SyncRequest
+) -> SyncResponse:
+    """Apply the client's operations in one transaction, each in a savepoint so
+    a rejected one does not undo the others, then return the changes since the
+    client's cursor."""
+
+    lock_user_changes(db=db, user_ids=[user_id])
+
+    results: list[SyncOperationResult] = []
+    reindex: list[
+        tuple[Optional[UserTransactionResponse], Optional[UserTransactionResponse]]
+    ] = []
+
+    for operation in sync_request.operations:
+        savepoint = db.begin_nested()
+
+        try:
+            operation_result, before, after = _apply_sync_operation(
+                db=db, user_id=user_id, operation=operation
+            )
+        except (HTTPException, IntegrityError) as error:
+            savepoint.rollback()
+            results.append(
+                SyncOperationResult(
+                    op=operation.op,
+                    client_id=operation.client_id,
+                    status=SyncStatus.REJECTED,
+                    detail=str(getattr(error, "detail", "Conflicting write")),
+                )
+            )
+            continue
+
+        savepoint.commit()
+        results.append(operation_result)
+        reindex.append((before, after))
+
+    db.commit()
+
+    for before, after in reindex:
+        if before is not None:
+            _unindex_user_transaction(before)
+        if after is not None:
+            index_user_transaction(after)
+
+    return read_sync_changes(
+        db=db, user_id=user_id, cursor=sync_request.cursor, results=results
+    )
+
+
+def _select_batch(user_id: int, selection: UserTransactionSelection) -> Select:
+    """Ids of the user's transactions matching ``selection``, joined to their
+    templates; its WHERE clause scopes the batch UPDATE and DELETE."""
+
+    query = select(UserTransaction.id).where(
+        UserTransaction.user_id == user_id,
+        UserTransaction.transaction_id == Transaction.id,
+    )
+
+    if selection.ids is not None:
+        query = query.where(UserTransaction.id.in_(selection.ids))
+
+    if selection.category is not None:
+        query = query.where(
+            Transaction.category_id
+            == user_category_id(
+                user_id=user_id, category_name=selection.category
+            ).scalar_subquery()
+        )
+
+    if selection.title is not None:
+        query = query.where(Transaction.title == selection.title)
+
+    return _created_between(query, selection.start, selection.end)
+
+
+def _dry_run(db: Session, selected: Select) -> UserTransactionBatchResponse:
+
+    ids: list[int] = list(db.scalars(selected.order_by(UserTransaction.id)))
+
+    return UserTransactionBatchResponse(count=len(ids), ids=ids, dry_run=True)
+
+
+def _batch_spend_deltas(
+    db: Session, user_id: int, rows: list[tuple]
+) -> dict[tuple[int, int, date], Decimal]:
+    """Spend counter deltas of ``(category_id, type, amount, currency,
+    created_at)`` rows, with amounts signed by the caller."""
+
+    rows = [
+        row for row in rows if row[0] is not None and row[1] == TransactionType.EXPENSE
+    ]
+
+    if not rows:
+        return {}
+
+    converted = convert_amounts(
+        db,
+        [amount for _, _, amount, _, _ in rows],
+        [currency for _, _, _, currency, _ in rows],
+        [created_at.astimezone(timezone.utc).date() for *_, created_at in rows],
+        get_user_base_currency(db=db, user_id=user_id),
+    )
+
+    spend_deltas: dict[tuple[int, int, date], Decimal] = defaultdict(Decimal)
+
+    for (category_id, *_, created_at), amount in zip(rows, converted):
+        spend_deltas[(user_id, category_id, month_of(created_at))] += amount
+
+    return spend_deltas
+
+
+def update_user_transactions(
+    db: Session, user_id: int, request: UserTransactionBatchUpdateRequest
+) -> UserTransactionBatchResponse:
+    """Apply ``request.changes`` to every matching transaction with one UPDATE
+    ... FROM, moving rows between templates like update_user_transaction."""
+
+    selected = _select_batch(user_id=user_id, selection=request)
+
+    if request.dry_run:
+        return _dry_run(db=db, selected=selected)
+
+    changes = request.changes.model_dump(exclude_none=True)
+
+    lock_user_changes(db=db, user_ids=[user_id])
+
+    category_id: int | None = None
+
+    if "category" in changes:
+        category_id = get_or_create_user_category(
+            db=db, user_id=user_id, category_name=changes["category"], commit=False
+        )
+
+    templates = db.execute(
+        selected.with_only_columns(
+            Transaction.id, Transaction.type, Transaction.title, Transaction.category_id
+        ).distinct()
+    ).all()
+
+    # Template id before and after the change, with the (category_id, type)
+    # the spend counters are kept by.
+    moves: list[tuple[int, int]] = []
+    spend_keys: dict[int, tuple[Optional[int], TransactionType]] = {}
+
+    for template in templates:
+        spend_keys[template.id] = (template.category_id, template.type)
+
+        if not changes.keys() & {"category", "type", "title"}:
+            moves.append((template.id, template.id))
+            continue
+
+        target = TransactionBase(
+            category_id=(
+                category_id if "category" in changes else template.category_id
+            ),
+            type=changes.get("type", template.type),
+            title=changes.get("title", template.title),
+        )
+        target_id = get_or_create_transaction(db=db, transaction=target, commit=False)
+
+        moves.append((template.id, target_id))
+        spend_keys[target_id] = (target.category_id, target.type)
+
+    if not moves:
+        return UserTransactionBatchResponse(count=0, ids=[], dry_run=False)
+
+    template_moves = values(
+        column("old_id", BigInteger), column("new_id", BigInteger), name="moves"
+    ).data(moves)
+
+    updated = db.execute(
+        update(UserTransaction)
+        .where(
+            selected.whereclause,
+            UserTransaction.transaction_id == template_moves.c.old_id,
         )
+        .values(
+            transaction_id=template_moves.c.new_id,
+            updated_at=func.current_timestamp(),
+            version=UserTransaction.version + 1,
+            **({"details": changes["details"]} if "details" in changes else {}),
+        )
+        .returning(
+            UserTransaction.id,
+            UserTransaction.amount,
+            UserTransaction.currency,
+            UserTransaction.created_at,
+            template_moves.c.old_id,
+            template_moves.c.new_id,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    spent_rows = []
+
+    for row in updated:
+        if spend_keys[row.old_id] != spend_keys[row.new_id]:
+            spent_rows.append(
+                (*spend_keys[row.old_id], -row.amount, row.currency, row.created_at)
+            )
+            spent_rows.append(
+                (*spend_keys[row.new_id], row.amount, row.currency, row.created_at)
+            )
+
+    bulk_apply_spend(
+        db=db,
+        deltas=_batch_spend_deltas(db=db, user_id=user_id, rows=spent_rows),
+    )
+    db.commit()
 
-        if not existing_link:
-            new_user_category = UserCategory(user_id=user_id, category_id=category_id)
-            add_commit_refresh(db, new_user_category)
+    evict_user_suggestions(user_id=user_id)
+    evict_user_categorizer(user_id=user_id)
 
-        user_transaction_to_update.transaction.category_id = category_id
+    ids = sorted(row.id for row in updated)
 
-    if "type" in data:
-        user_transaction_to_update.transaction.type = data["type"]
+    return UserTransactionBatchResponse(count=len(ids), ids=ids, dry_run=False)
 
-    if "title" in data:
-        user_transaction_to_update.transaction.title = data["title"]
 
+def delete_user_transactions(
+    db: Session, user_id: int, selection: UserTransactionSelection
+) -> UserTransactionBatchResponse:
+    """Delete every matching transaction with one DELETE ... RETURNING."""
+
+    selected = _select_batch(user_id=user_id, selection=selection)
+
+    if selection.dry_run:
+        return _dry_run(db=db, selected=selected)
+
+    lock_user_changes(db=db, user_ids=[user_id])
+
+    # Attachments have no foreign key to the partitioned table; their blobs are
+    # released by the orphan sweep.
+    db.execute(delete(Attachment).where(Attachment.user_transaction_id.in_(selected)))
+
+    deleted = db.execute(
+        delete(UserTransaction)
+        .where(selected.whereclause)
+        .returning(
+            UserTransaction.id,
+            UserTransaction.client_id,
+            UserTransaction.amount,
+            UserTransaction.currency,
+            UserTransaction.created_at,
+            Transaction.category_id,
+            Transaction.type,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    record_tombstones(
+        db=db, user_id=user_id, deleted=[(row.id, row.client_id) for row in deleted]
+    )
+    bulk_apply_spend(
+        db=db,
+        deltas=_batch_spend_deltas(
+            db=db,
+            user_id=user_id,
+            rows=[
+                (row.category_id, row.type, -row.amount, row.currency, row.created_at)
+                for row in deleted
+            ],
+        ),
+    )
     db.commit()
-    db.refresh(user_transaction_to_update)
 
-    return UserTransactionResponse.from_orm_obj(user_transaction_to_update)
+    evict_user_suggestions(user_id=user_id)
+    evict_user_categorizer(user_id=user_id)
+
+    ids = sorted(row.id for row in deleted)
+
+    return UserTransactionBatchResponse(count=len(ids), ids=ids, dry_run=False)
+
+
+def read_transaction_summary(
+    db: Session,
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+) -> TransactionSummaryResponse:
+    """Totals in the base currency; with ``category``, of that category's
+    subtree only."""
+
+    base_currency: str = get_user_base_currency(db=db, user_id=user_id)
+    day = cast(func.timezone("UTC", UserTransaction.created_at), Date)
+
+    query = (
+        select(
+            Transaction.type,
+            Category.name,
+            UserTransaction.currency,
+            day.label("day"),
+            func.sum(UserTransaction.amount).label("amount"),
+        )
+        .join(Transaction, Transaction.id == UserTransaction.transaction_id)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(UserTransaction.user_id == user_id)
+        .group_by(Transaction.type, Category.name, UserTransaction.currency, day)
+    )
+
+    if category is not None:
+        node = get_category_node(db=db, user_id=user_id, category_name=category)
+        query = query.where(
+            Transaction.category_id.in_(category_subtree(user_id=user_id, node=node))
+        )
+
+    rows = db.execute(_created_between(query, start, end)).all()
 
+    converted = convert_amounts(
+        db,
+        [row.amount for row in rows],
+        [row.currency for row in rows],
+        [row.day for row in rows],
+        base_currency,
+    )
 
-def generate_CSV(data: ExportRequest):
+    totals: dict[TransactionType, Decimal] = defaultdict(Decimal)
+    category_totals: dict[tuple[TransactionType, str | None], Decimal] = defaultdict(
+        Decimal
+    )
+
+    for row, amount in zip(rows, converted):
+        totals[row.type] += amount
+        category_totals[(row.type, row.name)] += amount
+
+    return TransactionSummaryResponse(
+        base_currency=base_currency,
+        income=totals[TransactionType.INCOME],
+        expense=totals[TransactionType.EXPENSE],
+        balance=totals[TransactionType.INCOME] - totals[TransactionType.EXPENSE],
+        categories=[
+            CategoryTotal(type=type, category=category, total=total)
+            for (type, category), total in sorted(
+                category_totals.items(),
+                key=lambda item: (item[0][0].value, -item[1]),
+            )
+        ],
+    )
+
+
+def _converted_export_amounts(db: Session, data: ExportRequest) -> list[Decimal] | None:
+
+    if data.base_currency is None:
+        return None
+
+    return convert_amounts(
+        db,
+        [txn.amount for txn in data.transactions],
+        [txn.currency or settings.DEFAULT_CURRENCY for txn in data.transactions],
+        [txn.created_at.astimezone(timezone.utc).date() for txn in data.transactions],
+        data.base_currency,
+    )
+
+
+def generate_CSV(db: Session, data: ExportRequest, file_path: Optional[str] = None):
+
+    converted_amounts = _converted_export_amounts(db=db, data=data)
 
     data = data.model_dump()
 
-    folder_path = os.path.join(os.getcwd(), "temp")
-    os.makedirs(folder_path, exist_ok=True)
+    if file_path is None:
+        folder_path = os.path.join(os.getcwd(), "temp")
+        os.makedirs(folder_path, exist_ok=True)
 
-    file_path = os.path.join(folder_path, "transactions.csv")
+        file_path = os.path.join(folder_path, "transactions.csv")
 
     transactions = data.get("transactions", [])
 
-    headers = ["Type", "Title", "Amount", "Category", "Date"]
+    headers = ["Type", "Title", "Amount", "Currency", "Category", "Date"]
+
+    if converted_amounts is not None:
+        headers.append(f"Amount ({data['base_currency']})")
 
     with open(file_path, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerow(headers)
 
-        for txn in transactions:
+        for index, txn in enumerate(transactions):
             txn_type = txn["type"].value
             title = txn["title"]
             amount = (
@@ -216,19 +1001,27 @@ def generate_CSV(data: ExportRequest):
                 else txn["created_at"]
             )
 
-            writer.writerow([txn_type, title, amount, category, date])
+            row = [txn_type, title, amount, txn["currency"], category, date]
+
+            if converted_amounts is not None:
+                row.append(float(converted_amounts[index]))
+
+            writer.writerow(row)
 
     return file_path
 
 
-def generate_PDF(data: ExportRequest):
+def generate_PDF(db: Session, data: ExportRequest, file_path: Optional[str] = None):
+
+    converted_amounts = _converted_export_amounts(db=db, data=data)
 
     data = data.model_dump()
 
-    folder_path = os.path.join(os.getcwd(), "temp")
-    os.makedirs(folder_path, exist_ok=True)
+    if file_path is None:
+        folder_path = os.path.join(os.getcwd(), "temp")
+        os.makedirs(folder_path, exist_ok=True)
 
-    file_path = os.path.join(folder_path, "transactions.pdf")
+        file_path = os.path.join(folder_path, "transactions.pdf")
 
     transactions = data.get("transactions", [])
 
@@ -248,10 +1041,13 @@ def generate_PDF(data: ExportRequest):
     elements.append(title)
     elements.append(Spacer(1, 12))
 
-    headers = ["Type", "Title", "Amount", "Category", "Date"]
+    headers = ["Type", "Title", "Amount", "Currency", "Category", "Date"]
+
+    if converted_amounts is not None:
+        headers.append(f"Amount ({data['base_currency']})")
     table_data = [headers]
 
-    for txn in transactions:
+    for index, txn in enumerate(transactions):
         txn_type = txn["type"].value if hasattr(txn["type"], "value") else txn["type"]
         title = txn["title"]
         amount = (
@@ -266,11 +1062,26 @@ def generate_PDF(data: ExportRequest):
             else txn["created_at"]
         )
 
-        table_data.append([txn_type, title, f"{amount:.2f}", category, date])
+        row = [txn_type, title, f"{amount:.2f}", txn["currency"], category, date]
 
-    table = Table(
-        table_data, colWidths=[1 * inch, 2 * inch, 1 * inch, 1.5 * inch, 2 * inch]
-    )
+        if converted_amounts is not None:
+            row.append(f"{converted_amounts[index]:.2f}")
+
+        table_data.append(row)
+
+    col_widths = [
+        0.8 * inch,
+        1.6 * inch,
+        0.9 * inch,
+        0.7 * inch,
+        1.2 * inch,
+        1.6 * inch,
+    ]
+
+    if converted_amounts is not None:
+        col_widths.append(0.9 * inch)
+
+    table = Table(table_data, colWidths=col_widths)
 
     style = TableStyle(
         [
@@ -291,3 +1102,49 @@ def generate_PDF(data: ExportRequest):
     pdf.build(elements)
 
     return file_path
+
+
+EXPORT_FORMATS = {
+    "csv": (generate_CSV, "text/csv"),
+    "pdf": (generate_PDF, "application/pdf"),
+}
+
+
+def export_user_transactions(
+    db: Session,
+    user_id: int,
+    format: str,
+    storage_key: str,
+    base_currency: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> dict:
+    """Render the user's transactions and store the file under ``storage_key``."""
+
+    generate, media_type = EXPORT_FORMATS[format]
+
+    data = ExportRequest(
+        transactions=read_user_transactions(
+            db=db, user_id=user_id, start=start, end=end
+        ).transactions,
+        base_currency=base_currency,
+    )
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        file_path = generate(
+            db=db,
+            data=data,
+            file_path=os.path.join(folder_path, f"transactions.{format}"),
+        )
+
+        with open(file_path, "rb") as file:
+            get_storage().put(storage_key, file)
+
+        size = os.path.getsize(file_path)
+
+    return {
+        "storage_key": storage_key,
+        "filename": f"transactions.{format}",
+        "media_type": media_type,
+        "size": size,
+    }
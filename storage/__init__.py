@@ -0,0 +1,41 @@
+from functools import lru_cache
+
+from core import settings
+
+from .base import StorageBackend
+from .local import LocalStorage
+from .s3 import S3Storage
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+
+    if settings.STORAGE_BACKEND == "s3":
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 requires the boto3 package to be installed"
+            ) from exc
+
+        client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+
+        return S3Storage(
+            client=client,
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            chunk_size=settings.STORAGE_CHUNK_SIZE,
+        )
+
+    return LocalStorage(
+        root=settings.STORAGE_LOCAL_ROOT, chunk_size=settings.STORAGE_CHUNK_SIZE
+    )
+
+
+__all__ = ["StorageBackend", "LocalStorage", "S3Storage", "get_storage"]
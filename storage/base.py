@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator
+
+
+class StorageBackend(ABC):
+    """Content store addressed by opaque keys; reads and writes are chunked."""
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def put(self, key: str, file: BinaryIO) -> None:
+        """Store the remaining content of ``file`` under ``key``."""
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        """Yield bytes ``start`` through ``end`` (inclusive) of the object."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
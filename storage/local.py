@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Iterator
+
+from .base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    """Stores objects as files under ``root``, sharded by key prefix."""
+
+    def __init__(self, root: str, chunk_size: int):
+        super().__init__(chunk_size)
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def put(self, key: str, file: BinaryIO) -> None:
+
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(file, out, self.chunk_size)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+
+        with open(self.path(key), "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+
+            while remaining > 0:
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self.path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,45 @@
+from typing import Any, BinaryIO, Iterator
+
+from .base import StorageBackend
+
+
+class S3Storage(StorageBackend):
+    """Stores objects in an S3-compatible bucket through a boto3-style client.
+
+    Any endpoint speaking the S3 API (MinIO, localstack, ...) can be used by
+    pointing ``S3_ENDPOINT_URL`` at it.
+    """
+
+    def __init__(self, client: Any, bucket: str, prefix: str, chunk_size: int):
+        super().__init__(chunk_size)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    def put(self, key: str, file: BinaryIO) -> None:
+        # upload_fileobj reads the file in parts and switches to a multipart
+        # upload for large objects, so nothing is buffered whole.
+        self.client.upload_fileobj(file, self.bucket, self._key(key))
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(key), Range=f"bytes={start}-{end}"
+        )
+
+        yield from response["Body"].iter_chunks(self.chunk_size)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
@@ -0,0 +1,62 @@
+from core import settings
+
+from .periodic import PeriodicWorker
+from .jobs import JobRunner, job_handler, run_next_job
+from . import job_handlers
+from .thumbnails import enqueue_thumbnails, shutdown_thumbnail_pool
+from .tasks import (
+    build_periodic_tasks,
+    run_recurring_materialization,
+    run_budget_reconciliation,
+    run_orphan_collection,
+    run_partition_maintenance,
+    run_idempotency_key_purge,
+)
+
+
+def start_workers() -> list[PeriodicWorker | JobRunner]:
+
+    workers: list[PeriodicWorker | JobRunner] = [
+        PeriodicWorker(name=name, interval_seconds=interval, task=task)
+        for name, interval, task in build_periodic_tasks()
+    ]
+
+    if settings.JOB_WORKER_ENABLED:
+        workers.append(
+            JobRunner(
+                concurrency=settings.JOB_WORKER_CONCURRENCY,
+                poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+            )
+        )
+
+    for worker in workers:
+        worker.start()
+
+    return workers
+
+
+def stop_workers(
+    workers: list[PeriodicWorker | JobRunner],
+    timeout: float | None = settings.JOB_SHUTDOWN_TIMEOUT_SECONDS,
+) -> None:
+    for worker in workers:
+        worker.stop(timeout)
+
+    shutdown_thumbnail_pool()
+
+
+__all__ = [
+    "PeriodicWorker",
+    "JobRunner",
+    "job_handler",
+    "run_next_job",
+    "start_workers",
+    "stop_workers",
+    "run_recurring_materialization",
+    "run_budget_reconciliation",
+    "run_orphan_collection",
+    "run_partition_maintenance",
+    "run_idempotency_key_purge",
+    "enqueue_thumbnails",
+    "shutdown_thumbnail_pool",
+]
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from services.orphan import collect_orphans
+from services.user import DELETE_USER_JOB, delete_user_account
+from services.user_transaction import export_user_transactions
+from .jobs import job_handler
+
+
+def _payload_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+@job_handler("export_transactions")
+def export_transactions(db: Session, job: Row) -> Optional[dict]:
+    return export_user_transactions(
+        db=db,
+        user_id=job.payload["user_id"],
+        format=job.payload["format"],
+        base_currency=job.payload.get("base_currency"),
+        start=_payload_date(job.payload.get("start")),
+        end=_payload_date(job.payload.get("end")),
+        storage_key=f"export-{job.id}.{job.payload['format']}",
+    )
+
+
+@job_handler("collect_orphans")
+def collect_orphan_rows(db: Session, job: Row) -> Optional[dict]:
+    return collect_orphans(
+        db=db,
+        batch_size=job.payload.get("batch_size"),
+        max_batches=job.payload.get("max_batches"),
+    ).model_dump()
+
+
+@job_handler(DELETE_USER_JOB)
+def delete_user(db: Session, job: Row) -> Optional[dict]:
+    return delete_user_account(db=db, user_id=job.payload["user_id"])
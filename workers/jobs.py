@@ -0,0 +1,110 @@
+import logging
+import os
+import socket
+import time
+from threading import Event, Thread
+from typing import Callable, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from db import get_db
+from services.job import claim_job, complete_job, fail_job, fail_exhausted_jobs
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, Row], Optional[dict]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated function as the handler for jobs of ``kind``."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def run_next_job(worker_id: str) -> bool:
+    """Claim and run one job; returns False when the queue had nothing runnable."""
+
+    with get_db() as db:
+        job = claim_job(db=db, worker_id=worker_id)
+
+        if job is None:
+            fail_exhausted_jobs(db=db)
+            return False
+
+        try:
+            handler = _handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job.kind}'")
+
+            result = handler(db, job)
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            fail_job(
+                db=db,
+                job_id=job.id,
+                attempts=job.attempts,
+                max_attempts=job.max_attempts,
+                error=f"{type(exc).__name__}: {exc}",
+            )
+        else:
+            completed = complete_job(db=db, job_id=job.id, result=result)
+
+            # The row went with its user while the job ran; nothing would
+            # ever prune the file it stored.
+            if not completed and result and "storage_key" in result:
+                get_storage().delete(result["storage_key"])
+
+    return True
+
+
+class JobRunner:
+    """Runs queued jobs on ``concurrency`` daemon threads until stopped."""
+
+    def __init__(self, concurrency: int, poll_interval_seconds: float):
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop_event = Event()
+        self._threads: list[Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.concurrency):
+            thread = Thread(
+                target=self._run,
+                args=(f"{self.worker_id}:{index}",),
+                name=f"job-runner-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        # Threads finish the job they are running; anything cut off by the
+        # timeout is picked up again once its lease expires.
+        self._stop_event.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        for thread in self._threads:
+            thread.join(
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop_event.is_set():
+            try:
+                ran = run_next_job(worker_id)
+            except Exception:
+                logger.exception("Job runner %s failed to poll", worker_id)
+                ran = False
+
+            if not ran:
+                self._stop_event.wait(self.poll_interval_seconds)
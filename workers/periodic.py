@@ -0,0 +1,35 @@
+import logging
+from threading import Event, Thread
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """Runs ``task`` in a daemon thread every ``interval_seconds`` until stopped."""
+
+    def __init__(self, name: str, interval_seconds: float, task: Callable[[], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.task = task
+        self._stop_event = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                result = self.task()
+                logger.info("%s finished: %s", self.name, result)
+            except Exception:
+                logger.exception("%s failed", self.name)
+
+            self._stop_event.wait(self.interval_seconds)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from core import settings
+from db import get_db
+from schemas.budget import ReconciliationResult
+from schemas.recurring_rule import MaterializationResult
+from services.budget import reconcile_spend_counters
+from services.recurring_rule import materialize_due_occurrences
+from services.job import prune_finished_jobs
+from services.idempotency import purge_expired_idempotency_keys
+from services.orphan import collect_orphans
+from services.partition import ensure_user_transaction_partitions
+from schemas.orphan import OrphanCollectionResult
+from schemas.partition import PartitionMaintenanceResult
+from storage import get_storage
+
+
+def run_recurring_materialization() -> MaterializationResult:
+    with get_db() as db:
+        return materialize_due_occurrences(db=db)
+
+
+def run_budget_reconciliation() -> ReconciliationResult:
+    with get_db() as db:
+        return reconcile_spend_counters(db=db)
+
+
+def run_orphan_collection() -> OrphanCollectionResult:
+    with get_db() as db:
+        return collect_orphans(db=db)
+
+
+def run_partition_maintenance() -> PartitionMaintenanceResult:
+    with get_db() as db:
+        return ensure_user_transaction_partitions(db=db)
+
+
+def run_job_pruning() -> int:
+
+    with get_db() as db:
+        pruned = prune_finished_jobs(
+            db=db, older_than=timedelta(days=settings.JOB_RETENTION_DAYS)
+        )
+
+    storage = get_storage()
+
+    for _, result in pruned:
+        if result and "storage_key" in result:
+            storage.delete(result["storage_key"])
+
+    return len(pruned)
+
+
+def run_idempotency_key_purge() -> int:
+    with get_db() as db:
+        return purge_expired_idempotency_keys(db=db)
+
+
+def build_periodic_tasks() -> list[tuple[str, float, object]]:
+
+    tasks = []
+
+    if settings.RECURRING_WORKER_ENABLED:
+        tasks.append(
+            (
+                "recurring-materializer",
+                settings.RECURRING_INTERVAL_SECONDS,
+                run_recurring_materialization,
+            )
+        )
+
+    if settings.BUDGET_RECONCILE_ENABLED:
+        tasks.append(
+            (
+                "budget-reconciler",
+                settings.BUDGET_RECONCILE_INTERVAL_SECONDS,
+                run_budget_reconciliation,
+            )
+        )
+
+    if settings.ORPHAN_GC_ENABLED:
+        tasks.append(
+            (
+                "orphan-collector",
+                settings.ORPHAN_GC_INTERVAL_SECONDS,
+                run_orphan_collection,
+            )
+        )
+
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        tasks.append(
+            (
+                "partition-maintainer",
+                settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+                run_partition_maintenance,
+            )
+        )
+
+    if settings.IDEMPOTENCY_PURGE_ENABLED:
+        tasks.append(
+            (
+                "idempotency-key-purger",
+                settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+                run_idempotency_key_purge,
+            )
+        )
+
+    if settings.JOB_WORKER_ENABLED:
+        tasks.append(
+            ("job-pruner", settings.JOB_PRUNE_INTERVAL_SECONDS, run_job_pruning)
+        )
+
+    return tasks
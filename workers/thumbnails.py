@@ -0,0 +1,65 @@
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+
+from sqlalchemy import update
+
+from core import settings
+from db import get_db
+from models import Blob
+from services.thumbnail import render_thumbnails
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return _executor
+
+
+def _record_thumbnails(sha256: str, future: Future) -> None:
+
+    try:
+        sizes = future.result()
+    except Exception:
+        logger.exception("Thumbnail generation failed for %s", sha256)
+        return
+
+    with get_db() as db:
+        db.execute(
+            update(Blob).where(Blob.sha256 == sha256).values(thumbnail_sizes=sizes)
+        )
+        db.commit()
+
+
+def enqueue_thumbnails(sha256: str, byte_size: int) -> Future:
+
+    future = _get_executor().submit(
+        render_thumbnails, sha256, byte_size, list(settings.THUMBNAIL_SIZES)
+    )
+    future.add_done_callback(lambda done: _record_thumbnails(sha256, done))
+
+    return future
+
+
+def shutdown_thumbnail_pool(wait: bool = True) -> None:
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=not wait)
+            _executor = None